@@ -4,7 +4,10 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from agents.base_agent import BaseAgent
 from core.memory import AgentMemory
 from core.knowledge_graph import KnowledgeGraph
-from core.tools import Tools
+from core.tools import Tools, ToolError
+from core.router import get_router
+
+ROUTER = get_router("agents", "Marketing")
 
 class MarketerAgent(BaseAgent):
     """
@@ -39,8 +42,9 @@ class MarketerAgent(BaseAgent):
 
         result = self.specialized_task(task)
 
-        self.memory.store(self.name, task, result)
-        self.knowledge_graph.add_fact(task, "processed_by", self.name)
+        if not isinstance(result, ToolError):  # Never cache a failed tool call
+            self.memory.store(self.name, task, result)
+            self.knowledge_graph.add_fact(task, "processed_by", self.name)
 
         return result
 
@@ -54,7 +58,8 @@ class MarketerAgent(BaseAgent):
         Returns:
             str: The processed output.
         """
-        if "sentiment" in task.lower() or "feedback" in task.lower() or "review" in task.lower():
-            return self.tools.analyze_sentiment(task)
-        
+        action = ROUTER.match(task)
+        if action:
+            return getattr(self.tools, action)(task)
+
         return f"MarketerAgent executing: {task}"
@@ -4,7 +4,11 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from agents.base_agent import BaseAgent
 from core.memory import AgentMemory
 from core.knowledge_graph import KnowledgeGraph
-from core.tools import Tools  
+from core.tools import Tools, ToolError
+from core.router import get_router
+
+ROUTER = get_router("agents", "Medical")
+
 class Medical(BaseAgent):
     """
     A dynamically created agent specialized for Medical tasks.
@@ -37,8 +41,9 @@ class Medical(BaseAgent):
 
         result = self.specialized_task(task)
 
-        self.memory.store(self.name, task, result)
-        self.knowledge_graph.add_fact(task, "processed_by", self.name)
+        if not isinstance(result, ToolError):  # Never cache a failed tool call
+            self.memory.store(self.name, task, result)
+            self.knowledge_graph.add_fact(task, "processed_by", self.name)
 
         return result
 
@@ -52,8 +57,8 @@ class Medical(BaseAgent):
         Returns:
             str: The processed output.
         """
-        
-        if "symptom" in task.lower() or "diagnose" in task.lower():
-            return self.tools.fetch_medical_info(task)
-        
+        action = ROUTER.match(task)
+        if action:
+            return getattr(self.tools, action)(task)
+
         return f"Medical executing: {task}"
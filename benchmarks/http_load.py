@@ -0,0 +1,106 @@
+import argparse
+import http.client
+import json
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+def percentile(sorted_values, fraction):
+    """
+    Returns the value at the given fraction of a sorted list (nearest rank).
+
+    Args:
+        sorted_values (list): Values in ascending order.
+        fraction (float): Fraction between 0.0 and 1.0.
+
+    Returns:
+        float: The percentile, or 0.0 for an empty list.
+    """
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def run_load(url, method, body, concurrency, duration):
+    """
+    Sends requests over keep-alive connections from `concurrency` threads for `duration` seconds.
+
+    Returns:
+        tuple: (list of latencies in seconds, dict of status code -> count, elapsed seconds).
+    """
+    parts = urlsplit(url)
+    path = parts.path or "/"
+    payload = json.dumps(body).encode("utf-8") if body is not None else None
+    headers = {"Content-Type": "application/json"} if payload is not None else {}
+
+    latencies, statuses = [], {}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker():
+        connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+        local_latencies, local_statuses = [], {}
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                connection.request(method, path, body=payload, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+                status = "error"
+            local_latencies.append(time.perf_counter() - start)
+            local_statuses[status] = local_statuses.get(status, 0) + 1
+        connection.close()
+        with lock:
+            latencies.extend(local_latencies)
+            for status, count in local_statuses.items():
+                statuses[status] = statuses.get(status, 0) + count
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, statuses, time.perf_counter() - started
+
+
+def main():
+    """Runs a local load test against the HTTP API and prints throughput and latency percentiles."""
+    parser = argparse.ArgumentParser(description="Load generator for the supernet HTTP API")
+    parser.add_argument("--url", default="http://127.0.0.1:8080/run", help="Endpoint to hit")
+    parser.add_argument("--task", default="AI Analysis", help="Task sent in the request body (POST endpoints)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent keep-alive connections")
+    parser.add_argument("--duration", type=float, default=10.0, help="Test duration in seconds")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    is_get = urlsplit(args.url).path in ("/metrics", "/health")
+    latencies, statuses, elapsed = run_load(args.url, "GET" if is_get else "POST",
+                                            None if is_get else {"task": args.task},
+                                            args.concurrency, args.duration)
+    latencies.sort()
+    report = {
+        "requests": len(latencies),
+        "requests_per_second": len(latencies) / elapsed if elapsed else 0.0,
+        "latency_ms": {name: percentile(latencies, fraction) * 1000
+                       for name, fraction in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99), ("max", 1.0))},
+        "statuses": {str(status): count for status, count in statuses.items()},
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=4))
+        return
+
+    print(f"📈 {report['requests']} requests in {elapsed:.1f}s → {report['requests_per_second']:.1f} req/s")
+    print("⏱ Latency: " + ", ".join(f"{name} {value:.2f} ms" for name, value in report["latency_ms"].items()))
+    print("📋 Statuses: " + ", ".join(f"{status}: {count}" for status, count in report["statuses"].items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import os
+import subprocess
+import sys
+import argparse
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Command -> (import-time budget in ms, modules that must not be imported)
+HEAVY_MODULES = ["numpy", "networkx", "matplotlib", "requests", "yaml"]
+COMMAND_BUDGETS = {
+    "--help": (30, HEAVY_MODULES),
+    "--list": (50, HEAVY_MODULES),
+    "--list-agents": (50, HEAVY_MODULES),
+    "--query-memory BasicAgent": (50, HEAVY_MODULES),
+}
+
+
+def parse_importtime(stderr):
+    """
+    Parses `-X importtime` output into top-level imports.
+
+    Args:
+        stderr (str): The interpreter's stderr.
+
+    Returns:
+        tuple: (dict of top-level module -> cumulative microseconds, set of all imported modules).
+    """
+    roots = {}
+    modules = set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        stripped = name.strip()
+        modules.add(stripped)
+        if name[1:] == stripped:  # Top-level imports have no extra indentation
+            roots[stripped] = roots.get(stripped, 0) + int(cumulative)
+    return roots, modules
+
+
+def measure(command, startup_roots, repeat):
+    """
+    Measures the import time a CLI command adds on top of interpreter startup.
+
+    Args:
+        command (str): Arguments passed to main.py.
+        startup_roots (set): Top-level modules imported by a bare interpreter.
+        repeat (int): Runs to take the minimum of.
+
+    Returns:
+        tuple: (import time in ms, set of imported modules).
+    """
+    best, modules = None, set()
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, "-X", "importtime", "main.py", *command.split()],
+                                cwd=ROOT, capture_output=True, text=True, stdin=subprocess.DEVNULL)
+        roots, modules = parse_importtime(result.stderr)
+        total = sum(us for name, us in roots.items() if name not in startup_roots) / 1000
+        best = total if best is None else min(best, total)
+    return best, modules
+
+
+def main():
+    """Checks every command against its budget and exits non-zero on a regression."""
+    parser = argparse.ArgumentParser(description="CLI startup import-time budget check")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per command (the fastest is used)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply all budgets, e.g. for slow CI machines")
+    args = parser.parse_args()
+
+    baseline = subprocess.run([sys.executable, "-X", "importtime", "-c", "pass"], capture_output=True, text=True)
+    startup_roots = set(parse_importtime(baseline.stderr)[0])
+
+    failures = []
+    for command, (budget_ms, forbidden) in COMMAND_BUDGETS.items():
+        elapsed_ms, modules = measure(command, startup_roots, args.repeat)
+        budget_ms *= args.scale
+        heavy = [module for module in forbidden if module in modules]
+        ok = elapsed_ms <= budget_ms and not heavy
+        print(f"{'✅' if ok else '❌'} main.py {command:<28} {elapsed_ms:7.1f} ms (budget {budget_ms:.0f} ms)"
+              + (f" imports {', '.join(heavy)}" if heavy else ""))
+        if not ok:
+            failures.append(command)
+
+    if failures:
+        print(f"\n❌ Startup budget exceeded for: {', '.join(failures)}")
+        sys.exit(1)
+    print("\n✅ All commands within their startup budgets.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import numpy as np
+from benchmarks.synthetic import make_agents, make_tasks, make_texts
+from utils.histogram import LatencyHistogram
+
+RESULTS_FILE = os.path.join(os.path.dirname(__file__), "results", "latest.json")
+TOLERANCE = 0.25  # Relative throughput drop or p95 increase reported as a regression
+REPEAT = 3        # Runs per case; each operation keeps its fastest run to filter out scheduler noise
+
+# Sizes per scale: agents in the population, tasks run, memory entries, knowledge graph facts, routing keywords,
+# tasks registered in the task store
+SCALES = {
+    "small": {"agents": 3, "tasks": 200, "memory": 100, "facts": 1_000, "rules": 10, "registry": 10_000},
+    "medium": {"agents": 10, "tasks": 1_000, "memory": 1_000, "facts": 10_000, "rules": 100, "registry": 100_000},
+    "large": {"agents": 50, "tasks": 5_000, "memory": 10_000, "facts": 100_000, "rules": 1_000, "registry": 1_000_000},
+}
+
+
+def _measure(func, items):
+    """
+    Calls `func` on every item, timing each call.
+
+    Returns:
+        dict: {"count", "seconds", "throughput", "mean", "p50", "p95", "p99"} (latencies in seconds).
+    """
+    histogram = LatencyHistogram()
+    start = time.perf_counter()
+    for item in items:
+        call_start = time.perf_counter()
+        func(item)
+        histogram.record(time.perf_counter() - call_start)
+    seconds = time.perf_counter() - start
+    summary = histogram.summary()
+    return {"count": summary["count"], "seconds": seconds,
+            "throughput": summary["count"] / seconds if seconds else 0.0,
+            "mean": summary["mean"], "p50": summary["p50"], "p95": summary["p95"], "p99": summary["p99"]}
+
+
+def bench_routing(size, seed, latency):
+    """ Keyword router: building the automaton and matching texts. """
+    from core.router import KeywordRouter
+
+    keywords = [f"keyword{i:05d}" for i in range(size["rules"])]
+    rules = {keyword: f"action{i % 7}" for i, keyword in enumerate(keywords)}
+    texts = make_texts(size["tasks"] * 2, keywords, seed=seed)
+    return {
+        "build": _measure(lambda _: KeywordRouter(rules), range(5)),
+        "match": _measure(KeywordRouter(rules).match, texts),
+    }
+
+
+def bench_memory(size, seed, latency):
+    """ Agent memory at a given size: stores (each persists the file) and lookups. """
+    from core.memory import AgentMemory
+
+    rng = random.Random(seed)
+    memory = AgentMemory()
+    memory.memory = {f"Agent{a}": {f"task {a}-{i}": f"result {i}" for i in range(size["memory"] // 10)} for a in range(10)}
+    memory._save_memory()
+    keys = [(f"Agent{rng.randrange(10)}", f"task {rng.randrange(10)}-{rng.randrange(max(size['memory'] // 10, 1))}")
+            for _ in range(2_000)]
+    return {
+        "store": _measure(lambda i: memory.store(f"Agent{i % 10}", f"new task {i}", f"new result {i}"), range(200)),
+        "retrieve": _measure(lambda key: memory.retrieve(*key), keys),
+    }
+
+
+def bench_kg(size, seed, latency):
+    """ Knowledge graph: inserting facts, relation lookups and path searches. """
+    from core.knowledge_graph import KnowledgeGraph
+
+    rng = random.Random(seed)
+    entities = [f"entity{i}" for i in range(max(size["facts"] // 10, 2))]
+    graph = KnowledgeGraph()
+    for _ in range(size["facts"]):
+        graph.add_fact(rng.choice(entities), "relates_to", rng.choice(entities))
+    new_facts = [(rng.choice(entities), "mentions", rng.choice(entities)) for _ in range(1_000)]
+    return {
+        "add_fact": _measure(lambda fact: graph.add_fact(*fact), new_facts),
+        "get_relations": _measure(graph.get_relations, [rng.choice(entities) for _ in range(2_000)]),
+        "find_path": _measure(lambda pair: graph.find_path(*pair),
+                              [(rng.choice(entities), rng.choice(entities)) for _ in range(200)]),
+    }
+
+
+def bench_controller(size, seed, latency):
+    """ Controller: sampling agents, executing them, rewarding the supernet and tracking metrics. """
+    from core.agentic_supernet import AgenticSupernet
+    from core.controller import Controller
+    from utils.metrics import MetricsTracker, set_metrics_tracker
+
+    metrics_tracker = MetricsTracker(path=None)
+    set_metrics_tracker(metrics_tracker)
+    supernet = AgenticSupernet(make_agents(size["agents"], seed, latency), num_samples="auto")
+    controller = Controller(supernet, metrics_tracker)
+    result = {"execute_task": _measure(controller.execute_task, make_tasks(size["tasks"], seed))}
+    result["execute_task"]["success_rate"] = float(np.mean(
+        [controller.execute_task(task) for task in make_tasks(100, seed + 1)]))
+    return result
+
+
+def bench_collaboration(size, seed, latency):
+    """ Agent team: splitting tasks, executing and refining subtasks. """
+    from core.collaboration import AgentTeam
+
+    team = AgentTeam(make_agents(size["agents"], seed, latency))
+    tasks = [task["name"] for task in make_tasks(max(size["tasks"] // 5, 1), seed)]
+    return {"execute_task": _measure(team.execute_task, tasks)}
+
+
+def bench_tasks(size, seed, latency):
+    """ SQLite task store: a streamed bulk import, lookups by name, filtered pages and counts. """
+    from core.task_manager import TaskManager
+
+    rng = random.Random(seed)
+    count = size["registry"]
+    with open("tasks.jsonl", "w") as file:
+        for i in range(count):
+            file.write(json.dumps({"name": f"Synthetic task {i}", "complexity": rng.randint(1, 10)}) + "\n")
+    task_manager = TaskManager("tasks.db")
+    result = {"import": _measure(task_manager.import_tasks, ["tasks.jsonl"])}
+    result["import"]["throughput"] = count / result["import"]["seconds"]  # Tasks per second
+    result["get_task"] = _measure(task_manager.get_task, [f"Synthetic task {rng.randrange(count)}" for _ in range(2_000)])
+    pages = [(rng.randint(1, 10), rng.randrange(count // 20)) for _ in range(200)]
+    result["page"] = _measure(lambda page: task_manager.list_tasks(min_complexity=page[0], max_complexity=page[0],
+                                                                   offset=page[1], limit=50), pages)
+    result["count"] = _measure(lambda complexity: task_manager.count_tasks(min_complexity=complexity), range(1, 11))
+    return result
+
+
+WORKLOADS = {
+    "routing": bench_routing,
+    "memory": bench_memory,
+    "kg": bench_kg,
+    "controller": bench_controller,
+    "collaboration": bench_collaboration,
+    "tasks": bench_tasks,
+}
+
+
+def peak_rss_kib():
+    """
+    Returns:
+        int or None: Peak resident set size of this process in KiB (None where unsupported).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # macOS reports bytes
+
+
+def run_case(workload, scale, seed, latency):
+    """
+    Runs one workload at one scale in a scratch directory, seeding every RNG first.
+
+    Returns:
+        dict: {"workload", "scale", "ops": {operation: stats}, "peak_rss_kib"}.
+    """
+    from utils.logger import configure_logging
+
+    configure_logging(console=False)
+    random.seed(seed)
+    np.random.seed(seed)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as scratch, open(os.devnull, "w") as devnull:
+        os.chdir(scratch)  # memory.json, logs and other state files stay out of the repository
+        try:
+            with contextlib.redirect_stdout(devnull):
+                ops = WORKLOADS[workload](SCALES[scale], seed, latency)
+        finally:
+            os.chdir(cwd)
+    return {"workload": workload, "scale": scale, "ops": ops, "peak_rss_kib": peak_rss_kib()}
+
+
+def run_isolated(workload, scale, seed, latency):
+    """ Runs a case in a fresh interpreter, so peak RSS and warm caches are per case. """
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--case", workload, "--scales", scale,
+         "--seed", str(seed), "--latency-ms", str(latency * 1e3)],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def best_of(runs):
+    """
+    Combines repeated runs of a case, keeping each operation's highest-throughput run.
+
+    Args:
+        runs (list): Results of `run_case` for the same workload and scale.
+
+    Returns:
+        dict: A single case result.
+    """
+    best = dict(runs[0], ops={})
+    for op in runs[0]["ops"]:
+        best["ops"][op] = max((run["ops"][op] for run in runs), key=lambda stats: stats["throughput"])
+    rss = [run["peak_rss_kib"] for run in runs if run["peak_rss_kib"] is not None]
+    best["peak_rss_kib"] = max(rss) if rss else None
+    return best
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """
+    Compares results with a baseline run.
+
+    Args:
+        results (list): Case results of this run.
+        baseline (list): Case results of the baseline run.
+        tolerance (float): Allowed relative throughput drop and p95 increase.
+
+    Returns:
+        list: (workload, scale, operation, throughput ratio, p95 ratio, regressed) tuples.
+    """
+    previous = {(case["workload"], case["scale"], op): stats
+                for case in baseline for op, stats in case["ops"].items()}
+    rows = []
+    for case in results:
+        for op, stats in case["ops"].items():
+            old = previous.get((case["workload"], case["scale"], op))
+            if not old:
+                continue
+            throughput_ratio = stats["throughput"] / old["throughput"] if old["throughput"] else 1.0
+            p95_ratio = stats["p95"] / old["p95"] if old["p95"] else 1.0
+            regressed = throughput_ratio < 1 - tolerance or p95_ratio > 1 + tolerance
+            rows.append((case["workload"], case["scale"], op, throughput_ratio, p95_ratio, regressed))
+    return rows
+
+
+def main():
+    """Runs the selected workloads and scales, writes JSON results and checks them against a baseline."""
+    parser = argparse.ArgumentParser(description="Seeded performance benchmark suite")
+    parser.add_argument("--workloads", default=",".join(WORKLOADS), help=f"Comma-separated subset of: {', '.join(WORKLOADS)}")
+    parser.add_argument("--scales", default="small,medium", help=f"Comma-separated subset of: {', '.join(SCALES)}")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for every RNG")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Mean synthetic agent latency (0 measures framework overhead)")
+    parser.add_argument("--output", default=RESULTS_FILE, help="Where the JSON results are written")
+    parser.add_argument("--baseline", metavar="FILE", help="Compare with a previous results file; exit 1 on regression")
+    parser.add_argument("--save-baseline", metavar="FILE", help="Also write the results to FILE for later comparisons")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="Runs per case; the fastest is kept")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="Allowed relative throughput drop / p95 increase")
+    parser.add_argument("--in-process", action="store_true", help="Run all cases in this process (faster; peak RSS is then cumulative)")
+    parser.add_argument("--case", help=argparse.SUPPRESS)  # Used by isolated runs
+    args = parser.parse_args()
+    latency = args.latency_ms / 1e3
+
+    if args.case:
+        print(json.dumps(run_case(args.case, args.scales, args.seed, latency)))
+        return
+
+    workloads = [w for w in args.workloads.split(",") if w]
+    scales = [s for s in args.scales.split(",") if s]
+    unknown = [w for w in workloads if w not in WORKLOADS] + [s for s in scales if s not in SCALES]
+    if unknown:
+        parser.error(f"Unknown workloads or scales: {', '.join(unknown)}")
+
+    results = []
+    for workload in workloads:
+        for scale in scales:
+            runner = run_case if args.in_process else run_isolated
+            case = best_of([runner(workload, scale, args.seed, latency) for _ in range(max(args.repeat, 1))])
+            results.append(case)
+            for op, stats in case["ops"].items():
+                print(f"⏱ {workload:<14} {scale:<7} {op:<14} {stats['throughput']:12.1f} ops/s  "
+                      f"p50 {stats['p50'] * 1e3:8.3f} ms  p95 {stats['p95'] * 1e3:8.3f} ms  "
+                      f"p99 {stats['p99'] * 1e3:8.3f} ms  rss {case['peak_rss_kib'] or 0:>8} KiB")
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed": args.seed,
+            "latency_ms": args.latency_ms,
+            "isolated": not args.in_process,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    for path in filter(None, [args.output, args.save_baseline]):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as file:
+            json.dump(report, file, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r") as file:
+            baseline = json.load(file)["results"]
+        rows = compare(results, baseline, args.tolerance)
+        print(f"\n📊 Compared with {args.baseline} (tolerance {args.tolerance:.0%}):")
+        for workload, scale, op, throughput_ratio, p95_ratio, regressed in rows:
+            print(f"{'❌' if regressed else '✅'} {workload:<14} {scale:<7} {op:<14} "
+                  f"throughput x{throughput_ratio:.2f}  p95 x{p95_ratio:.2f}")
+        regressions = [row for row in rows if row[-1]]
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) beyond {args.tolerance:.0%}.")
+            sys.exit(1)
+        print("\n✅ No regressions.")
+
+
+if __name__ == "__main__":
+    main()
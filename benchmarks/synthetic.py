@@ -0,0 +1,108 @@
+import os
+import random
+import sys
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from agents.base_agent import BaseAgent
+from core.resilience import ToolError
+
+
+class SyntheticAgent(BaseAgent):
+    """
+    Agent with a configurable latency and success profile, driven by its own
+    seeded RNG so benchmark runs are reproducible.
+    """
+
+    def __init__(self, name, capability, cost, success_rate, latency=0.0, jitter=0.0, seed=0):
+        """
+        Args:
+            name (str): Agent name.
+            capability (int): Capability used by the supernet's filters.
+            cost (int): Cost per execution.
+            success_rate (float): Probability that an execution succeeds.
+            latency (float): Mean seconds an execution takes (0 measures pure framework overhead).
+            jitter (float): Relative spread of the latency (lognormal sigma).
+            seed (int): RNG seed.
+        """
+        super().__init__(name, capability, cost)
+        self.success_rate = success_rate
+        self.latency = latency
+        self.jitter = jitter
+        self.rng = random.Random(seed)
+
+    def execute(self, task):
+        if self.latency:
+            time.sleep(self.latency * self.rng.lognormvariate(0.0, self.jitter) if self.jitter else self.latency)
+        if self.rng.random() < self.success_rate:
+            return f"{self.name} completed {task}"
+        return ToolError(f"❌ {self.name} failed {task}")
+
+
+def make_agents(count, seed=0, latency=0.0, jitter=0.0):
+    """
+    Builds a population whose capability, cost and success rate rise together,
+    from cheap unreliable agents to expensive reliable ones.
+
+    Args:
+        count (int): Number of agents.
+        seed (int): Base RNG seed.
+        latency (float): Mean execution latency in seconds.
+        jitter (float): Relative latency spread.
+
+    Returns:
+        list: The agents.
+    """
+    agents = []
+    for i in range(count):
+        level = i / max(count - 1, 1)
+        agents.append(SyntheticAgent(
+            name=f"Synthetic{i:03d}",
+            capability=1 + round(level * 9),
+            cost=1 + round(level * 7),
+            success_rate=0.5 + 0.49 * level,
+            latency=latency,
+            jitter=jitter,
+            seed=seed * 1000 + i,
+        ))
+    return agents
+
+
+def make_tasks(count, seed=0):
+    """
+    Builds tasks with uniformly distributed complexity.
+
+    Args:
+        count (int): Number of tasks.
+        seed (int): RNG seed.
+
+    Returns:
+        list: Task dicts ({"name", "complexity"}).
+    """
+    rng = random.Random(seed)
+    return [{"name": f"Synthetic task {i}", "complexity": rng.randint(1, 10)} for i in range(count)]
+
+
+def make_texts(count, keywords, length=200, seed=0):
+    """
+    Builds filler texts, about half of which contain one of the keywords.
+
+    Args:
+        count (int): Number of texts.
+        keywords (list): Keywords to embed.
+        length (int): Approximate text length in characters.
+        seed (int): RNG seed.
+
+    Returns:
+        list: The texts.
+    """
+    rng = random.Random(seed)
+    words = ["analysis", "report", "quarterly", "system", "review", "data", "status", "update", "summary", "plan"]
+    texts = []
+    for _ in range(count):
+        parts = []
+        while sum(len(part) + 1 for part in parts) < length:
+            parts.append(rng.choice(words))
+        if keywords and rng.random() < 0.5:
+            parts.insert(rng.randrange(len(parts)), rng.choice(keywords))
+        texts.append(" ".join(parts))
+    return texts
@@ -1,47 +1,254 @@
+import ast
+import hashlib
 import importlib
+import json
 import os
 import inspect
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from agents.base_agent import BaseAgent
+from utils.storage import atomic_write_json
 
-def load_agents():
+AGENT_MANIFEST_FILE = ".cache/agent_manifest.json"
+MANIFEST_VERSION = 1
+
+
+def _literal(node):
+    """ Evaluates an AST node if it is a literal, otherwise returns None. """
+    try:
+        return ast.literal_eval(node)
+    except ValueError:
+        return None
+
+
+def parse_agent_file(path):
     """
-    Dynamically loads all agent classes from the `agents` directory while 
-    ignoring deleted agents that have been moved to the Recycle Bin.
-    
+    Reads agent metadata from a source file without importing it.
+
+    Looks for classes deriving from `BaseAgent` whose `__init__` calls
+    `super().__init__(name=..., capability=..., cost=...)` with literal values.
+    A class with any other base may subclass another agent (e.g. `MidAgent`),
+    which only an import can tell, so such files are not parsed statically.
+
+    Args:
+        path (str): Path to the agent module.
+
     Returns:
-        list: A list of instantiated agent objects.
+        list or None: One dict per agent class ({"class_name", "name", "capability", "cost"}),
+        or None if the metadata cannot be determined statically (including when no agent class was found).
     """
-    agents = []
-    agents_dir = os.path.abspath("agents")
-    recycle_bin = os.path.abspath("deleted_agents")
+    with open(path, "r", encoding="utf-8") as file:
+        tree = ast.parse(file.read(), filename=path)
 
-    # Ensure the directory is in the Python path
-    if agents_dir not in sys.path:
-        sys.path.append(agents_dir)
+    found = []
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        base_names = {base.id if isinstance(base, ast.Name) else getattr(base, "attr", None) for base in node.bases}
+        if "BaseAgent" not in base_names:
+            if node.bases:
+                return None
+            continue
 
-    for file in os.listdir(agents_dir):
-        agent_path = os.path.join(agents_dir, file)
+        init_args = None
+        for call in ast.walk(node):
+            if (isinstance(call, ast.Call) and isinstance(call.func, ast.Attribute) and call.func.attr == "__init__"
+                    and isinstance(call.func.value, ast.Call) and getattr(call.func.value.func, "id", None) == "super"):
+                init_args = dict(zip(("name", "capability", "cost"), (_literal(arg) for arg in call.args)))
+                init_args.update({kw.arg: _literal(kw.value) for kw in call.keywords if kw.arg})
+                break
 
-        # Ignore non-Python files and deleted agents
-        if not file.endswith("_agent.py") or file == "base_agent.py":
-            continue
+        if init_args is None or not isinstance(init_args.get("name"), str):
+            return None
+        capability, cost = init_args.get("capability", 1), init_args.get("cost", 1)
+        if not isinstance(capability, (int, float)) or not isinstance(cost, (int, float)):
+            return None
 
-        if os.path.exists(os.path.join(recycle_bin, file)):  # ✅ Skip if agent is in Recycle Bin
-            continue
+        found.append({"class_name": node.name, "name": init_args["name"], "capability": capability, "cost": cost})
 
-        module_name = f"agents.{file[:-3]}"  # Remove `.py` extension
+    return found or None
+
+
+class LazyAgent(BaseAgent):
+    """
+    Stand-in for an agent that only imports and instantiates the real agent when it is used.
+
+    Name, capability and cost come from the registry manifest, which is all the
+    supernet needs for routing. Any other attribute is forwarded to the real agent.
+    """
+
+    def __init__(self, spec, registry):
+        super().__init__(name=spec["name"], capability=spec["capability"], cost=spec["cost"])
+        self.spec = spec
+        self._registry = registry
+        self._agent = None
+
+    @property
+    def agent(self):
+        """ Returns the real agent, creating it on first access. """
+        if self._agent is None:
+            self._agent = self._registry.instantiate(self.spec)
+        return self._agent
+
+    def execute(self, task):
+        return self.agent.execute(task)
+
+    def __getattr__(self, attr):
+        if attr.startswith("_") or attr in ("spec", "agent"):
+            raise AttributeError(attr)
+        return getattr(self.agent, attr)
+
+    def __repr__(self):
+        return f"{self.spec['class_name']}(name={self.name}, capability={self.capability}, cost={self.cost})"
+
+
+class AgentRegistry:
+    """
+    Discovers agents through a cached manifest instead of importing every agent module.
+
+    The manifest records, per `*_agent.py` file, its mtime, size, content hash and
+    the agent classes it defines. Unchanged files are never read; changed files are
+    re-parsed statically and only imported when their metadata is not literal.
+    """
 
+    def __init__(self, agents_dir="agents", recycle_bin="deleted_agents", manifest_file=AGENT_MANIFEST_FILE):
+        """
+        Args:
+            agents_dir (str): Directory containing agent modules.
+            recycle_bin (str): Directory of deleted agents, which are skipped.
+            manifest_file (str): Where the manifest is cached.
+        """
+        self.agents_dir = os.path.abspath(agents_dir)
+        self.recycle_bin = os.path.abspath(recycle_bin)
+        self.manifest_file = manifest_file
+        self.manifest = self._load_manifest()
+        self._loaded_mtimes = {}
+
+    def _load_manifest(self):
+        """ Loads the cached manifest, ignoring it if missing, corrupted or outdated. """
+        if os.path.exists(self.manifest_file):
+            try:
+                with open(self.manifest_file, "r") as file:
+                    manifest = json.load(file)
+                if manifest.get("version") == MANIFEST_VERSION:
+                    return manifest
+            except (json.JSONDecodeError, OSError):
+                pass
+        return {"version": MANIFEST_VERSION, "files": {}}
+
+    def _save_manifest(self):
+        """ Writes the manifest atomically so concurrent CLI runs never read a partial file. """
+        atomic_write_json(self.manifest_file, self.manifest, durable=False)  # A cache: rebuilt if lost
+
+    def refresh(self):
+        """
+        Brings the manifest up to date with the agents directory.
+
+        Returns:
+            list: Specs ({"file", "module", "class_name", "name", "capability", "cost"}) of all active agents.
+        """
+        entries = self.manifest["files"]
+        changed = False
+        current = set()
+
+        for file in sorted(os.listdir(self.agents_dir)):
+            if not file.endswith("_agent.py") or file == "base_agent.py":
+                continue
+            if os.path.exists(os.path.join(self.recycle_bin, file)):  # ✅ Skip if agent is in Recycle Bin
+                continue
+
+            current.add(file)
+            path = os.path.join(self.agents_dir, file)
+            stat = os.stat(path)
+            entry = entries.get(file)
+            if entry and entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+                continue
+
+            with open(path, "rb") as handle:
+                digest = hashlib.sha1(handle.read()).hexdigest()
+            if not entry or entry["sha1"] != digest:
+                entry = {"sha1": digest, "agents": self._describe(file, path)}
+            entry.update(mtime=stat.st_mtime, size=stat.st_size)
+            entries[file] = entry
+            changed = True
+
+        for file in set(entries) - current:
+            del entries[file]
+            changed = True
+
+        if changed:
+            self._save_manifest()
+
+        return [dict(agent, file=file, module=f"agents.{file[:-3]}")
+                for file in sorted(current) for agent in entries[file]["agents"]]
+
+    def _describe(self, file, path):
+        """ Returns agent metadata for a file, importing it only if static parsing is not enough. """
         try:
-            module = importlib.import_module(module_name)
-            importlib.reload(module)  # Ensure fresh reload
+            agents = parse_agent_file(path)
+        except SyntaxError as e:
+            print(f"⚠ Error loading agent {file}: {e}")
+            return []
+        if agents is not None:
+            return agents
 
-            for name, obj in inspect.getmembers(module, inspect.isclass):
-                if issubclass(obj, BaseAgent) and obj is not BaseAgent:
-                    agents.append(obj())  # Instantiate the agent
+        module = self._import(f"agents.{file[:-3]}", path)
+        if module is None:
+            return []
+        return [{"class_name": name, "name": agent.name, "capability": agent.capability, "cost": agent.cost}
+                for name, obj in inspect.getmembers(module, inspect.isclass)
+                if issubclass(obj, BaseAgent) and obj is not BaseAgent and obj.__module__ == module.__name__
+                for agent in [obj()]]
 
+    def _import(self, module_name, path):
+        """ Imports an agent module, reloading it only if its file changed since it was last loaded. """
+        try:
+            mtime = os.stat(path).st_mtime
+            module = sys.modules.get(module_name)
+            if module is None:
+                module = importlib.import_module(module_name)
+            elif self._loaded_mtimes.get(module_name) != mtime:
+                module = importlib.reload(module)
+            self._loaded_mtimes[module_name] = mtime
+            return module
         except ModuleNotFoundError as e:
-            print(f"⚠ Error loading agent {file}: {e}")
+            print(f"⚠ Error loading agent {os.path.basename(path)}: {e}")
+            return None
+
+    def instantiate(self, spec):
+        """
+        Imports the agent's module (if needed) and creates the agent.
+
+        Args:
+            spec (dict): Agent spec as returned by `refresh()`.
+
+        Returns:
+            BaseAgent: The agent instance.
+        """
+        module = self._import(spec["module"], os.path.join(self.agents_dir, spec["file"]))
+        if module is None:
+            raise ImportError(f"Agent module '{spec['module']}' could not be loaded.")
+        return getattr(module, spec["class_name"])()
+
+
+def load_agents(lazy=True):
+    """
+    Loads all agents from the `agents` directory while ignoring deleted agents
+    that have been moved to the Recycle Bin.
+
+    Args:
+        lazy (bool): If True, return `LazyAgent` stand-ins built from the cached
+            manifest; modules are imported only when an agent is actually used.
+
+    Returns:
+        list: A list of agent objects.
+    """
+    agents_dir = os.path.abspath("agents")
+
+    # Ensure the directory is in the Python path
+    if agents_dir not in sys.path:
+        sys.path.append(agents_dir)
 
-    return agents
+    registry = AgentRegistry()
+    agents = [LazyAgent(spec, registry) for spec in registry.refresh()]
+    return agents if lazy else [agent.agent for agent in agents]
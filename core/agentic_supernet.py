@@ -1,23 +1,82 @@
+import atexit
+import os
+import tempfile
+import threading
 import numpy as np
 import random
 
+MAX_COMPLEXITY = 10  # Complexities above this share the top bucket of `complexity_stats`
+REWARD_SCALE = 0.05  # Reward for a success (negated for a failure)
+MAX_REWARD = 1.0     # Bound on a single reward event
+LOGIT_CLIP = 20.0    # Bound on |logit|, so no agent is ever starved for good
+SUCCESS_TARGET = 0.9 # Adaptive sampling adds agents until a success is at least this likely
+
 class AgenticSupernet:
     """ 
     Probabilistic model for selecting the best agentic architecture dynamically. 
     Uses Monte Carlo sampling and entropy regularization to balance performance and cost.
     """
 
-    def __init__(self, agents, entropy_weight=0.1):
+    def __init__(self, agents, entropy_weight=0.1, temperature=1.0, num_samples=3, max_samples=3, learn=True):
         """
         Initializes the agentic supernet with a set of agents.
 
         Args:
             agents (list): List of available agents.
             entropy_weight (float): Weight for entropy regularization to encourage diversity.
+            temperature (float): Softmax temperature; higher values flatten the distribution.
+            num_samples (int or str): Agents sampled per task, or "auto" to size the sample
+                from the success statistics of the task's complexity.
+            max_samples (int): Upper bound on the adaptive sample size.
+            learn (bool): Whether rewards update the distribution; False keeps it fixed
+                (uniform unless a checkpoint is loaded), e.g. as a random-routing baseline.
         """
+        if temperature <= 0:
+            raise ValueError("temperature must be positive.")
         self.agents = agents
-        self.architecture_distribution = np.ones(len(agents)) / len(agents)  
         self.entropy_weight = entropy_weight  
+        self.temperature = temperature
+        self.num_samples = num_samples
+        self.max_samples = max_samples
+        self.learn = learn
+        # Rewards accumulate in log space; the distribution is their softmax
+        self.logits = np.zeros(len(agents))
+        self._refresh_distribution()
+        # Per task complexity and agent: [successes, trials]
+        self.complexity_stats = np.zeros((MAX_COMPLEXITY + 1, len(agents), 2))
+        self._agent_index = {id(agent): i for i, agent in enumerate(agents)}
+
+        self.checkpoint_path = None
+        self.checkpoint_interval = 0
+        self._updates_since_checkpoint = 0
+        # Held while the learned state changes or is saved: requests reward the supernet from many threads
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_config(cls, agents, config=None, metrics_tracker=None):
+        """
+        Builds a supernet from `configs/settings.yaml` settings, warm-started from
+        the latest checkpoint (or metrics history) and checkpointing as it learns.
+
+        Args:
+            agents (list): List of available agents.
+            config (dict): Parsed settings.
+            metrics_tracker (MetricsTracker): History used when no checkpoint exists.
+
+        Returns:
+            AgenticSupernet: The ready supernet.
+        """
+        config = config or {}
+        supernet = cls(agents, entropy_weight=config.get("entropy_weight", 0.1),
+                       temperature=config.get("temperature", 1.0),
+                       num_samples=config.get("num_samples", 3),
+                       max_samples=config.get("max_samples", 3))
+
+        checkpoint = config.get("checkpoint") or {}
+        if checkpoint.get("path"):
+            supernet.warm_start(checkpoint["path"], metrics_tracker)
+            supernet.enable_checkpoints(checkpoint["path"], checkpoint.get("interval", 50))
+        return supernet
 
     def update_distribution(self, agent_idx, reward):
         """
@@ -27,27 +86,261 @@ class AgenticSupernet:
             agent_idx (int): Index of the agent in the supernet.
             reward (float): Reward for the agent (positive for success, negative for failure).
         """
-        self.architecture_distribution[agent_idx] += reward
-        self.architecture_distribution /= self.architecture_distribution.sum()  
+        self.update_batch([agent_idx], [reward])
+
+    def update_batch(self, indices, rewards):
+        """
+        Applies many rewards in one vectorized step.
+
+        Rewards are summed per agent into the logits, which are clipped to
+        [-LOGIT_CLIP, LOGIT_CLIP]; the distribution is then recomputed once with a
+        max-shifted softmax, so it is always finite, positive and normalized.
+
+        Args:
+            indices (array-like): Agent index of each reward event.
+            rewards (array-like): Reward of each event, clipped to [-MAX_REWARD, MAX_REWARD].
+        """
+        if not self.learn:
+            return
+        deltas = self._reward_deltas(indices, rewards)
+        with self._lock:
+            self.logits += deltas
+            np.clip(self.logits, -LOGIT_CLIP, LOGIT_CLIP, out=self.logits)
+            self._refresh_distribution()
+
+    def _reward_deltas(self, indices, rewards):
+        """ Sums reward events into one logit delta per agent. """
+        rewards = np.clip(np.nan_to_num(np.asarray(rewards, dtype=np.float64)), -MAX_REWARD, MAX_REWARD)
+        return np.bincount(np.asarray(indices, dtype=np.intp), weights=rewards, minlength=len(self.agents))
+
+    def _refresh_distribution(self):
+        """ Derives the sampling distribution from the logits, mixed toward uniform by the entropy weight. """
+        scaled = self.logits / self.temperature
+        distribution = np.exp(scaled - scaled.max())
+        distribution /= distribution.sum()
+
+        entropy = -np.sum(distribution * np.log(distribution + 1e-8))
+        distribution += self.entropy_weight * entropy
+        self.architecture_distribution = distribution / distribution.sum()
+
+    def record_outcome(self, agent_idx, complexity, success):
+        """
+        Records whether an agent succeeded on a task of the given complexity.
+
+        Args:
+            agent_idx (int): Index of the agent in the supernet.
+            complexity (int): Task complexity.
+            success (bool): Whether the agent succeeded.
+        """
+        bucket = min(max(int(complexity), 0), MAX_COMPLEXITY)
+        with self._lock:
+            self.complexity_stats[bucket, agent_idx, 0] += bool(success)
+            self.complexity_stats[bucket, agent_idx, 1] += 1
+
+    def record_outcomes(self, indices, complexities, successes):
+        """
+        Records many outcomes in one vectorized step (see `record_outcome`).
+
+        Args:
+            indices (array-like): Agent index of each outcome.
+            complexities (array-like): Task complexity of each outcome.
+            successes (array-like): Whether each run succeeded.
+        """
+        buckets = np.clip(np.asarray(complexities, dtype=np.intp), 0, MAX_COMPLEXITY)
+        indices = np.asarray(indices, dtype=np.intp)
+        with self._lock:
+            np.add.at(self.complexity_stats, (buckets, indices, 0), np.asarray(successes, dtype=bool))
+            np.add.at(self.complexity_stats, (buckets, indices, 1), 1)
+
+    def reward(self, agent, task, success):
+        """
+        Feeds one agent's outcome on a task back into the distribution and statistics.
+
+        Args:
+            agent (BaseAgent): The agent that ran.
+            task (dict): The task, including its complexity.
+            success (bool): Whether the agent succeeded.
+        """
+        agent_idx = self._agent_index[id(agent)]
+        with self._lock:
+            self.record_outcome(agent_idx, task["complexity"], success)
+            self.update_distribution(agent_idx, REWARD_SCALE if success else -REWARD_SCALE)
+            self._updates_since_checkpoint += 1
+            if self.checkpoint_path and self._updates_since_checkpoint >= self.checkpoint_interval:
+                self.save_checkpoint(self.checkpoint_path)
+
+    def enable_checkpoints(self, path, interval=50):
+        """
+        Saves a checkpoint every `interval` rewards and when the interpreter exits.
+
+        Args:
+            path (str): Checkpoint file (.npz).
+            interval (int): Rewards between checkpoints.
+        """
+        if self.checkpoint_path is None:
+            atexit.register(self._checkpoint_at_exit)
+        self.checkpoint_path = path
+        self.checkpoint_interval = interval
+
+    def _checkpoint_at_exit(self):
+        with self._lock:
+            if self.checkpoint_path and self._updates_since_checkpoint:
+                self.save_checkpoint(self.checkpoint_path)
+
+    def save_checkpoint(self, path):
+        """
+        Atomically writes the learned state: the file is written under a unique
+        temporary name in the same directory and renamed into place, so readers
+        never see a partial checkpoint and concurrent writers never share a file.
+
+        Args:
+            path (str): Checkpoint file (.npz).
+        """
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    np.savez(file,
+                             agent_names=np.array([agent.name for agent in self.agents]),
+                             logits=self.logits,
+                             distribution=self.architecture_distribution,
+                             complexity_stats=self.complexity_stats)
+                os.replace(temp_path, path)
+            except BaseException:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+                raise
+            self._updates_since_checkpoint = 0
+
+    def load_checkpoint(self, path):
+        """
+        Restores state saved by `save_checkpoint`. Agents are matched by name;
+        agents missing from the checkpoint start at the average logit.
+
+        Args:
+            path (str): Checkpoint file (.npz).
+        """
+        with np.load(path) as checkpoint:
+            saved = {str(name): i for i, name in enumerate(checkpoint["agent_names"])}
+            if "logits" in checkpoint.files:
+                saved_logits = checkpoint["logits"]
+            else:  # Checkpoints written before logits were stored
+                saved_logits = np.log(np.clip(checkpoint["distribution"], 1e-8, None))
+            stats = checkpoint["complexity_stats"]
+
+        known = [(i, saved[agent.name]) for i, agent in enumerate(self.agents) if agent.name in saved]
+        logits = np.full(len(self.agents), saved_logits.mean() if len(saved_logits) else 0.0)
+        with self._lock:
+            for i, j in known:
+                logits[i] = saved_logits[j]
+                self.complexity_stats[:, i] = stats[:, j]
+            self.logits = np.clip(np.nan_to_num(logits), -LOGIT_CLIP, LOGIT_CLIP)
+            self._refresh_distribution()
+
+    def bootstrap_from_metrics(self, metrics_tracker):
+        """
+        Sets the distribution from historical agent selection counts, the policy that
+        past runs converged to, smoothed with one pseudo-count per agent.
+
+        Args:
+            metrics_tracker (MetricsTracker): Tracker holding the history.
+        """
+        counts = np.array([metrics_tracker.get_agent_selection_count(agent.name) for agent in self.agents], dtype=float)
+        logits = np.log(counts + 1.0)
+        with self._lock:
+            self.logits = np.clip(logits - logits.mean(), -LOGIT_CLIP, LOGIT_CLIP)
+            self._refresh_distribution()
+
+    def warm_start(self, path, metrics_tracker=None):
+        """
+        Loads the checkpoint at `path` if there is one, otherwise bootstraps priors from metrics history.
 
-        entropy = -np.sum(self.architecture_distribution * np.log(self.architecture_distribution + 1e-8))
-        self.architecture_distribution += self.entropy_weight * entropy
-        self.architecture_distribution /= self.architecture_distribution.sum()  
+        Args:
+            path (str): Checkpoint file (.npz).
+            metrics_tracker (MetricsTracker): History used when no checkpoint exists.
+
+        Returns:
+            str: "checkpoint", "metrics" or "uniform", depending on what was used.
+        """
+        if os.path.exists(path):
+            try:
+                self.load_checkpoint(path)
+                return "checkpoint"
+            except (OSError, ValueError, KeyError) as e:
+                print(f"⚠ Could not load supernet checkpoint '{path}': {e}")
+        if metrics_tracker is not None:
+            self.bootstrap_from_metrics(metrics_tracker)
+            return "metrics"
+        return "uniform"
+
+    def success_estimates(self, complexity):
+        """
+        Pessimistic success rate of each agent at a complexity: the mean of the
+        Beta(1 + successes, 1 + failures) posterior minus one standard deviation,
+        so agents with little history count as unreliable.
+
+        Args:
+            complexity (int): Task complexity.
+
+        Returns:
+            np.ndarray: One estimate in [0, 1] per agent.
+        """
+        bucket = min(max(int(complexity), 0), MAX_COMPLEXITY)
+        with self._lock:
+            successes, trials = self.complexity_stats[bucket, :, 0].copy(), self.complexity_stats[bucket, :, 1].copy()
+        mean = (successes + 1.0) / (trials + 2.0)
+        std = np.sqrt(mean * (1.0 - mean) / (trials + 3.0))
+        return np.clip(mean - std, 0.0, 1.0)
+
+    def adaptive_sample_count(self, task, order):
+        """
+        Chooses how many of the drawn agents to run on a task: the shortest prefix
+        of `order` whose chance of at least one success, from each agent's
+        `success_estimates`, reaches `SUCCESS_TARGET`. A count of 1 therefore means
+        the first drawn agent is reliable on its own; if no prefix is reliable
+        enough, every drawn agent runs.
+
+        Args:
+            task (dict): Task details including complexity.
+            order (array-like): Indices of the drawn agents, in draw order.
 
-    def sample_architecture(self, task, num_samples=3):
+        Returns:
+            int: Number of agents to run, between 1 and `len(order)`.
+        """
+        estimates = self.success_estimates(task["complexity"])[np.asarray(order, dtype=np.intp)]
+        enough = np.nonzero(1.0 - np.cumprod(1.0 - estimates) >= SUCCESS_TARGET)[0]
+        return int(enough[0] + 1) if len(enough) else max(len(estimates), 1)
+
+    def sample_architecture(self, task, num_samples=None):
         """
         Dynamically selects agents based on task complexity and cost constraints.
+        Agents are drawn without replacement, so none runs twice on the same task.
 
         Args:
             task (dict): Task details including complexity.
-            num_samples (int): Number of agents to sample.
+            num_samples (int or str): Number of agents to sample, or "auto" to draw
+                up to `max_samples` and keep the first `adaptive_sample_count` of
+                them. Defaults to the supernet's setting.
 
         Returns:
-            list: Selected agents for the given task.
+            list: Selected agents for the given task, most likely first.
         """
-        sampled_agents = np.random.choice(
-            self.agents, size=num_samples, p=self.architecture_distribution, replace=True
+        num_samples = self.num_samples if num_samples is None else num_samples
+        adaptive = num_samples == "auto"
+        if adaptive:
+            num_samples = self.max_samples
+
+        indices = np.random.choice(
+            len(self.agents), size=min(int(num_samples), len(self.agents)),
+            p=self.architecture_distribution, replace=False
         )
+        if adaptive:
+            indices = indices[:self.adaptive_sample_count(task, indices)]
+        sampled_agents = [self.agents[i] for i in indices]
 
         selected_agents = []
         for agent in sampled_agents:
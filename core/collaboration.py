@@ -1,4 +1,8 @@
 import random
+import time
+from core.resilience import ToolError
+from utils.task_traces import get_trace_writer, memory_hits
+from utils.tracing import span
 
 class AgentTeam:
     """
@@ -25,19 +29,36 @@ class AgentTeam:
         Returns:
             str: The final result after collaboration.
         """
-        subtasks = self._split_task(task)
-        results = {}
-
-        for subtask in subtasks:
-            best_agent = self._select_best_agent(subtask)
-            result = best_agent.execute(subtask)
-            results[subtask] = result
-
-        refined_results = self._refine_results(results)
-
-        final_result = self._merge_results(refined_results)
-
-        return final_result
+        with span("team.execute_task", task=task):
+            trace_writer = get_trace_writer()
+            attempts = []
+            task_start = time.perf_counter()
+            subtasks = self._split_task(task)
+            results = {}
+
+            for subtask in subtasks:
+                best_agent = self._select_best_agent(subtask)
+                hits = memory_hits(best_agent) if trace_writer else 0
+                agent_start = time.perf_counter()
+                with span("agent.execute", agent=best_agent.name, subtask=subtask):
+                    result = best_agent.execute(subtask)
+                results[subtask] = result
+                if trace_writer:
+                    attempts.append({"agent": best_agent.name, "subtask": subtask, "capability": best_agent.capability,
+                                     "cost": best_agent.cost, "success": bool(result) and not isinstance(result, ToolError),
+                                     "latency_ms": round((time.perf_counter() - agent_start) * 1e3, 3),
+                                     "cache_hit": memory_hits(best_agent) > hits})
+
+            with span("team.refine"):
+                refined_results = self._refine_results(results)
+
+            final_result = self._merge_results(refined_results)
+
+            if trace_writer:
+                trace_writer.record("team", task=task, complexity=None,
+                                    success=all(attempt["success"] for attempt in attempts),
+                                    latency_ms=round((time.perf_counter() - task_start) * 1e3, 3), attempts=attempts)
+            return final_result
 
     def _split_task(self, task):
         """
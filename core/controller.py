@@ -1,31 +1,68 @@
 import os
 import sys
+import time
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from utils.metrics import MetricsTracker
-
-metrics_tracker = MetricsTracker()
+from core.resilience import ToolError
+from utils.logger import log_event
+from utils.metrics import get_metrics_tracker
+from utils.task_traces import get_trace_writer, memory_hits
+from utils.tracing import span
 
 class Controller:
     """ 
     Manages task execution, selects agents dynamically, and updates metrics.
     """
 
-    def __init__(self, supernet):
+    def __init__(self, supernet, metrics_tracker=None):
         self.supernet = supernet
+        self.metrics_tracker = metrics_tracker or get_metrics_tracker()
 
     def allocate_agents(self, task):
         return self.supernet.sample_architecture(task)
 
     def execute_task(self, task):
-        agents = self.allocate_agents(task)
-        print(f"Executing task: {task['name']} with {', '.join(a.name for a in agents)}")
+        with span("controller.execute_task", task=task["name"], complexity=task["complexity"]) as task_span:
+            with span("supernet.sample"):
+                agents = self.allocate_agents(task)
+            print(f"Executing task: {task['name']} with {', '.join(a.name for a in agents)} ({len(agents)} sampled)")
 
-        success = any(agent.execute(task) for agent in agents)
+            # Agents run in order until one succeeds; each outcome is fed back to the supernet
+            trace_writer = get_trace_writer()
+            attempts = []
+            task_start = time.perf_counter()
+            success = False
+            for agent in agents:
+                hits = memory_hits(agent) if trace_writer else 0
+                agent_start = time.perf_counter()
+                with span("agent.execute", agent=agent.name):
+                    result = agent.execute(task["name"])
+                latency = time.perf_counter() - agent_start
+                self.metrics_tracker.record_latency("agent", agent.name, latency)
+                self.metrics_tracker.record_cost(agent.name, agent.cost)
+                agent_success = bool(result) and not isinstance(result, ToolError)
+                log_event(f"Agent {agent.name} ran '{task['name']}'", echo=False, task=task["name"], agent=agent.name,
+                          latency_ms=round(latency * 1e3, 3), outcome="success" if agent_success else "failure")
+                self.supernet.reward(agent, task, agent_success)
+                if trace_writer:
+                    attempts.append({"agent": agent.name, "capability": agent.capability, "cost": agent.cost,
+                                     "success": agent_success, "latency_ms": round(latency * 1e3, 3),
+                                     "cache_hit": memory_hits(agent) > hits})
+                if agent_success:
+                    success = True
+                    break
 
-        metrics_tracker.update_task_metrics(task["name"], success)
+            task_latency = time.perf_counter() - task_start
+            self.metrics_tracker.record_latency("task", f"complexity {task['complexity']}", task_latency)
+            if trace_writer:
+                trace_writer.record("controller", task=task["name"], complexity=task["complexity"],
+                                    sampled=[agent.name for agent in agents], success=success,
+                                    latency_ms=round(task_latency * 1e3, 3), attempts=attempts)
+            self.metrics_tracker.update_task_metrics(task["name"], success, agents_sampled=len(agents))
 
-        for agent in agents:
-            metrics_tracker.update_agent_metrics(agent.name)
+            for agent in agents:
+                self.metrics_tracker.update_agent_metrics(agent.name)
 
-        print(f"Task {task['name']} {'succeeded' if success else 'failed'}.\n")
-        return success
+            if task_span is not None:
+                task_span.set_attribute("success", success)
+            print(f"Task {task['name']} {'succeeded' if success else 'failed'}.\n")
+            return success
@@ -1,7 +1,10 @@
 import os
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import time
 from core.knowledge_graph import KnowledgeGraph
+from utils.task_traces import get_trace_writer
+from utils.tracing import traced
 
 class DebateManager:
     """
@@ -12,6 +15,7 @@ class DebateManager:
         self.agents = agents
         self.knowledge_graph = KnowledgeGraph()  # 🆕 Global KG access
 
+    @traced("debate")
     def debate(self, task, proposed_answer):
         """
         Runs a debate among agents to determine the best answer using knowledge graph reasoning.
@@ -23,15 +27,22 @@ class DebateManager:
         Returns:
             str: The most agreed-upon answer.
         """
+        start = time.perf_counter()
         best_answer = proposed_answer
+        knowledge_hits = 0
 
         # Let agents search the KG for prior knowledge
         for agent in self.agents:
             knowledge = self.knowledge_graph.get_relations(task)
             if knowledge:
                 best_answer = f"🔄 Knowledge-Backed Answer: {knowledge}"
+                knowledge_hits += 1
 
         # Store the final debated answer in KG
         self.knowledge_graph.add_fact(task, "final_answer", best_answer)
 
+        trace_writer = get_trace_writer()
+        if trace_writer:
+            trace_writer.record("debate", task=task, agents=[agent.name for agent in self.agents],
+                                knowledge_hits=knowledge_hits, latency_ms=round((time.perf_counter() - start) * 1e3, 3))
         return best_answer
@@ -0,0 +1,172 @@
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from utils.prometheus import CONTENT_TYPE, render
+
+REQUEST_TIMEOUT = 60  # Seconds a request may wait for its worker before a 504
+
+
+class BoundedWorkerPool:
+    """
+    Thread pool with a bounded backlog.
+
+    At most `workers` jobs run at once and at most `max_queue` more wait for a
+    free worker; anything beyond that is rejected immediately instead of queueing
+    without limit.
+    """
+
+    def __init__(self, workers=8, max_queue=64):
+        """
+        Args:
+            workers (int): Jobs executed concurrently.
+            max_queue (int): Jobs allowed to wait for a worker.
+        """
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="supernet-worker")
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+
+    def submit(self, func, *args):
+        """
+        Submits a job if there is room for it.
+
+        Returns:
+            concurrent.futures.Future or None: The job's future, or None if the pool is full.
+        """
+        if not self._slots.acquire(blocking=False):
+            return None
+        future = self.executor.submit(func, *args)
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class SupernetHTTPServer(ThreadingHTTPServer):
+    """ Threaded HTTP server (one thread per keep-alive connection) with a deeper listen backlog. """
+
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def make_handler(service, pool):
+    """
+    Builds the request handler class bound to a service and worker pool.
+
+    Routes:
+        POST /run, /collaborate, /debate, /query   JSON body as in the JSON-lines protocol (without "op")
+        GET  /metrics                              Prometheus exposition format
+        GET  /metrics.json                         Task and agent metrics as JSON
+        GET  /health                               Liveness check
+
+    Args:
+        service (SupernetService): The warm service.
+        pool (BoundedWorkerPool): Pool that executes requests.
+
+    Returns:
+        type: A `BaseHTTPRequestHandler` subclass.
+    """
+    post_ops = {"/run": "run", "/collaborate": "collaborate", "/debate": "debate", "/query": "query"}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep connections alive between requests
+        disable_nagle_algorithm = True  # Headers and body are separate writes; avoid delayed-ACK stalls
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send(200, {"ok": True})
+            elif self.path == "/metrics":
+                # Rendered on the connection thread so scrapes are never rejected by a busy pool
+                data = render(service.metrics_tracker).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            elif self.path == "/metrics.json":
+                self._dispatch({"op": "query", "what": "metrics"})
+            else:
+                self._send(404, {"ok": False, "error": f"Unknown path '{self.path}'."})
+
+        def do_POST(self):
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                if length < 0:
+                    raise ValueError(length)
+            except ValueError:
+                self.close_connection = True  # The body's extent is unknown, so the connection cannot be reused
+                self._send(400, {"ok": False, "error": "Invalid Content-Length header."})
+                return
+            body = self.rfile.read(length) if length else b""
+
+            op = post_ops.get(self.path)
+            if op is None:
+                self._send(404, {"ok": False, "error": f"Unknown path '{self.path}'."})
+                return
+            try:
+                request = json.loads(body or b"{}")
+                if not isinstance(request, dict):
+                    raise ValueError("Request body must be a JSON object.")
+            except ValueError as e:
+                self._send(400, {"ok": False, "error": f"Invalid JSON: {e}"})
+                return
+
+            request["op"] = op
+            self._dispatch(request)
+
+        def _dispatch(self, request):
+            future = pool.submit(service.handle, request)
+            if future is None:
+                self._send(429, {"ok": False, "error": "Server busy, retry later."}, {"Retry-After": "1"})
+                return
+            try:
+                response = future.result(timeout=REQUEST_TIMEOUT)
+            except TimeoutError:
+                self._send(504, {"ok": False, "error": "Request timed out."})
+                return
+            if response["ok"]:
+                self._send(200, response)
+            else:
+                self._send(500 if response.get("internal") else 400, response)
+
+        def _send(self, status, payload, headers=None):
+            data = json.dumps(payload, default=str).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass  # Per-request access logs would dominate the cost of cheap requests
+
+    return Handler
+
+
+def serve_http(service, host="127.0.0.1", port=8080, workers=8, max_queue=64):
+    """
+    Serves the HTTP API until interrupted.
+
+    Args:
+        service (SupernetService): The warm service.
+        host (str): Interface to bind; keep the default to stay local to the host.
+        port (int): TCP port.
+        workers (int): Requests executed concurrently.
+        max_queue (int): Requests allowed to wait before clients get 429 responses.
+    """
+    pool = BoundedWorkerPool(workers, max_queue)
+    server = SupernetHTTPServer((host, port), make_handler(service, pool))
+    print(f"🌐 Serving HTTP API on http://{host}:{server.server_port} "
+          f"({workers} workers, queue {max_queue})", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.shutdown()
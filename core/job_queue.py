@@ -0,0 +1,408 @@
+import itertools
+import json
+import os
+import socket
+import threading
+import time
+from utils.logger import log_event
+from utils.storage import connect_sqlite
+
+JOBS_FILE = "jobs.db"
+LEASE_SECONDS = 60.0  # A claimed job becomes visible to other workers again if not finished in time
+MAX_ATTEMPTS = 3      # Executions (including lease expiries) before a job is marked failed
+RETRY_DELAY = 5.0     # Seconds before the first retry; doubles with every further attempt
+BATCH_SIZE = 32       # Jobs claimed, and completions committed, per transaction
+
+# Job lifecycle: pending -> running -> done
+#                            |-> pending (error, failed outcome or lease expiry, attempts left) -> running ...
+#                            `-> failed  (no attempts left)
+PENDING, RUNNING, DONE, FAILED = "pending", "running", "done", "failed"
+STATUSES = (PENDING, RUNNING, DONE, FAILED)
+
+_COLUMNS = "id, task, complexity, status, attempts, max_attempts, idempotency_key, result, error, lease_owner"
+
+
+class JobQueue:
+    """
+    Durable queue of task executions, layered on `TaskManager`, in a SQLite database.
+
+    Workers `claim` pending jobs in batches; a claim is a lease that hides the
+    jobs from other workers for `lease_seconds` (the visibility timeout). A job
+    is only marked done by `complete`, so if a worker crashes its leases expire
+    and the jobs are claimed again: execution is at-least-once, and a restarted
+    queue resumes exactly at the jobs not yet done. Jobs that raise or report
+    failure are retried with exponential backoff until `max_attempts`. An idempotency key makes
+    enqueueing the same job twice a no-op. Several processes can share one
+    database.
+    """
+
+    def __init__(self, path=JOBS_FILE, task_manager=None, lease_seconds=LEASE_SECONDS,
+                 max_attempts=MAX_ATTEMPTS, retry_delay=RETRY_DELAY):
+        """
+        Args:
+            path (str): SQLite database file.
+            task_manager (TaskManager): Resolves task names passed to `enqueue` to registered tasks.
+            lease_seconds (float): Default lease (visibility timeout) of a claim.
+            max_attempts (int): Default executions per job before it fails for good.
+            retry_delay (float): Delay before the first retry of a failed execution.
+        """
+        self.path = path
+        self.task_manager = task_manager
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._conn = connect_sqlite(path)
+        self._lock = threading.RLock()
+        with self._lock:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY,
+                    task TEXT NOT NULL,
+                    complexity INTEGER NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_attempts INTEGER NOT NULL,
+                    available_at REAL NOT NULL,
+                    idempotency_key TEXT UNIQUE,
+                    lease_owner TEXT,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+                -- Claims walk this index in order: pending jobs whose visibility time has come, oldest first
+                CREATE INDEX IF NOT EXISTS jobs_visible ON jobs (status, available_at, id);
+                CREATE INDEX IF NOT EXISTS jobs_task ON jobs (task);
+            """)
+
+    def _resolve(self, task):
+        if isinstance(task, dict):
+            return {"name": task["name"], "complexity": task.get("complexity", 5)}
+        registered = self.task_manager.get_task(task) if self.task_manager else None
+        if not registered:
+            raise ValueError(f"⚠ Task '{task}' not found. Please register it first.")
+        return registered
+
+    def enqueue(self, task, idempotency_key=None, max_attempts=None, delay=0.0):
+        """
+        Adds one job.
+
+        Args:
+            task (str or dict): A registered task name, or a {"name", "complexity"} task.
+            idempotency_key (str): If a job with this key exists, no job is added.
+            max_attempts (int): Executions before the job fails for good (default: the queue's).
+            delay (float): Seconds before the job becomes claimable.
+
+        Returns:
+            int: The job's id (the existing job's for a known idempotency key).
+        """
+        with self._lock:
+            self._insert([(task, idempotency_key)], max_attempts, delay)
+            if idempotency_key is None:
+                return self._conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+            return self._conn.execute("SELECT id FROM jobs WHERE idempotency_key = ?", (idempotency_key,)).fetchone()[0]
+
+    def enqueue_many(self, tasks, idempotency_keys=None, max_attempts=None, delay=0.0):
+        """
+        Adds many jobs in one transaction. Jobs whose idempotency key already exists are skipped.
+
+        Args:
+            tasks (iterable): Task names or task dicts, as for `enqueue`; may be a generator.
+            idempotency_keys (iterable): One key (or None) per task.
+            max_attempts (int): Executions per job before it fails for good.
+            delay (float): Seconds before the jobs become claimable.
+
+        Returns:
+            int: Jobs added.
+        """
+        keys = idempotency_keys if idempotency_keys is not None else itertools.repeat(None)
+        return self._insert(zip(tasks, keys), max_attempts, delay)
+
+    def enqueue_registered(self, repeat=1, key_prefix=None, **filters):
+        """
+        Enqueues every registered task (`TaskManager.iter_tasks`), streamed into one transaction.
+
+        Args:
+            repeat (int): Jobs per task.
+            key_prefix (str): If given, job i of task T gets the idempotency key "<prefix>:<T>:<i>",
+                so enqueueing the same batch again adds nothing.
+            **filters: `min_complexity`, `max_complexity` and `status` of `TaskManager.iter_tasks`.
+
+        Returns:
+            int: Jobs added.
+        """
+        jobs = ((task, f"{key_prefix}:{task['name']}:{i}" if key_prefix is not None else None)
+                for task in self.task_manager.iter_tasks(**filters) for i in range(repeat))
+        return self._insert(jobs)
+
+    def _insert(self, jobs, max_attempts=None, delay=0.0):
+        """ Inserts (task, idempotency key) pairs in one transaction and returns how many were added. """
+        now = time.time()
+        attempts = max_attempts or self.max_attempts
+        rows = ((task["name"], task["complexity"], attempts, now + delay, key, now, now)
+                for task, key in ((self._resolve(task), key) for task, key in jobs))
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO jobs (task, complexity, max_attempts, available_at, idempotency_key,"
+                    " created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            added = self._conn.total_changes - before
+        log_event(f"📥 {added} jobs enqueued.", echo=False, jobs_enqueued=added)
+        return added
+
+    def claim(self, worker, batch_size=BATCH_SIZE, lease_seconds=None):
+        """
+        Leases up to `batch_size` claimable jobs, oldest first, in one transaction.
+        Running jobs whose lease expired are first made pending again (or failed,
+        if they have no attempts left).
+
+        Args:
+            worker (str): The claiming worker's id.
+            batch_size (int): Maximum jobs claimed.
+            lease_seconds (float): Lease length (default: the queue's).
+
+        Returns:
+            list: Claimed jobs (see `get`), empty if nothing is claimable.
+        """
+        now = time.time()
+        lease = now + (lease_seconds or self.lease_seconds)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "UPDATE jobs SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'pending' END,"
+                    " error = 'lease expired', lease_owner = NULL, updated_at = ?"
+                    " WHERE status = 'running' AND available_at <= ?", (now, now))
+                ids = [row[0] for row in self._conn.execute(
+                    "SELECT id FROM jobs WHERE status = 'pending' AND available_at <= ? ORDER BY available_at, id LIMIT ?",
+                    (now, batch_size))]
+                if ids:
+                    marks = ",".join("?" * len(ids))
+                    self._conn.execute(
+                        f"UPDATE jobs SET status = 'running', attempts = attempts + 1, lease_owner = ?,"
+                        f" available_at = ?, updated_at = ? WHERE id IN ({marks})", [worker, lease, now] + ids)
+                    rows = self._conn.execute(f"SELECT {_COLUMNS} FROM jobs WHERE id IN ({marks}) ORDER BY id", ids).fetchall()
+                else:
+                    rows = []
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return [self._job(row) for row in rows]
+
+    def extend(self, worker, job_ids, lease_seconds=None):
+        """
+        Renews the lease on jobs the worker still holds (a heartbeat for long batches).
+
+        Returns:
+            int: Leases renewed.
+        """
+        lease = time.time() + (lease_seconds or self.lease_seconds)
+        with self._lock:
+            return self._conn.executemany(
+                "UPDATE jobs SET available_at = ? WHERE id = ? AND status = 'running' AND lease_owner = ?",
+                [(lease, job_id, worker) for job_id in job_ids]).rowcount
+
+    def complete(self, worker, results):
+        """
+        Marks jobs done and stores their results, in one transaction. A job whose
+        lease the worker lost (it expired and another worker claimed it) is left alone.
+
+        Args:
+            worker (str): The worker that claimed the jobs.
+            results (list): (job id, JSON-serializable result) pairs.
+
+        Returns:
+            int: Jobs marked done.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                done = self._conn.executemany(
+                    "UPDATE jobs SET status = 'done', result = ?, error = NULL, lease_owner = NULL, updated_at = ?"
+                    " WHERE id = ? AND status = 'running' AND lease_owner = ?",
+                    [(json.dumps(result, default=str), now, job_id, worker) for job_id, result in results]).rowcount
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return done
+
+    def fail(self, worker, job_id, error):
+        """
+        Records a failed execution: the job is retried after an exponential
+        backoff, or marked failed once it has no attempts left.
+
+        Args:
+            worker (str): The worker that claimed the job.
+            job_id (int): The job.
+            error (str): What went wrong.
+
+        Returns:
+            bool: Whether the worker still held the job.
+        """
+        now = time.time()
+        with self._lock:
+            return self._conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'pending' END,"
+                " available_at = ? + ? * (1 << (attempts - 1)), error = ?, lease_owner = NULL, updated_at = ?"
+                " WHERE id = ? AND status = 'running' AND lease_owner = ?",
+                (now, self.retry_delay, str(error), now, job_id, worker)).rowcount > 0
+
+    def retry_failed(self):
+        """
+        Makes every failed job pending again with a fresh set of attempts.
+
+        Returns:
+            int: Jobs requeued.
+        """
+        now = time.time()
+        with self._lock:
+            return self._conn.execute(
+                "UPDATE jobs SET status = 'pending', attempts = 0, available_at = ?, updated_at = ? WHERE status = 'failed'",
+                (now, now)).rowcount
+
+    def get(self, job_id):
+        """
+        Returns:
+            dict or None: {"id", "task": {"name", "complexity"}, "status", "attempts", "max_attempts",
+                "idempotency_key", "result", "error", "lease_owner"}.
+        """
+        with self._lock:
+            row = self._conn.execute(f"SELECT {_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._job(row) if row else None
+
+    def next_available_at(self):
+        """
+        Returns:
+            float or None: When the next pending job becomes claimable or the next lease
+                expires (a Unix time, possibly past), or None if no job is pending or running.
+        """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT MIN(available_at) FROM jobs WHERE status IN ('pending', 'running')").fetchone()[0]
+
+    def stats(self):
+        """
+        Returns:
+            dict: Jobs per status.
+        """
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        return {status: counts.get(status, 0) for status in STATUSES}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _job(row):
+        job_id, name, complexity, status, attempts, max_attempts, key, result, error, owner = row
+        return {"id": job_id, "task": {"name": name, "complexity": complexity}, "status": status,
+                "attempts": attempts, "max_attempts": max_attempts, "idempotency_key": key,
+                "result": json.loads(result) if result is not None else None, "error": error, "lease_owner": owner}
+
+
+def default_worker_id():
+    """
+    Returns:
+        str: "<host>:<pid>", unique among live workers.
+    """
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class QueueWorker:
+    """
+    Runs queued jobs through a `Controller`: claims a batch, executes each job's
+    task, and commits the batch's completions together. A task that raises or
+    reports failure goes back through `JobQueue.fail`, so it is retried with
+    backoff and only done once it succeeds. While a long batch is still running,
+    the jobs finished so far are committed and the remaining leases renewed, so
+    no finished job's lease expires before it is marked done.
+    """
+
+    def __init__(self, job_queue, controller, worker_id=None, batch_size=BATCH_SIZE, lease_seconds=None):
+        """
+        Args:
+            job_queue (JobQueue): The queue.
+            controller (Controller): Executes the tasks.
+            worker_id (str): Lease owner name (default: host and pid).
+            batch_size (int): Jobs claimed per transaction.
+            lease_seconds (float): Lease length (default: the queue's).
+        """
+        self.job_queue = job_queue
+        self.controller = controller
+        self.worker_id = worker_id or default_worker_id()
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds or job_queue.lease_seconds
+
+    def run_batch(self, batch_size=None):
+        """
+        Claims and executes one batch.
+
+        Args:
+            batch_size (int): Jobs to claim (default: the worker's batch size).
+
+        Returns:
+            dict: {"claimed", "done", "errors"} for the batch; "errors" counts executions that raised or failed.
+        """
+        jobs = self.job_queue.claim(self.worker_id, batch_size or self.batch_size, self.lease_seconds)
+        renew_at = time.monotonic() + self.lease_seconds / 2
+        results, errors, done = [], 0, 0
+        for index, job in enumerate(jobs):
+            if time.monotonic() >= renew_at:
+                if results:
+                    done += self.job_queue.complete(self.worker_id, results)
+                    results = []
+                self.job_queue.extend(self.worker_id, [job["id"] for job in jobs[index:]], self.lease_seconds)
+                renew_at = time.monotonic() + self.lease_seconds / 2
+            try:
+                success = bool(self.controller.execute_task(job["task"]))
+                error, outcome = "task reported failure", "failure"
+            except Exception as e:
+                success, error, outcome = False, repr(e), "error"
+            if not success:
+                errors += 1
+                self.job_queue.fail(self.worker_id, job["id"], error)
+                log_event(f"❌ Job {job['id']} ('{job['task']['name']}') failed on attempt {job['attempts']}: {error}",
+                          echo=False, job=job["id"], task=job["task"]["name"], outcome=outcome)
+                continue
+            results.append((job["id"], {"success": True}))
+        if results:
+            done += self.job_queue.complete(self.worker_id, results)
+        return {"claimed": len(jobs), "done": done, "errors": errors}
+
+    def run(self, max_jobs=None, wait=False, poll_interval=1.0):
+        """
+        Processes jobs until none is pending or running (or forever with `wait`).
+        While jobs exist but none is claimable yet (a retry backing off, or a lease
+        held by another, possibly crashed, worker), it sleeps until the next one is.
+
+        Args:
+            max_jobs (int): Stop after claiming about this many jobs.
+            wait (bool): Keep polling for new jobs instead of returning when the queue is empty.
+            poll_interval (float): Longest sleep between polls while idle.
+
+        Returns:
+            dict: Totals of the `run_batch` counts.
+        """
+        totals = {"claimed": 0, "done": 0, "errors": 0}
+        while max_jobs is None or totals["claimed"] < max_jobs:
+            batch = self.run_batch(self.batch_size if max_jobs is None else min(self.batch_size, max_jobs - totals["claimed"]))
+            for key, value in batch.items():
+                totals[key] += value
+            if not batch["claimed"]:
+                next_at = self.job_queue.next_available_at()
+                if next_at is None and not wait:
+                    break
+                # Capped so jobs enqueued meanwhile are still picked up promptly
+                delay = poll_interval if next_at is None else next_at - time.time()
+                time.sleep(min(max(delay, 0.0), poll_interval))
+        return totals
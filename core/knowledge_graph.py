@@ -1,4 +1,6 @@
+import threading
 import networkx as nx
+from utils.tracing import traced
 
 class KnowledgeGraph:
     """
@@ -7,7 +9,9 @@ class KnowledgeGraph:
 
     def __init__(self):
         self.graph = nx.DiGraph()
+        self._lock = threading.Lock()  # networkx graphs are not safe to mutate while another thread reads
 
+    @traced("kg.add_fact")
     def add_fact(self, subject, relation, obj):
         """
         Adds a fact to the knowledge graph.
@@ -17,8 +21,10 @@ class KnowledgeGraph:
             relation (str): The relationship (e.g., "use").
             obj (str): The target entity (e.g., "Neural Networks").
         """
-        self.graph.add_edge(subject, obj, relation=relation)
+        with self._lock:
+            self.graph.add_edge(subject, obj, relation=relation)
 
+    @traced("kg.get_relations")
     def get_relations(self, subject):
         """
         Retrieves all relationships of a given entity.
@@ -29,8 +35,10 @@ class KnowledgeGraph:
         Returns:
             list: A list of tuples (relation, target).
         """
-        return [(self.graph.edges[edge]["relation"], edge[1]) for edge in self.graph.out_edges(subject)]
+        with self._lock:
+            return [(self.graph.edges[edge]["relation"], edge[1]) for edge in self.graph.out_edges(subject)]
 
+    @traced("kg.find_path")
     def find_path(self, start, end):
         """
         Finds a reasoning path between two entities if one exists.
@@ -43,7 +51,8 @@ class KnowledgeGraph:
             list: The path of relationships if found, else an empty list.
         """
         try:
-            path = nx.shortest_path(self.graph, source=start, target=end)
+            with self._lock:
+                path = nx.shortest_path(self.graph, source=start, target=end)
             return path
         except nx.NetworkXNoPath:
             return []
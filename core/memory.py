@@ -1,53 +1,78 @@
-import json
-import os
+from core.resilience import ToolError
+from utils.storage import JsonStore
+from utils.tracing import traced
 
 MEMORY_FILE = "memory.json"
 
 class AgentMemory:
     """
     Memory module that allows agents to store and retrieve past interactions.
+
+    Every change is applied to the latest file under a lock and written
+    atomically (see `utils.storage.JsonStore`), so agents in other threads or
+    processes never lose each other's entries and a crash never leaves a partial file.
     """
 
     def __init__(self):
+        # Memory is a cache of tool results: skipping fsync keeps stores cheap, and
+        # atomic writes still rule out a corrupted file after a crash
+        self._store = JsonStore(MEMORY_FILE, durable=False)
         self.memory = self._load_memory()
+        self.hits = 0    # Lookups answered from memory...
+        self.misses = 0  # ...and lookups that found nothing
 
     def _load_memory(self):
-        """ Load memory from file if available. """
-        if os.path.exists(MEMORY_FILE):
-            try:
-                with open(MEMORY_FILE, "r") as file:
-                    return json.load(file)
-            except json.JSONDecodeError:
-                print("⚠ Memory file is corrupted. Resetting...")
-                return {}
-        return {}
+        """ Load memory from file if available. A corrupted file is moved aside, not discarded. """
+        return self._store.load()
 
+    @traced("memory.store")
     def store(self, agent_name, key, value):
-        """ Stores a memory entry for an agent. """
-        if agent_name not in self.memory:
-            self.memory[agent_name] = {}
-        self.memory[agent_name][key] = value
-        self._save_memory()
+        """ Stores a memory entry for an agent. Failed tool results are never stored. """
+        if isinstance(value, ToolError):
+            return
+        def add(memory):
+            memory.setdefault(agent_name, {})[key] = value
+
+        self.memory = self._store.update(add)
 
+    @traced("memory.retrieve")
     def retrieve(self, agent_name, key):
-        """ Retrieves a stored memory entry. """
-        return self.memory.get(agent_name, {}).get(key, None)
+        """ Retrieves a stored memory entry, including entries other processes stored since the last lookup. """
+        self.memory = self._store.load()  # A stat call unless the file changed
+        value = self.memory.get(agent_name, {}).get(key, None)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def get_agent_memory(self, agent_name):
+        """ Returns a copy of everything stored for an agent, as currently on file. """
+        self.memory = self._store.load()
+        return dict(self.memory.get(agent_name, {}))
 
+    @traced("memory.forget")
     def forget(self, agent_name, task):
         """ Removes a specific task from an agent's memory. """
-        if agent_name in self.memory and task in self.memory[agent_name]:
-            del self.memory[agent_name][task]
-            self._save_memory()
+        def remove(memory):
+            if task not in memory.get(agent_name, {}):
+                return False
+            del memory[agent_name][task]
 
+        self.memory = self._store.update(remove)
+
+    @traced("memory.clear")
     def clear_memory(self, agent_name=None):
         """ Clears memory for a specific agent or all agents. """
-        if agent_name:
-            self.memory[agent_name] = {}
-        else:
-            self.memory = {}
-        self._save_memory()
+        def clear(memory):
+            if agent_name:
+                memory[agent_name] = {}
+            else:
+                memory.clear()
+
+        self.memory = self._store.update(clear)
 
+    @traced("memory.save")
     def _save_memory(self):
-        """ Saves memory to a file. """
-        with open(MEMORY_FILE, "w") as file:
-            json.dump(self.memory, file, indent=4)
+        """ Saves memory to a file, replacing its contents. """
+        self._store.write(self.memory)
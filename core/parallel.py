@@ -0,0 +1,113 @@
+import multiprocessing
+import multiprocessing.util
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from core.agent_loader import load_agents
+from core.agentic_supernet import AgenticSupernet
+from core.shared_supernet import SharedAgenticSupernet, SharedSupernetState
+
+_worker = {}  # Per-process state set up by `_init_worker`
+
+
+def _init_worker(shm_name, num_agents, locks, settings, sync_interval, log_queue, trace_settings):
+    """
+    Builds this worker's agents and controller around the shared supernet state.
+    Metrics are kept in memory and handed back to the parent with each batch;
+    log records are sent to the parent, which owns the log file. Task traces, if
+    captured, go to a file of the worker's own.
+    """
+    from core.controller import Controller
+    from utils.logger import configure_logging
+    from utils.metrics import MetricsTracker, set_metrics_tracker
+
+    configure_logging(console=False, queue=log_queue)
+    if trace_settings:
+        from utils.task_traces import start_trace_capture
+        writer = start_trace_capture(**trace_settings)
+        # Pool workers leave through os._exit, which skips atexit handlers but runs finalizers
+        multiprocessing.util.Finalize(writer, writer.close, exitpriority=10)
+
+    agents = load_agents()
+    if len(agents) != num_agents:
+        raise RuntimeError("Agents changed while the worker pool was starting.")
+
+    state = SharedSupernetState.attach(shm_name, num_agents, locks)
+    supernet = SharedAgenticSupernet(agents, state, sync_interval=sync_interval, **settings)
+    metrics_tracker = MetricsTracker(path=None)
+    set_metrics_tracker(metrics_tracker)  # Tools report latencies to the shared tracker
+    _worker.update(supernet=supernet, metrics_tracker=metrics_tracker,
+                   controller=Controller(supernet, metrics_tracker))
+
+
+def _run_batch(tasks):
+    """ Executes a batch of tasks in a worker and returns its results with the metrics it collected. """
+    supernet, controller = _worker["supernet"], _worker["controller"]
+    results = []
+    for task in tasks:
+        success = controller.execute_task(task)
+        results.append({"task": task["name"], "success": success})
+    supernet.sync()
+    return results, _worker["metrics_tracker"].drain()
+
+
+def run_parallel(tasks, num_workers=None, config=None, sync_interval=10, batch_size=16):
+    """
+    Executes tasks across worker processes that all train one shared supernet.
+
+    The shared state is seeded like a single-process supernet (checkpoint, then
+    metrics history) and the merged result is checkpointed when all tasks are done.
+
+    Args:
+        tasks (list): Task dicts ({"name", "complexity"}).
+        num_workers (int): Worker processes. Defaults to the CPU count.
+        config (dict): Parsed settings (entropy weight, temperature, sample counts, checkpoint).
+        sync_interval (int): Local updates between synchronizations with shared memory.
+        batch_size (int): Tasks sent to a worker at a time.
+
+    Returns:
+        tuple: (list of per-task results in input order, final distribution as {agent name: probability}).
+    """
+    from utils.logger import forward_logs
+    from utils.metrics import get_metrics_tracker
+    from utils.task_traces import get_trace_writer
+
+    config = config or {}
+    agents = load_agents()
+    metrics_tracker = get_metrics_tracker()
+    seed = AgenticSupernet.from_config(agents, config, metrics_tracker)
+    ctx = multiprocessing.get_context("spawn")
+    state = SharedSupernetState.create(len(agents), ctx, initial=seed)
+    settings = {"entropy_weight": seed.entropy_weight, "temperature": seed.temperature,
+                "num_samples": seed.num_samples, "max_samples": seed.max_samples}
+
+    trace_writer = get_trace_writer()
+    trace_settings = trace_writer.settings() if trace_writer else None
+
+    log_queue = ctx.Queue()
+    log_listener = forward_logs(log_queue)
+
+    try:
+        batches = [tasks[i:i + batch_size] for i in range(0, len(tasks), batch_size)]
+        with ProcessPoolExecutor(max_workers=num_workers or os.cpu_count(), mp_context=ctx,
+                                 initializer=_init_worker,
+                                 initargs=(state.shm.name, len(agents), state.locks, settings,
+                                           sync_interval, log_queue, trace_settings)) as executor:
+            results = []
+            for batch_results, batch_metrics in executor.map(_run_batch, batches):
+                results.extend(batch_results)
+                metrics_tracker.merge(batch_metrics)
+        metrics_tracker.flush()
+
+        seed.logits, seed.complexity_stats = state.read()
+        seed._refresh_distribution()
+        distribution = seed.get_distribution()
+        if seed.checkpoint_path:
+            seed.save_checkpoint(seed.checkpoint_path)
+    finally:
+        log_listener.stop()
+        state.close()
+        state.unlink()
+
+    return results, {agent.name: float(p) for agent, p in zip(agents, distribution)}
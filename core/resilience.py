@@ -0,0 +1,242 @@
+import random
+import threading
+import time
+from collections import deque
+
+
+class ToolError(str):
+    """
+    Result string of a failed tool call.
+
+    It behaves like the plain error strings tools have always returned, but lets
+    callers (and `AgentMemory`) recognise failures without parsing the text.
+    """
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because its endpoint's circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breaker with closed, open and half-open states.
+
+    While closed, outcomes are kept in a rolling window. Once the window holds at
+    least `min_calls` outcomes and the error rate reaches `failure_threshold`, the
+    circuit opens and calls fail fast. After `reset_timeout` seconds a limited
+    number of trial calls are let through (half-open); a success closes the
+    circuit again and a failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name, failure_threshold=0.5, min_calls=5, window=20, reset_timeout=30.0,
+                 half_open_max_calls=1):
+        """
+        Args:
+            name (str): Endpoint name, used in error messages.
+            failure_threshold (float): Error rate (0.0 to 1.0) that opens the circuit.
+            min_calls (int): Minimum outcomes in the window before the rate is trusted.
+            window (int): Number of recent outcomes considered.
+            reset_timeout (float): Seconds to stay open before probing again.
+            half_open_max_calls (int): Concurrent trial calls allowed while half-open.
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self._state = self.CLOSED
+        self._outcomes = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        """ Returns the current state, moving from open to half-open once the timeout has passed. """
+        with self._lock:
+            self._refresh_state()
+            return self._state
+
+    def allow_request(self):
+        """
+        Checks whether a call may go through and reserves a trial slot when half-open.
+
+        Returns:
+            bool: True if the call may proceed.
+        """
+        with self._lock:
+            self._refresh_state()
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+                self._half_open_calls += 1
+                return True
+            return False
+
+    def record_success(self):
+        """ Records a successful call. """
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._close()
+            else:
+                self._outcomes.append(True)
+
+    def record_failure(self):
+        """ Records a failed call, opening the circuit if the error rate is too high. """
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._open()
+                return
+
+            self._outcomes.append(False)
+            if len(self._outcomes) >= self.min_calls:
+                error_rate = self._outcomes.count(False) / len(self._outcomes)
+                if error_rate >= self.failure_threshold:
+                    self._open()
+
+    def _refresh_state(self):
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._half_open_calls = 0
+
+    def _open(self):
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+
+    def _close(self):
+        self._state = self.CLOSED
+        self._outcomes.clear()
+        self._half_open_calls = 0
+
+
+class RetryBudget:
+    """
+    Global token bucket that caps retries to a fraction of overall traffic.
+
+    Every request deposits `ratio` tokens and every retry spends one, with a small
+    time-based refill so a quiet process can still retry occasionally. During an
+    outage the budget drains quickly, so retries cannot multiply the load on a
+    struggling upstream.
+    """
+
+    def __init__(self, ratio=0.2, min_retries_per_second=1.0, max_tokens=10.0):
+        """
+        Args:
+            ratio (float): Retry tokens earned per request.
+            min_retries_per_second (float): Tokens refilled per second regardless of traffic.
+            max_tokens (float): Maximum tokens that can be saved up.
+        """
+        self.ratio = ratio
+        self.min_retries_per_second = min_retries_per_second
+        self.max_tokens = max_tokens
+
+        self._tokens = max_tokens
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record_request(self):
+        """ Deposits tokens for a new request. """
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_acquire(self):
+        """
+        Spends one token for a retry if available.
+
+        Returns:
+            bool: True if the retry is allowed.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.max_tokens,
+                               self._tokens + (now - self._last_refill) * self.min_retries_per_second)
+            self._last_refill = now
+
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+
+RETRY_BUDGET = RetryBudget()
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(endpoint):
+    """
+    Returns the shared circuit breaker for an endpoint, creating it on first use.
+
+    Args:
+        endpoint (str): Endpoint name (e.g., "arxiv").
+
+    Returns:
+        CircuitBreaker: The endpoint's breaker.
+    """
+    with _breakers_lock:
+        if endpoint not in _breakers:
+            _breakers[endpoint] = CircuitBreaker(endpoint)
+        return _breakers[endpoint]
+
+
+def backoff_delay(attempt, base=0.1, cap=2.0):
+    """
+    Computes an exponential backoff delay with full jitter.
+
+    Args:
+        attempt (int): Zero-based retry attempt.
+        base (float): Delay of the first attempt in seconds.
+        cap (float): Maximum delay in seconds.
+
+    Returns:
+        float: Seconds to wait before retrying.
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def call_with_resilience(endpoint, func, max_retries=2):
+    """
+    Calls `func` behind the endpoint's circuit breaker, retrying failures with
+    jittered backoff while the global retry budget allows it. The breaker sees
+    one outcome per call, however many retries it took, and retries stop early
+    once other calls have opened the circuit.
+
+    Args:
+        endpoint (str): Endpoint name used to pick the circuit breaker.
+        func (callable): Zero-argument function performing the call; it should raise on failure.
+        max_retries (int): Maximum retries for this call.
+
+    Returns:
+        Any: The return value of `func`.
+
+    Raises:
+        CircuitOpenError: If the endpoint's circuit is open when the call starts.
+        Exception: The last error raised by `func` once retries are exhausted.
+    """
+    breaker = get_breaker(endpoint)
+    RETRY_BUDGET.record_request()
+    if not breaker.allow_request():
+        raise CircuitOpenError(f"circuit open for '{endpoint}'")
+
+    attempt = 0
+    while True:
+        try:
+            result = func()
+        except Exception:
+            if (attempt >= max_retries or breaker.state == CircuitBreaker.OPEN
+                    or not RETRY_BUDGET.try_acquire()):
+                breaker.record_failure()
+                raise
+            time.sleep(backoff_delay(attempt))
+            attempt += 1
+            continue
+
+        breaker.record_success()
+        return result
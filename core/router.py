@@ -0,0 +1,133 @@
+import os
+import sys
+from functools import lru_cache
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from utils.helpers import load_yaml_config
+
+ROUTING_CONFIG = os.path.join(os.path.dirname(__file__), "..", "configs", "routing.yaml")
+
+
+class KeywordRouter:
+    """
+    Maps text to values through a compiled Aho-Corasick automaton.
+
+    Keywords are matched case-insensitively as substrings, all at once in a
+    single pass over the text, so lookup cost depends on the text length and not
+    on the number of rules. When several keywords match, the one declared first
+    wins, just like an ordered chain of `if "x" in text` checks.
+    """
+
+    def __init__(self, rules):
+        """
+        Builds the automaton.
+
+        Args:
+            rules (dict): Ordered mapping of keyword to value.
+        """
+        self.keywords = []
+        self.values = []
+        self._goto = [{}]
+        self._outputs = [[]]
+
+        for keyword, value in rules.items():
+            keyword = str(keyword).lower()
+            if not keyword:
+                continue
+            node = 0
+            for char in keyword:
+                if char not in self._goto[node]:
+                    self._goto.append({})
+                    self._outputs.append([])
+                    self._goto[node][char] = len(self._goto) - 1
+                node = self._goto[node][char]
+            self._outputs[node].append(len(self.keywords))
+            self.keywords.append(keyword)
+            self.values.append(value)
+
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        """ Computes failure links breadth-first and folds inherited outputs into each node. """
+        self._fail = [0] * len(self._goto)
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for char, child in self._goto[node].items():
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+                queue.append(child)
+
+        # Lowest rule index reachable from each node, for first-declared-wins lookups
+        self._best = [min(outputs) if outputs else None for outputs in self._outputs]
+
+    def _scan(self, text):
+        """ Yields the automaton node reached after every character of the lower-cased text. """
+        goto, fail = self._goto, self._fail
+        node = 0
+        for char in text.lower():
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            yield node
+
+    def match(self, text):
+        """
+        Returns the value of the first-declared keyword found in the text.
+
+        Args:
+            text (str): The text to route (e.g., a task description).
+
+        Returns:
+            Any: The matched value, or None if no keyword occurs in the text.
+        """
+        best = None
+        for node in self._scan(text):
+            index = self._best[node]
+            if index is not None and (best is None or index < best):
+                best = index
+                if best == 0:
+                    break
+        return None if best is None else self.values[best]
+
+    def match_all(self, text):
+        """
+        Returns every keyword found in the text.
+
+        Args:
+            text (str): The text to scan.
+
+        Returns:
+            list: (keyword, value) tuples in declaration order, without duplicates.
+        """
+        found = set()
+        for node in self._scan(text):
+            found.update(self._outputs[node])
+        return [(self.keywords[index], self.values[index]) for index in sorted(found)]
+
+    def __len__(self):
+        return len(self.keywords)
+
+
+@lru_cache(maxsize=None)
+def _load_routing_tables(path):
+    return load_yaml_config(path) or {}
+
+
+@lru_cache(maxsize=None)
+def get_router(*section, path=ROUTING_CONFIG):
+    """
+    Returns the shared router for a table in the routing config, building it once per process.
+
+    Args:
+        *section (str): Keys leading to the table (e.g., "agents", "Medical" or "treatments").
+        path (str): Routing config file.
+
+    Returns:
+        KeywordRouter: The compiled router; empty if the table does not exist.
+    """
+    table = _load_routing_tables(path)
+    for key in section:
+        table = table.get(key) if isinstance(table, dict) else None
+    return KeywordRouter(table or {})
@@ -0,0 +1,202 @@
+import contextlib
+import json
+import logging
+import os
+import socketserver
+import sys
+import traceback
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from core.agent_loader import load_agents
+from core.agentic_supernet import AgenticSupernet
+from core.collaboration import AgentTeam
+from core.controller import Controller
+from core.debate import DebateManager
+from core.knowledge_graph import KnowledgeGraph
+from core.memory import AgentMemory
+from core.task_manager import TaskManager, TASKS_FILE
+from utils.logger import log_event
+from utils.metrics import get_metrics_tracker
+
+# Exceptions that mean the request itself was invalid (unknown op or task, missing or malformed fields)
+REQUEST_ERRORS = (ValueError, KeyError)
+
+
+class SupernetService:
+    """
+    Long-lived request handler that keeps agents, memory, the knowledge graph and
+    the supernet's learned distribution resident between requests.
+
+    Requests and responses are plain dicts, one JSON object per line on the wire:
+
+        {"id": 1, "op": "run", "task": "AI Analysis"}
+        {"id": 1, "ok": true, "result": {"task": "AI Analysis", "success": true}}
+
+    Supported ops are `run`, `collaborate`, `debate` and `query`. `handle` may be
+    called from several threads at once.
+    """
+
+    def __init__(self, config=None, tasks_path=None):
+        """
+        Builds every component once.
+
+        Args:
+            config (dict): Settings from `configs/settings.yaml`.
+            tasks_path (str): Task storage (see `TaskManager`); defaults to `tasks.json`.
+        """
+        config = config or {}
+        self.task_manager = TaskManager(tasks_path or TASKS_FILE)
+        self.metrics_tracker = get_metrics_tracker()
+        self.memory = AgentMemory()
+        self.knowledge_graph = KnowledgeGraph()
+        self.agents = load_agents()
+        self.supernet = AgenticSupernet.from_config(self.agents, config, self.metrics_tracker)
+        self.controller = Controller(self.supernet, self.metrics_tracker)
+        self.debate_manager = DebateManager(self.agents)
+        self.team = AgentTeam(self.agents)
+
+        self.handlers = {
+            "run": self._run,
+            "collaborate": self._collaborate,
+            "debate": self._debate,
+            "query": self._query,
+        }
+
+    def handle(self, request):
+        """
+        Handles one request.
+
+        Args:
+            request (dict): The request; must contain "op".
+
+        Returns:
+            dict: {"id", "ok", "result"} on success or {"id", "ok", "error"} on failure.
+                Failures not caused by the request (bugs, I/O errors) also carry
+                "internal": true and are logged with their traceback.
+        """
+        request_id = request.get("id") if isinstance(request, dict) else None
+        try:
+            handler = self.handlers.get(request.get("op")) if isinstance(request, dict) else None
+            if handler is None:
+                raise ValueError(f"Unknown op. Expected one of: {', '.join(self.handlers)}.")
+            return {"id": request_id, "ok": True, "result": handler(request)}
+        except REQUEST_ERRORS as e:
+            return {"id": request_id, "ok": False, "error": str(e)}
+        except Exception as e:
+            log_event(f"❌ Internal error handling request {request_id}: {e!r}", level=logging.ERROR, echo=False,
+                      op=request.get("op"), traceback=traceback.format_exc())
+            return {"id": request_id, "ok": False, "error": f"Internal error: {e}", "internal": True}
+
+    def handle_line(self, line):
+        """
+        Handles one JSON-lines request.
+
+        Args:
+            line (str): A JSON-encoded request.
+
+        Returns:
+            str: The JSON-encoded response, without a trailing newline.
+        """
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            return json.dumps({"id": None, "ok": False, "error": f"Invalid JSON: {e}"})
+        return json.dumps(self.handle(request), default=str)
+
+    def _resolve_task(self, request):
+        """ Returns the task dict for a request's "task" (a registered name or an inline task). """
+        task = request.get("task")
+        if isinstance(task, dict) and "name" in task:
+            return {"name": task["name"], "complexity": task.get("complexity", 5)}
+        registered = self.task_manager.get_task(task)
+        if not registered:
+            raise ValueError(f"Task '{task}' not found. Please register it first.")
+        return registered
+
+    def _run(self, request):
+        task = self._resolve_task(request)
+        success = self.controller.execute_task(task)
+        return {"task": task["name"], "success": success}
+
+    def _collaborate(self, request):
+        task = request.get("task")
+        return self.team.execute_task(task["name"] if isinstance(task, dict) else task)
+
+    def _debate(self, request):
+        task = self._resolve_task(request)
+        initial_result = self.controller.execute_task(task)
+        return self.debate_manager.debate(task["name"], initial_result)
+
+    def _query(self, request):
+        """
+        Read-only lookups. `what` selects the data:
+        "memory" (with "agent"), "facts" (with "subject"), "tasks", "distribution" or "metrics".
+        "tasks" accepts the filters and page of `TaskManager.list_tasks` ("min_complexity",
+        "max_complexity", "status", "offset", "limit").
+        """
+        what = request.get("what")
+        if what == "memory":
+            return self.memory.get_agent_memory(request.get("agent"))
+        if what == "facts":
+            return self.knowledge_graph.get_relations(request.get("subject"))
+        if what == "tasks":
+            keys = ("min_complexity", "max_complexity", "status", "offset", "limit")
+            return self.task_manager.list_tasks(**{key: request[key] for key in keys if key in request})
+        if what == "distribution":
+            return {agent.name: float(p) for agent, p in zip(self.agents, self.supernet.get_distribution())}
+        if what == "metrics":
+            return self.metrics_tracker.snapshot()
+        raise ValueError("Unknown query. Expected one of: memory, facts, tasks, distribution, metrics.")
+
+
+def serve_stream(service, infile, outfile):
+    """
+    Reads JSON-lines requests from `infile` and streams responses to `outfile`.
+
+    Anything the components print is redirected to stderr so `outfile` only ever
+    carries responses.
+
+    Args:
+        service (SupernetService): The warm service.
+        infile (file): Source of requests (stdin or a batch file).
+        outfile (file): Destination of responses.
+    """
+    for line in infile:
+        if not line.strip():
+            continue
+        with contextlib.redirect_stdout(sys.stderr):
+            response = service.handle_line(line)
+        outfile.write(response + "\n")
+        outfile.flush()
+
+
+def serve_unix_socket(service, path):
+    """
+    Serves JSON-lines requests on a Unix domain socket until interrupted.
+    Each connection may send any number of requests and is served by its own thread.
+
+    Args:
+        service (SupernetService): The warm service.
+        path (str): Socket path; a stale socket file is replaced.
+    """
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for raw_line in self.rfile:
+                line = raw_line.decode("utf-8")
+                if not line.strip():
+                    continue
+                response = service.handle_line(line)
+                self.wfile.write((response + "\n").encode("utf-8"))
+                self.wfile.flush()
+
+    if os.path.exists(path):
+        os.remove(path)
+
+    with socketserver.ThreadingUnixStreamServer(path, Handler) as server:
+        server.daemon_threads = True
+        print(f"🛰 Serving JSON-lines requests on {path}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.remove(path)
@@ -0,0 +1,182 @@
+import os
+import sys
+import numpy as np
+from multiprocessing import shared_memory
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from core.agentic_supernet import AgenticSupernet, LOGIT_CLIP, MAX_COMPLEXITY
+
+NUM_STRIPES = 8  # Locks guarding interleaved slices of the shared arrays
+
+
+class SharedSupernetState:
+    """
+    Supernet logits and per-complexity stats stored in one shared-memory block.
+
+    Layout (float64): `logits[num_agents]` followed by
+    `stats[MAX_COMPLEXITY + 1, num_agents, 2]`. Updates are additive deltas, so
+    they commute and workers can apply them in any order. Agents are split into
+    `NUM_STRIPES` interleaved stripes, each guarded by its own lock, so workers
+    updating different agents do not contend.
+    """
+
+    def __init__(self, shm, num_agents, locks, owner=False):
+        self.shm = shm
+        self.num_agents = num_agents
+        self.locks = locks
+        self.owner = owner
+        self.logits = np.ndarray((num_agents,), dtype=np.float64, buffer=shm.buf)
+        self.stats = np.ndarray((MAX_COMPLEXITY + 1, num_agents, 2), dtype=np.float64,
+                                buffer=shm.buf, offset=self.logits.nbytes)
+
+    @staticmethod
+    def _size(num_agents):
+        return 8 * (num_agents + (MAX_COMPLEXITY + 1) * num_agents * 2)
+
+    @classmethod
+    def create(cls, num_agents, ctx, num_stripes=NUM_STRIPES, initial=None):
+        """
+        Allocates a new shared block.
+
+        Args:
+            num_agents (int): Number of agents.
+            ctx (multiprocessing.context.BaseContext): Context used to create the stripe locks.
+            num_stripes (int): Number of stripe locks.
+            initial (AgenticSupernet): Supernet whose logits and stats seed the block.
+                Defaults to a uniform distribution and empty stats.
+
+        Returns:
+            SharedSupernetState: The owning handle; call `unlink()` when done.
+        """
+        shm = shared_memory.SharedMemory(create=True, size=cls._size(num_agents))
+        state = cls(shm, num_agents, [ctx.Lock() for _ in range(num_stripes)], owner=True)
+        state.logits[:] = initial.logits if initial is not None else 0.0
+        state.stats[:] = initial.complexity_stats if initial is not None else 0.0
+        return state
+
+    @classmethod
+    def attach(cls, name, num_agents, locks):
+        """
+        Attaches to a block created by another process.
+
+        Args:
+            name (str): Shared memory name (`state.shm.name`).
+            num_agents (int): Number of agents.
+            locks (list): The creator's stripe locks.
+
+        Returns:
+            SharedSupernetState: A non-owning handle.
+        """
+        return cls(shared_memory.SharedMemory(name=name), num_agents, locks)
+
+    def apply(self, logit_deltas, stat_deltas):
+        """
+        Adds local deltas to the shared arrays, one stripe lock at a time.
+        Logits are kept within [-LOGIT_CLIP, LOGIT_CLIP].
+
+        Args:
+            logit_deltas (np.array): Logit deltas per agent.
+            stat_deltas (np.array): Stats deltas, shaped like `stats`.
+        """
+        num_stripes = len(self.locks)
+        for stripe, lock in enumerate(self.locks):
+            columns = slice(stripe, self.num_agents, num_stripes)
+            if not (logit_deltas[columns].any() or stat_deltas[:, columns].any()):
+                continue
+            with lock:
+                self.logits[columns] = np.clip(self.logits[columns] + logit_deltas[columns], -LOGIT_CLIP, LOGIT_CLIP)
+                self.stats[:, columns] += stat_deltas[:, columns]
+
+    def read(self):
+        """
+        Returns copies of the shared arrays.
+
+        Returns:
+            tuple: (logits, stats).
+        """
+        return self.logits.copy(), self.stats.copy()
+
+    def close(self):
+        del self.logits, self.stats  # Release the buffer views before closing
+        self.shm.close()
+
+    def unlink(self):
+        if self.owner:
+            self.shm.unlink()
+
+
+class SharedAgenticSupernet(AgenticSupernet):
+    """
+    Supernet whose logits and complexity stats live in `SharedSupernetState`,
+    so any number of worker processes learn one policy.
+
+    Updates are buffered locally and pushed to shared memory every
+    `sync_interval` updates (or on `sync()`), which also pulls in what the other
+    workers learned. In between, sampling uses the last shared snapshot plus this
+    worker's pending updates.
+    """
+
+    def __init__(self, agents, state, entropy_weight=0.1, temperature=1.0, num_samples=3, max_samples=3,
+                 sync_interval=10):
+        """
+        Args:
+            agents (list): List of available agents, in the same order in every worker.
+            state (SharedSupernetState): The shared arrays.
+            entropy_weight (float): Weight for entropy regularization to encourage diversity.
+            temperature (float): Softmax temperature.
+            num_samples (int or str): Agents sampled per task, or "auto".
+            max_samples (int): Upper bound on the adaptive sample size.
+            sync_interval (int): Local updates between synchronizations.
+        """
+        self._shared_logits = np.zeros(len(agents))
+        self._pending_logits = np.zeros(len(agents))
+        super().__init__(agents, entropy_weight, temperature, num_samples, max_samples)
+        self.state = state
+        self.sync_interval = sync_interval
+        self._pending_stats = np.zeros_like(self.complexity_stats)
+        self._updates = 0
+        self.sync()
+
+    def update_batch(self, indices, rewards):
+        deltas = self._reward_deltas(indices, rewards)
+        with self._lock:
+            self._pending_logits += deltas
+            self._refresh_distribution()
+            self._tick()
+
+    def record_outcome(self, agent_idx, complexity, success):
+        bucket = min(max(int(complexity), 0), MAX_COMPLEXITY)
+        with self._lock:
+            super().record_outcome(agent_idx, complexity, success)
+            self._pending_stats[bucket, agent_idx, 0] += bool(success)
+            self._pending_stats[bucket, agent_idx, 1] += 1
+            self._tick()
+
+    def record_outcomes(self, indices, complexities, successes):
+        buckets = np.clip(np.asarray(complexities, dtype=np.intp), 0, MAX_COMPLEXITY)
+        indices = np.asarray(indices, dtype=np.intp)
+        with self._lock:
+            super().record_outcomes(indices, complexities, successes)
+            np.add.at(self._pending_stats, (buckets, indices, 0), np.asarray(successes, dtype=bool))
+            np.add.at(self._pending_stats, (buckets, indices, 1), 1)
+            self._tick()
+
+    def sync(self):
+        """ Pushes pending updates to shared memory and pulls the merged state back. """
+        with self._lock:
+            self.state.apply(self._pending_logits, self._pending_stats)
+            self._pending_logits[:] = 0.0
+            self._pending_stats[:] = 0.0
+            self._updates = 0
+
+            self._shared_logits, self.complexity_stats = self.state.read()
+            self._refresh_distribution()
+
+    def _tick(self):
+        self._updates += 1
+        if self._updates >= self.sync_interval:
+            self.sync()
+
+    def _refresh_distribution(self):
+        """ Derives the sampling distribution from the shared logits plus pending local rewards. """
+        self.logits = np.clip(self._shared_logits + self._pending_logits, -LOGIT_CLIP, LOGIT_CLIP)
+        super()._refresh_distribution()
@@ -1,38 +1,79 @@
 import os
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-import json
-import os
-from utils.logger import log_event  
+from core.task_store import DEFAULT_STATUS, open_task_store, read_task_file
+from utils.logger import log_event
 
 TASKS_FILE = "tasks.json"
 
 class TaskManager:
-    """ 
+    """
     A flexible task manager that allows developers to define, register, and retrieve tasks dynamically.
+
+    Tasks are kept in `tasks.json` by default. Changes are applied to the latest
+    file under a file lock and written atomically, so several processes can
+    register and remove tasks without overwriting each other. A `.db` /
+    `.sqlite` path stores them in SQLite instead, indexed by complexity and
+    status, for task sets too large to rewrite on every change.
     """
 
-    def __init__(self):
+    def __init__(self, path=TASKS_FILE):
         """
-        Initializes the task manager and loads existing tasks.
+        Initializes the task manager and opens the task storage.
+
+        Args:
+            path (str): `tasks.json`-style JSON file, or a SQLite database (`.db`, `.sqlite`, `.sqlite3`).
         """
-        self.tasks = {}
-        self.load_tasks()
+        self.path = path
+        self._store = open_task_store(path)
 
-    def register_task(self, name, complexity):
+    def register_task(self, name, complexity, status=DEFAULT_STATUS):
         """
         Registers a new task dynamically and saves it persistently.
 
         Args:
             name (str): Task name.
             complexity (int): Task complexity level.
+            status (str): Initial status.
         """
-        if name in self.tasks:
-            raise ValueError(f"⚠ Task '{name}' is already registered.")
-        self.tasks[name] = {"name": name, "complexity": complexity}
-        self.save_tasks()
+        try:
+            self._store.add([{"name": name, "complexity": complexity, "status": status}])
+        except ValueError:
+            raise ValueError(f"⚠ Task '{name}' is already registered.") from None
         log_event(f"✅ Task '{name}' registered with complexity {complexity}.")
 
+    def register_tasks(self, tasks, skip_existing=False):
+        """
+        Registers many tasks with a single write (one transaction in SQLite).
+
+        Args:
+            tasks (iterable): {"name", "complexity"[, "status"]} dicts; may be a generator.
+            skip_existing (bool): Skip tasks whose name is already registered instead of failing.
+
+        Returns:
+            int: Tasks registered.
+
+        Raises:
+            ValueError: If a name is already registered and `skip_existing` is False; nothing is registered then.
+        """
+        added = self._store.add(tasks, skip_existing=skip_existing)
+        log_event(f"✅ {added} tasks registered.", tasks_registered=added)
+        return added
+
+    def import_tasks(self, path, skip_existing=False):
+        """
+        Registers every task in a JSON-lines or CSV file (see `core.task_store.read_task_file`),
+        streaming it so the file is never held in memory.
+
+        Args:
+            path (str): The task file.
+            skip_existing (bool): Skip tasks whose name is already registered instead of failing.
+
+        Returns:
+            int: Tasks registered.
+        """
+        return self.register_tasks(read_task_file(path), skip_existing=skip_existing)
+
     def get_task(self, name):
         """
         Retrieves a task by name.
@@ -43,16 +84,54 @@ class TaskManager:
         Returns:
             dict or None: Task details if found, otherwise None.
         """
-        return self.tasks.get(name)
+        return self._store.get(name)
 
-    def list_tasks(self):
+    def list_tasks(self, min_complexity=None, max_complexity=None, status=None, offset=0, limit=None):
         """
-        Returns a list of all registered tasks.
+        Returns registered tasks in registration order, optionally filtered and paginated.
+
+        Args:
+            min_complexity (int): Only tasks at least this complex.
+            max_complexity (int): Only tasks at most this complex.
+            status (str): Only tasks with this status.
+            offset (int): Matching tasks to skip (the page start).
+            limit (int): Maximum tasks returned (the page size), or None for all.
 
         Returns:
             list: A list of task dictionaries.
         """
-        return list(self.tasks.values())
+        return list(self.iter_tasks(min_complexity, max_complexity, status, offset, limit))
+
+    def iter_tasks(self, min_complexity=None, max_complexity=None, status=None, offset=0, limit=None):
+        """
+        Like `list_tasks`, but yields the tasks one at a time; a SQLite store reads them page by page.
+
+        Returns:
+            iterator: Task dictionaries.
+        """
+        return self._store.iter(min_complexity, max_complexity, status, offset, limit)
+
+    def count_tasks(self, min_complexity=None, max_complexity=None, status=None):
+        """
+        Counts registered tasks matching the filters of `list_tasks`.
+
+        Returns:
+            int: The number of tasks.
+        """
+        return self._store.count(min_complexity, max_complexity, status)
+
+    def set_task_status(self, name, status):
+        """
+        Changes a task's status.
+
+        Args:
+            name (str): The task name.
+            status (str): The new status.
+
+        Returns:
+            bool: Whether the task exists.
+        """
+        return self._store.set_status(name, status)
 
     def remove_task(self, name):
         """
@@ -61,9 +140,7 @@ class TaskManager:
         Args:
             name (str): The task name to remove.
         """
-        if name in self.tasks:
-            del self.tasks[name]
-            self.save_tasks()
+        if self._store.remove(name):
             log_event(f"🗑 Task '{name}' removed.")
         else:
             print(f"⚠ Task '{name}' not found.")
@@ -74,34 +151,8 @@ class TaskManager:
         """
         confirm = input("⚠ Are you sure you want to delete ALL tasks? (yes/no): ")
         if confirm.lower() == "yes":
-            self.tasks.clear()
-            self.save_tasks()
+            self._store.clear()
             log_event("🗑 All tasks have been cleared.")
             print("✅ Task list cleared.")
         else:
             print("❌ Task clearing aborted.")
-
-    def save_tasks(self):
-        """
-        Saves tasks to a JSON file.
-        """
-        try:
-            with open(TASKS_FILE, "w") as file:
-                json.dump(self.tasks, file, indent=4)
-        except Exception as e:
-            log_event(f"❌ Error saving tasks: {e}")
-            print(f"⚠ Could not save tasks: {e}")
-
-    def load_tasks(self):
-        """
-        Loads tasks from a JSON file if it exists.
-        """
-        if os.path.exists(TASKS_FILE):
-            try:
-                with open(TASKS_FILE, "r") as file:
-                    self.tasks = json.load(file)
-            except json.JSONDecodeError:
-                log_event("⚠ Error loading tasks: Corrupted file. Resetting...")
-                print("⚠ Error loading tasks: Corrupted file. Resetting...")
-                self.tasks = {}
-                self.save_tasks()
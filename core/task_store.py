@@ -0,0 +1,270 @@
+import csv
+import itertools
+import json
+import os
+import threading
+from utils.storage import JsonStore, connect_sqlite
+
+DEFAULT_STATUS = "active"
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+PAGE_SIZE = 1_000  # Rows fetched per query while iterating a SQLite store
+
+
+def read_task_file(path):
+    """
+    Streams task definitions from a JSON-lines or CSV file, one at a time, so
+    files of any size can be imported. JSON lines are objects with "name",
+    "complexity" and optionally "status"; CSV files have a header row with the
+    same columns.
+
+    Args:
+        path (str): A `.jsonl` / `.ndjson` or `.csv` file.
+
+    Yields:
+        dict: {"name", "complexity", "status"}.
+
+    Raises:
+        ValueError: For an unsupported file type or a malformed line.
+    """
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix not in (".jsonl", ".ndjson", ".csv"):
+        raise ValueError(f"Unsupported task file '{path}'. Expected .jsonl, .ndjson or .csv.")
+    with open(path, "r", encoding="utf-8", newline="") as file:
+        rows = csv.DictReader(file) if suffix == ".csv" else (json.loads(line) for line in file if line.strip())
+        for line_number, row in enumerate(rows, 2 if suffix == ".csv" else 1):
+            try:
+                yield {"name": str(row["name"]), "complexity": int(row["complexity"]),
+                       "status": row.get("status") or DEFAULT_STATUS}
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError(f"Invalid task on line {line_number} of '{path}': {e!r}") from None
+
+
+def _matches(task, min_complexity, max_complexity, status):
+    complexity = task["complexity"]
+    return ((min_complexity is None or complexity >= min_complexity)
+            and (max_complexity is None or complexity <= max_complexity)
+            and (status is None or task.get("status", DEFAULT_STATUS) == status))
+
+
+class JsonTaskStore:
+    """
+    Tasks in one JSON file (`{name: task}`), the default. Every change is a
+    locked, atomic merge-on-write (see `utils.storage.JsonStore`); queries scan
+    the tasks in registration order.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._store = JsonStore(path)
+
+    def get(self, name):
+        return self._store.load().get(name)
+
+    def add(self, tasks, skip_existing=False):
+        """
+        Adds tasks with a single write.
+
+        Args:
+            tasks (iterable): {"name", "complexity", "status"} dicts.
+            skip_existing (bool): Ignore tasks whose name is taken instead of failing.
+
+        Returns:
+            int: Tasks added.
+
+        Raises:
+            ValueError: If a name is already registered (nothing is added).
+        """
+        added = 0
+
+        def add_all(stored):
+            nonlocal added
+            new = {}
+            for task in tasks:
+                name = task["name"]
+                if name in stored or name in new:
+                    if skip_existing:
+                        continue
+                    raise ValueError(f"⚠ Task '{name}' is already registered.")
+                new[name] = {"name": name, "complexity": task["complexity"],
+                             "status": task.get("status", DEFAULT_STATUS)}
+            stored.update(new)
+            added = len(new)
+            return bool(new)
+
+        self._store.update(add_all)
+        return added
+
+    def remove(self, name):
+        removed = []
+
+        def remove(stored):
+            if name not in stored:
+                return False
+            removed.append(stored.pop(name))
+
+        self._store.update(remove)
+        return bool(removed)
+
+    def clear(self):
+        self._store.update(lambda stored: stored.clear())
+
+    def set_status(self, name, status):
+        def update(stored):
+            if name not in stored:
+                return False
+            stored[name]["status"] = status
+
+        return name in self._store.update(update)
+
+    def iter(self, min_complexity=None, max_complexity=None, status=None, offset=0, limit=None):
+        tasks = (task for task in list(self._store.load().values())
+                 if _matches(task, min_complexity, max_complexity, status))
+        return itertools.islice(tasks, offset, None if limit is None else offset + limit)
+
+    def count(self, min_complexity=None, max_complexity=None, status=None):
+        return sum(1 for _ in self.iter(min_complexity, max_complexity, status))
+
+    def close(self):
+        pass
+
+
+class SqliteTaskStore:
+    """
+    Tasks in a SQLite database, for large task sets: lookups by name and
+    filters on complexity and status use indexes, bulk imports are one
+    transaction, and listing pages through the table without loading it. The
+    database runs in WAL mode, so several processes can read while one writes.
+    """
+
+    def __init__(self, path):
+        import sqlite3
+
+        self.path = path
+        self._integrity_error = sqlite3.IntegrityError
+        self._conn = connect_sqlite(path)
+        self._lock = threading.RLock()
+        with self._lock:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL UNIQUE,
+                    complexity INTEGER NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'active'
+                );
+                CREATE INDEX IF NOT EXISTS tasks_complexity ON tasks (complexity);
+                CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status);
+            """)
+
+    @staticmethod
+    def _task(row):
+        return {"name": row[0], "complexity": row[1], "status": row[2]}
+
+    def _write(self, sql, parameters=()):
+        with self._lock:
+            return self._conn.execute(sql, parameters).rowcount
+
+    def get(self, name):
+        with self._lock:
+            row = self._conn.execute("SELECT name, complexity, status FROM tasks WHERE name = ?", (name,)).fetchone()
+        return self._task(row) if row else None
+
+    def add(self, tasks, skip_existing=False):
+        """ Same contract as `JsonTaskStore.add`; the tasks are streamed into one transaction. """
+        verb = "INSERT OR IGNORE" if skip_existing else "INSERT"
+        rows = ((task["name"], task["complexity"], task.get("status", DEFAULT_STATUS)) for task in tasks)
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(f"{verb} INTO tasks (name, complexity, status) VALUES (?, ?, ?)", rows)
+            except self._integrity_error as e:
+                self._conn.execute("ROLLBACK")
+                raise ValueError(f"⚠ A task in the batch is already registered ({e}).") from None
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return self._conn.total_changes - before
+
+    def remove(self, name):
+        return self._write("DELETE FROM tasks WHERE name = ?", (name,)) > 0
+
+    def clear(self):
+        self._write("DELETE FROM tasks")
+
+    def set_status(self, name, status):
+        return self._write("UPDATE tasks SET status = ? WHERE name = ?", (status, name)) > 0
+
+    def _where(self, min_complexity, max_complexity, status):
+        clauses, parameters = [], []
+        if min_complexity is not None and min_complexity == max_complexity:
+            # Equality lets SQLite walk the complexity index in id order instead of sorting the matches
+            clauses.append("complexity = ?")
+            parameters.append(min_complexity)
+            min_complexity = max_complexity = None
+        if min_complexity is not None:
+            clauses.append("complexity >= ?")
+            parameters.append(min_complexity)
+        if max_complexity is not None:
+            clauses.append("complexity <= ?")
+            parameters.append(max_complexity)
+        if status is not None:
+            clauses.append("status = ?")
+            parameters.append(status)
+        return clauses, parameters
+
+    def iter(self, min_complexity=None, max_complexity=None, status=None, offset=0, limit=None):
+        """ Yields matching tasks in registration order, fetching `PAGE_SIZE` rows per query (keyset pagination). """
+        clauses, parameters = self._where(min_complexity, max_complexity, status)
+        where = " AND ".join(clauses + ["id > ?"])
+        if offset:
+            with self._lock:
+                row = self._conn.execute(
+                    f"SELECT id FROM tasks {'WHERE ' + ' AND '.join(clauses) if clauses else ''} "
+                    "ORDER BY id LIMIT 1 OFFSET ?", parameters + [offset - 1]).fetchone()
+            if row is None:
+                return
+            last_id = row[0]
+        else:
+            last_id = 0
+        remaining = limit
+        while remaining is None or remaining > 0:
+            page_size = PAGE_SIZE if remaining is None else min(PAGE_SIZE, remaining)
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT id, name, complexity, status FROM tasks WHERE {where} ORDER BY id LIMIT ?",
+                    parameters + [last_id, page_size]).fetchall()
+            for row in rows:
+                yield self._task(row[1:])
+            if len(rows) < page_size:
+                return
+            last_id = rows[-1][0]
+            if remaining is not None:
+                remaining -= len(rows)
+
+    def count(self, min_complexity=None, max_complexity=None, status=None):
+        clauses, parameters = self._where(min_complexity, max_complexity, status)
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT COUNT(*) FROM tasks {'WHERE ' + ' AND '.join(clauses) if clauses else ''}",
+                parameters).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def open_task_store(path):
+    """
+    Opens the task store for a path: SQLite for `.db` / `.sqlite` / `.sqlite3`
+    files, a JSON file otherwise.
+
+    Args:
+        path (str): Storage file.
+
+    Returns:
+        JsonTaskStore or SqliteTaskStore: The store.
+    """
+    if path.lower().endswith(SQLITE_SUFFIXES):
+        return SqliteTaskStore(path)
+    return JsonTaskStore(path)
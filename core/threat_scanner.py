@@ -0,0 +1,211 @@
+import mmap
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+CHUNK_SIZE = 64 * 1024 * 1024   # Bytes handed to one worker; chunk edges snap to line ends
+BLOCK_SIZE = 4 * 1024 * 1024     # Bytes lower-cased and matched at a time inside a chunk
+MAX_OFFSETS_PER_RULE = 1000      # Offsets kept per rule so memory stays constant on huge files
+
+# Rules are matched against ASCII lower-cased text, so they must be written in lower case.
+# They are joined into one alternation, so they may not use capturing groups (and thus
+# backreferences) or global inline flags like "(?s)"; use "(?:...)" and "(?s:...)" instead.
+DEFAULT_THREAT_RULES = {
+    "failed_login": r"failed (?:login|password)|authentication failure|invalid user",
+    "sql_injection": r"union\s+(?:all\s+)?select|'\s*or\s+'?1'?\s*=\s*'?1|;\s*drop\s+table",
+    "path_traversal": r"\.\./\.\./|%2e%2e%2f",
+    "xss": r"<script\b|javascript:",
+    "privilege_escalation": r"sudo: .*incorrect password|permission denied|/etc/shadow",
+    "tool_failure": r"❌",
+}
+
+
+@lru_cache(maxsize=16)
+def _compile_rules(rules):
+    """
+    Compiles a rule set into one combined bytes regex plus one regex per rule.
+
+    The combined pattern is a flat alternation without groups, which lets the
+    regex engine skip ahead using the set of possible first characters; wrapping
+    rules in groups would disable that and make scans several times slower. The
+    per-rule patterns are only used to attribute the (rare) hits to a rule.
+
+    Args:
+        rules (tuple): (name, pattern) pairs.
+
+    Returns:
+        tuple: (combined pattern, list of per-rule patterns).
+
+    Raises:
+        ValueError: If a rule would change meaning once joined: group numbers shift
+            and global flags apply to every rule.
+    """
+    sources = [pattern.encode("utf-8") for _, pattern in rules]
+    per_rule = [re.compile(source) for source in sources]
+    for (name, pattern), compiled in zip(rules, per_rule):
+        if compiled.groups:
+            raise ValueError(f"Threat rule '{name}' uses a capturing group; use '(?:...)' instead: {pattern!r}")
+        if compiled.flags:
+            raise ValueError(f"Threat rule '{name}' sets a global flag; scope it as '(?flags:...)' instead: {pattern!r}")
+    return re.compile(b"|".join(sources)), per_rule
+
+
+def _scan_buffer(buffer, rules, start, end, max_offsets):
+    """
+    Scans `buffer[start:end]` block by block, so memory use is bounded by `BLOCK_SIZE`.
+
+    Args:
+        buffer (bytes | mmap.mmap): The data to scan.
+        rules (tuple): (name, pattern) pairs.
+        start (int): First byte to scan.
+        end (int): Byte after the last one to scan; must be a line boundary or the end of the data.
+        max_offsets (int): Maximum offsets recorded per rule.
+
+    Returns:
+        tuple: (counts, offsets) lists indexed like `rules`.
+    """
+    combined, per_rule = _compile_rules(rules)
+    counts = [0] * len(rules)
+    offsets = [[] for _ in rules]
+
+    block_start = start
+    while block_start < end:
+        block_end = min(block_start + BLOCK_SIZE, end)
+        if block_end < end:
+            newline = buffer.find(b"\n", block_end, end)
+            block_end = end if newline == -1 else newline + 1
+
+        block = buffer[block_start:block_end].lower()
+        for match in combined.finditer(block):
+            position = match.start()
+            index = next(i for i, pattern in enumerate(per_rule) if pattern.match(block, position))
+            counts[index] += 1
+            if len(offsets[index]) < max_offsets:
+                offsets[index].append(block_start + position)
+
+        block_start = block_end
+
+    return counts, offsets
+
+
+def _scan_file_range(path, rules, start, end, max_offsets):
+    """ Process-pool entry point: maps the file and scans one byte range of it. """
+    with open(path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return _scan_buffer(mapped, rules, start, end, max_offsets)
+
+
+class ThreatScanner:
+    """
+    Scans logs for threat signatures using one compiled multi-pattern regex.
+
+    Files are memory-mapped and split into line-aligned chunks, and each chunk is
+    matched in fixed-size blocks, so memory use stays constant regardless of file
+    size. Large files are scanned by a pool of processes, one chunk per task;
+    the pool is started on first use and reused until `close`. Matching is
+    case-insensitive for ASCII; matches never span lines.
+    """
+
+    def __init__(self, rules=None, chunk_size=CHUNK_SIZE, max_offsets=MAX_OFFSETS_PER_RULE, workers=None):
+        """
+        Args:
+            rules (dict): Mapping of rule name to a lower-case regex. Defaults to `DEFAULT_THREAT_RULES`.
+            chunk_size (int): Approximate bytes per chunk.
+            max_offsets (int): Maximum match offsets reported per rule.
+            workers (int): Worker processes for multi-chunk files. Defaults to the CPU count.
+        """
+        self.rules = tuple((rules or DEFAULT_THREAT_RULES).items())
+        self.chunk_size = chunk_size
+        self.max_offsets = max_offsets
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        _compile_rules(self.rules)  # Fail early on an invalid rule
+
+    def _get_executor(self):
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def close(self):
+        """ Shuts down the worker processes, if any were started. """
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+    def scan_file(self, path):
+        """
+        Scans a log file of any size.
+
+        Args:
+            path (str): Path to the log file.
+
+        Returns:
+            dict: {"bytes_scanned": int, "counts": {rule: int}, "offsets": {rule: [int]}}.
+        """
+        size = os.path.getsize(path)
+        if size == 0:
+            return self._build_report(0, [([0] * len(self.rules), [[] for _ in self.rules])])
+
+        ranges = self._chunk_ranges(path, size)
+        if len(ranges) == 1 or self.workers == 1:
+            partials = [_scan_file_range(path, self.rules, start, end, self.max_offsets) for start, end in ranges]
+        else:
+            executor = self._get_executor()
+            futures = [executor.submit(_scan_file_range, path, self.rules, start, end, self.max_offsets)
+                       for start, end in ranges]
+            partials = [future.result() for future in futures]
+
+        return self._build_report(size, partials)
+
+    def scan_text(self, text):
+        """
+        Scans an in-memory log string.
+
+        Args:
+            text (str | bytes): The log content.
+
+        Returns:
+            dict: Same structure as `scan_file`; offsets are byte offsets in the UTF-8 encoding.
+        """
+        data = text.encode("utf-8") if isinstance(text, str) else bytes(text)
+        partial = _scan_buffer(data, self.rules, 0, len(data), self.max_offsets)
+        return self._build_report(len(data), [partial])
+
+    def _chunk_ranges(self, path, size):
+        """
+        Splits the file into byte ranges of about `chunk_size`, each ending on a line boundary.
+
+        Returns:
+            list: (start, end) tuples covering the whole file.
+        """
+        ranges = []
+        with open(path, "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                start = 0
+                while start < size:
+                    end = min(start + self.chunk_size, size)
+                    if end < size:
+                        newline = mapped.find(b"\n", end)
+                        end = size if newline == -1 else newline + 1
+                    ranges.append((start, end))
+                    start = end
+        return ranges
+
+    def _build_report(self, size, partials):
+        """ Merges per-chunk results (in file order) into the final report. """
+        counts = {name: 0 for name, _ in self.rules}
+        offsets = {name: [] for name, _ in self.rules}
+
+        for chunk_counts, chunk_offsets in partials:
+            for (name, _), count, rule_offsets in zip(self.rules, chunk_counts, chunk_offsets):
+                counts[name] += count
+                room = self.max_offsets - len(offsets[name])
+                if room > 0:
+                    offsets[name].extend(rule_offsets[:room])
+
+        return {"bytes_scanned": size, "counts": counts, "offsets": offsets}
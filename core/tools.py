@@ -1,63 +1,266 @@
+import contextvars
+import functools
+import os
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from core.resilience import ToolError, call_with_resilience
+from core.router import get_router
+from core.threat_scanner import ThreatScanner
+from utils.metrics import get_metrics_tracker
+from utils.tracing import span
+
+MAX_TOOL_WORKERS = 8      # Upper bound on concurrent upstream requests per batch call
+QUOTE_BATCH_SIZE = 50     # Symbols merged into a single Yahoo Finance quote request
+
+THREAT_SCANNER = ThreatScanner()
+
+
+def _timed_tool(func):
+    """ Records each call's latency in the shared metrics tracker under the tool's name, inside a tracing span. """
+    span_name = f"tool.{func.__name__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            with span(span_name):
+                return func(*args, **kwargs)
+        finally:
+            get_metrics_tracker().record_latency("tool", func.__name__, time.perf_counter() - start)
+    return wrapper
+
+
+def _map_concurrently(func, items, max_workers=MAX_TOOL_WORKERS):
+    """
+    Applies `func` to every item using a bounded thread pool.
+
+    Args:
+        func (callable): Function applied to each item. It should return error
+            strings instead of raising, like the rest of `Tools`.
+        items (list): Items to process.
+        max_workers (int): Maximum number of concurrent calls.
+
+    Returns:
+        list: One result per item, in input order.
+    """
+    items = list(items)
+    if len(items) <= 1 or max_workers <= 1:
+        return [func(item) for item in items]
+
+    # Each call runs in a copy of the caller's context, so its spans nest under the caller's
+    contexts = [contextvars.copy_context() for _ in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(lambda context, item: context.run(func, item), contexts, items))
+
+
+def _request(endpoint, method, url, **kwargs):
+    """
+    Sends an HTTP request through the endpoint's circuit breaker and the global retry budget.
+
+    Server errors (5xx) count as failures; other responses are returned as-is.
+
+    Args:
+        endpoint (str): Endpoint name used for the circuit breaker.
+        method (str): HTTP method.
+        url (str): Request URL.
+        **kwargs: Extra arguments for `requests.request`.
+
+    Returns:
+        requests.Response: The upstream response.
+    """
+    kwargs.setdefault("timeout", 5)
+
+    def send():
+        with span("http.request", endpoint=endpoint, method=method):
+            response = requests.request(method, url, **kwargs)
+        if response.status_code >= 500:
+            response.raise_for_status()
+        return response
+
+    return call_with_resilience(endpoint, send)
+
 
 class Tools:
     """Provides specialized tools for different agents."""
 
     @staticmethod
+    @_timed_tool
     def fetch_stock_price(ticker):
         """Fetches real-time stock price from Yahoo Finance."""
         try:
             url = f"https://query1.finance.yahoo.com/v8/finance/chart/{ticker}"
-            response = requests.get(url, timeout=5)
+            response = _request("yahoo_finance", "GET", url)
             data = response.json()
             if "chart" in data and "result" in data["chart"]:
                 return f"📈 {ticker} current price: {data['chart']['result'][0]['meta']['regularMarketPrice']}"
-            return "❌ Error fetching stock price."
+            return ToolError("❌ Error fetching stock price.")
         except Exception as e:
-            return f"❌ Error fetching stock price: {str(e)}"
+            return ToolError(f"❌ Error fetching stock price: {str(e)}")
 
     @staticmethod
+    @_timed_tool
+    def fetch_stock_price_batch(tickers, max_workers=MAX_TOOL_WORKERS):
+        """
+        Fetches real-time stock prices for many tickers at once.
+
+        Tickers are merged into multi-symbol Yahoo Finance quote requests of up to
+        `QUOTE_BATCH_SIZE` symbols, and those requests run concurrently.
+
+        Args:
+            tickers (list): Ticker symbols.
+            max_workers (int): Maximum number of concurrent requests.
+
+        Returns:
+            list: One result string per ticker, in input order.
+        """
+        tickers = list(tickers)
+        batches = [tickers[i:i + QUOTE_BATCH_SIZE] for i in range(0, len(tickers), QUOTE_BATCH_SIZE)]
+
+        results = []
+        for batch_results in _map_concurrently(Tools._fetch_quote_batch, batches, max_workers):
+            results.extend(batch_results)
+        return results
+
+    @staticmethod
+    def _fetch_quote_batch(tickers):
+        """
+        Fetches one multi-symbol quote request and splits it back into per-ticker results.
+
+        Yahoo's v7 quote endpoint may refuse requests without a session crumb
+        (401/403). Tickers the batch could not answer are then fetched one by one
+        from the v8 chart endpoint `fetch_stock_price` uses.
+        """
+        quotes = {}
+        try:
+            url = "https://query1.finance.yahoo.com/v7/finance/quote"
+            response = _request("yahoo_finance", "GET", url, params={"symbols": ",".join(tickers)})
+            if response.status_code == 200:
+                data = response.json()
+                quotes = {quote.get("symbol"): quote for quote in (data.get("quoteResponse") or {}).get("result") or []}
+        except Exception:
+            pass  # Every ticker falls back to its own request below
+
+        results = []
+        for ticker in tickers:
+            quote = quotes.get(ticker.upper())
+            if quote and quote.get("regularMarketPrice") is not None:
+                results.append(f"📈 {ticker} current price: {quote['regularMarketPrice']}")
+            else:
+                results.append(Tools.fetch_stock_price(ticker))
+        return results
+
+    @staticmethod
+    @_timed_tool
     def fetch_academic_papers(query):
         """Fetches latest academic papers from ArXiv."""
         try:
             url = f"http://export.arxiv.org/api/query?search_query={query}&start=0&max_results=2"
-            response = requests.get(url, timeout=5)
-            return response.text if response.status_code == 200 else "❌ Error fetching papers."
+            response = _request("arxiv", "GET", url)
+            return response.text if response.status_code == 200 else ToolError("❌ Error fetching papers.")
         except Exception as e:
-            return f"❌ Error fetching papers: {str(e)}"
+            return ToolError(f"❌ Error fetching papers: {str(e)}")
 
     @staticmethod
+    @_timed_tool
+    def fetch_academic_papers_batch(queries, max_workers=MAX_TOOL_WORKERS):
+        """
+        Fetches academic papers for many queries concurrently.
+
+        ArXiv cannot attribute results of a combined search back to the individual
+        queries, so each query keeps its own request.
+
+        Args:
+            queries (list): Search queries.
+            max_workers (int): Maximum number of concurrent requests.
+
+        Returns:
+            list: One result per query, in input order.
+        """
+        return _map_concurrently(Tools.fetch_academic_papers, queries, max_workers)
+
+    @staticmethod
+    @_timed_tool
     def analyze_sentiment(text):
         """Performs sentiment analysis on a given text."""
         try:
             url = "https://api.text-processing.com/sentiment/"
-            response = requests.post(url, data={"text": text}, timeout=5)
-            return response.json() if response.status_code == 200 else "❌ Sentiment analysis failed."
+            response = _request("text_processing", "POST", url, data={"text": text})
+            return response.json() if response.status_code == 200 else ToolError("❌ Sentiment analysis failed.")
         except Exception as e:
-            return f"❌ Sentiment analysis failed: {str(e)}"
+            return ToolError(f"❌ Sentiment analysis failed: {str(e)}")
 
     @staticmethod
+    def join_results(results, separator=" | "):
+        """
+        Joins several tool results into one string.
+
+        Args:
+            results (list): Tool results.
+            separator (str): Separator placed between results.
+
+        Returns:
+            str: The joined results, as a `ToolError` if any result failed so the
+            combined answer is not cached.
+        """
+        joined = separator.join(str(result) for result in results)
+        return ToolError(joined) if any(isinstance(result, ToolError) for result in results) else joined
+
+    @staticmethod
+    @_timed_tool
     def detect_threats(logs):
-        """Analyzes security logs for potential threats."""
-        # Simulated AI-based threat detection
-        return f"🚨 Threat analysis complete. {len(logs)} logs scanned. No critical threats detected."
+        """
+        Analyzes security logs for potential threats.
+
+        Args:
+            logs (list): Log file paths and/or raw log text. Existing files are
+                streamed from disk; anything else is scanned as text.
+
+        Returns:
+            str: A summary of matches per threat rule.
+        """
+        counts = {}
+        bytes_scanned = 0
+        for entry in logs:
+            if os.path.isfile(entry):
+                report = THREAT_SCANNER.scan_file(entry)
+            else:
+                report = THREAT_SCANNER.scan_text(entry)
+            bytes_scanned += report["bytes_scanned"]
+            for rule, count in report["counts"].items():
+                counts[rule] = counts.get(rule, 0) + count
+
+        found = ", ".join(f"{rule}: {count}" for rule, count in counts.items() if count)
+        summary = f"🚨 Threat analysis complete. {len(logs)} logs scanned ({bytes_scanned} bytes)."
+        return f"{summary} Threats found: {found}." if found else f"{summary} No critical threats detected."
 
     @staticmethod
+    @_timed_tool
+    def scan_log_file(path):
+        """
+        Scans a single log file and returns the full report.
+
+        Args:
+            path (str): Path to the log file.
+
+        Returns:
+            dict: Bytes scanned plus match counts and offsets per rule.
+        """
+        return THREAT_SCANNER.scan_file(path)
+
+    @staticmethod
+    @_timed_tool
     def fetch_medical_info(condition):
         """Fetches medical information from PubMed."""
         url = f"https://pubmed.ncbi.nlm.nih.gov/?term={condition.replace(' ', '+')}"
         return f"🔍 Search PubMed for {condition}: {url}"
 
     @staticmethod
+    @_timed_tool
     def recommend_treatment(condition):
-        """Provides basic treatment recommendations."""
-        treatments = {
-            "headache": "💊 Recommended: Ibuprofen or Acetaminophen.",
-            "fever": "🌡️ Recommended: Rest, hydration, and Paracetamol.",
-            "diabetes": "🍏 Recommended: Insulin therapy & lifestyle changes."
-        }
-        for key, value in treatments.items():
-            if key in condition.lower():
-                return value
-        
+        """Provides basic treatment recommendations from the `treatments` routing table."""
+        treatment = get_router("treatments").match(condition)
+        if treatment:
+            return treatment
+
         return f"⚠️ No specific treatment found for '{condition}'. Consult a doctor."
@@ -0,0 +1,498 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import argparse
+import json
+import time
+import numpy as np
+from agents.base_agent import BaseAgent
+from core.agentic_supernet import AgenticSupernet, MAX_COMPLEXITY, REWARD_SCALE, SUCCESS_TARGET
+from utils.task_traces import TRACE_DIR, read_traces
+
+PRIOR_STRENGTH = 2.0  # Pseudo-observations pulling a (complexity, agent) success estimate toward the agent's overall rate
+CHUNK_SIZE = 1_000    # Tasks routed between two updates of a learning policy
+REPLAY_RESULTS_FILE = "experiments/results/replay_results.json"
+
+
+class ReplayAgent(BaseAgent):
+    """ Stand-in for an agent seen in the traces: carries its name, capability and cost, never executes. """
+
+    def execute(self, task):
+        raise RuntimeError("Replay agents only exist to be routed; outcomes come from the traces.")
+
+
+class TraceSet:
+    """
+    Recorded tasks as dense arrays: one row per task, one column per agent.
+
+    Cells of agents that did not run on a task are unobserved (`observed` is
+    False); the replay fills them with counterfactual estimates.
+    """
+
+    def __init__(self, agent_names, capability, cost, complexity, observed, success, latency):
+        """
+        Args:
+            agent_names (list): Agent of each column.
+            capability (np.ndarray): Capability per agent.
+            cost (np.ndarray): Cost per execution per agent.
+            complexity (np.ndarray): Complexity per task.
+            observed (np.ndarray): (tasks, agents) bool, whether the agent ran on the task.
+            success (np.ndarray): (tasks, agents) bool outcome (False where unobserved).
+            latency (np.ndarray): (tasks, agents) latency in ms (NaN where unobserved).
+        """
+        self.agent_names = list(agent_names)
+        self.capability = np.asarray(capability, dtype=np.float64)
+        self.cost = np.asarray(cost, dtype=np.float64)
+        self.complexity = np.asarray(complexity, dtype=np.intp)
+        self.observed = observed
+        self.success = success
+        self.latency = latency
+
+    def __len__(self):
+        return len(self.complexity)
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        Builds the arrays from trace records (see `utils.task_traces`).
+
+        Args:
+            records (iterable): Trace records.
+
+        Returns:
+            TraceSet: The traces.
+        """
+        agent_index, capability, cost = {}, [], []
+        complexity, rows, cols, outcomes, latencies = [], [], [], [], []
+        for row, record in enumerate(records):
+            complexity.append(record["complexity"])
+            for attempt in record["attempts"]:
+                name = attempt["agent"]
+                if name not in agent_index:
+                    agent_index[name] = len(agent_index)
+                    capability.append(attempt.get("capability", 1))
+                    cost.append(attempt.get("cost", 1))
+                rows.append(row)
+                cols.append(agent_index[name])
+                outcomes.append(bool(attempt["success"]))
+                latencies.append(attempt.get("latency_ms", np.nan))
+
+        shape = (len(complexity), len(agent_index))
+        observed = np.zeros(shape, dtype=bool)
+        success = np.zeros(shape, dtype=bool)
+        latency = np.full(shape, np.nan, dtype=np.float32)
+        observed[rows, cols] = True
+        success[rows, cols] = outcomes
+        latency[rows, cols] = latencies
+        return cls(list(agent_index), capability, cost, complexity, observed, success, latency)
+
+    @classmethod
+    def synthetic(cls, num_tasks, agents, seed=0, observe_fraction=0.5):
+        """
+        Generates traces for synthetic agents, fully vectorized. An agent succeeds
+        at its `success_rate` on tasks within its capability, and proportionally
+        less above it; each agent is observed on about `observe_fraction` of tasks.
+
+        Args:
+            num_tasks (int): Tasks to generate.
+            agents (list): Agents with `success_rate` and `latency` attributes (see `benchmarks.synthetic`).
+            seed (int): RNG seed.
+            observe_fraction (float): Probability that an agent's outcome on a task is recorded.
+
+        Returns:
+            TraceSet: The traces.
+        """
+        rng = np.random.default_rng(seed)
+        capability = np.array([agent.capability for agent in agents], dtype=np.float64)
+        rate = np.array([agent.success_rate for agent in agents])
+        complexity = rng.integers(1, MAX_COMPLEXITY + 1, size=num_tasks)
+        probability = rate * np.minimum(capability / complexity[:, None], 1.0)
+
+        observed = rng.random((num_tasks, len(agents))) < observe_fraction
+        observed[np.arange(num_tasks), rng.integers(len(agents), size=num_tasks)] = True  # At least one agent ran
+        success = (rng.random(observed.shape) < probability) & observed
+        mean_latency = np.array([max(getattr(agent, "latency", 0.0), 1e-3) * 1e3 for agent in agents])
+        latency = (mean_latency * rng.lognormal(0.0, 0.5, observed.shape)).astype(np.float32)
+        latency[~observed] = np.nan
+        return cls([agent.name for agent in agents], capability, [agent.cost for agent in agents],
+                   complexity, observed, success, latency)
+
+    def save(self, path):
+        """ Saves the arrays to an `.npz` file, which loads far faster than re-parsing JSON lines. """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez(path, agent_names=np.array(self.agent_names), capability=self.capability, cost=self.cost,
+                 complexity=self.complexity, observed=self.observed, success=self.success, latency=self.latency)
+
+    @classmethod
+    def load(cls, path):
+        """ Loads arrays saved by `save`. """
+        with np.load(path) as data:
+            return cls([str(name) for name in data["agent_names"]], data["capability"], data["cost"],
+                       data["complexity"], data["observed"], data["success"], data["latency"])
+
+    def agents(self):
+        """
+        Returns:
+            list: A `ReplayAgent` per column, for policies that need agent objects.
+        """
+        return [ReplayAgent(name, capability, cost)
+                for name, capability, cost in zip(self.agent_names, self.capability, self.cost)]
+
+
+class OutcomeModel:
+    """
+    Counterfactual model of agents that did not run: success probability and mean
+    latency per (complexity, agent), estimated from the observed cells.
+
+    Success rates are Beta posteriors centred on the agent's overall rate, so a
+    sparsely observed complexity borrows strength from the agent's other tasks.
+    """
+
+    def __init__(self, traces, prior_strength=PRIOR_STRENGTH):
+        """
+        Args:
+            traces (TraceSet): Traces to fit on.
+            prior_strength (float): Pseudo-observations of the per-agent prior.
+        """
+        buckets = np.clip(traces.complexity, 0, MAX_COMPLEXITY)
+        num_agents = len(traces.agent_names)
+        trials = np.zeros((MAX_COMPLEXITY + 1, num_agents))
+        successes = np.zeros((MAX_COMPLEXITY + 1, num_agents))
+        latency_sum = np.zeros((MAX_COMPLEXITY + 1, num_agents))
+        latency_counts = np.zeros((MAX_COMPLEXITY + 1, num_agents))
+        observed_latency = traces.observed & ~np.isnan(traces.latency)
+        for bucket in np.unique(buckets):
+            rows = buckets == bucket
+            trials[bucket] = traces.observed[rows].sum(axis=0)
+            successes[bucket] = traces.success[rows].sum(axis=0)
+            latency_sum[bucket] = np.where(observed_latency[rows], traces.latency[rows], 0.0).sum(axis=0)
+            latency_counts[bucket] = observed_latency[rows].sum(axis=0)
+
+        overall = (successes.sum(axis=0) + 1.0) / (trials.sum(axis=0) + 2.0)
+        self.success_probability = (successes + prior_strength * overall) / (trials + prior_strength)
+        agent_latency = latency_sum.sum(axis=0) / np.maximum(latency_counts.sum(axis=0), 1)
+        self.mean_latency = np.where(latency_counts > 0, latency_sum / np.maximum(latency_counts, 1), agent_latency)
+
+    def realize(self, traces, rng):
+        """
+        Completes the outcome matrices: observed cells keep their recorded outcome,
+        unobserved cells are drawn from the model. Every policy is then evaluated on
+        the same completed matrices (common random numbers), so differences between
+        policies are not drowned in sampling noise.
+
+        Args:
+            traces (TraceSet): The traces.
+            rng (np.random.Generator): Random generator.
+
+        Returns:
+            tuple: ((tasks, agents) bool success, (tasks, agents) float32 latency in ms).
+        """
+        buckets = np.clip(traces.complexity, 0, MAX_COMPLEXITY)
+        drawn = rng.random(traces.observed.shape) < self.success_probability[buckets]
+        success = np.where(traces.observed, traces.success, drawn)
+        latency = np.where(np.isnan(traces.latency), self.mean_latency[buckets], traces.latency).astype(np.float32)
+        return success, latency
+
+
+class SupernetPolicy:
+    """
+    Routes like `AgenticSupernet.sample_architecture`, vectorized over a chunk of
+    tasks: Gumbel-top-k sampling without replacement from the distribution, then
+    the capability and cost filters. With `learn`, the supernet is rewarded after
+    every chunk, as it would have been online.
+    """
+
+    learns = True
+
+    def __init__(self, agents, entropy_weight=0.1, temperature=1.0, num_samples=3, max_samples=3,
+                 learn=True, checkpoint=None):
+        """
+        Args:
+            agents (list): Agents (see `TraceSet.agents`).
+            entropy_weight (float): Weight for entropy regularization.
+            temperature (float): Softmax temperature.
+            num_samples (int or str): Agents sampled per task, or "auto".
+            max_samples (int): Upper bound on the adaptive sample size.
+            learn (bool): Whether outcomes are fed back into the supernet.
+            checkpoint (str): Supernet checkpoint to start from.
+        """
+        self.supernet = AgenticSupernet(agents, entropy_weight, temperature, num_samples, max_samples)
+        if checkpoint:
+            self.supernet.load_checkpoint(checkpoint)
+        self.capability = np.array([agent.capability for agent in agents], dtype=np.float64)
+        self.cost = np.array([agent.cost for agent in agents], dtype=np.float64)
+        self.learns = learn
+
+    def choose(self, complexity, success, rng):
+        """
+        Picks the agents to run on each task, in order.
+
+        Args:
+            complexity (np.ndarray): Complexity per task.
+            success (np.ndarray): Realized outcomes (unused; only an oracle may look).
+            rng (np.random.Generator): Random generator.
+
+        Returns:
+            np.ndarray: (tasks, k) agent indices, padded with -1.
+        """
+        supernet = self.supernet
+        num_tasks, num_agents = len(complexity), len(supernet.agents)
+        adaptive = supernet.num_samples == "auto"
+        width = min(int(supernet.max_samples if adaptive else supernet.num_samples), num_agents)
+
+        keys = np.log(supernet.architecture_distribution) + rng.gumbel(size=(num_tasks, num_agents))
+        order = np.argsort(-keys, axis=1)[:, :width]
+        if adaptive:
+            # `AgenticSupernet.adaptive_sample_count` for every task at once: the shortest
+            # prefix of the drawn agents whose chance of at least one success is high enough
+            estimates = np.array([supernet.success_estimates(bucket) for bucket in range(MAX_COMPLEXITY + 1)])
+            drawn = estimates[np.clip(complexity, 0, MAX_COMPLEXITY)[:, None], order]
+            reliable = 1.0 - np.cumprod(1.0 - drawn, axis=1) >= SUCCESS_TARGET
+            counts = np.where(reliable.any(axis=1), reliable.argmax(axis=1) + 1, max(width, 1))
+        else:
+            counts = np.full(num_tasks, width)
+        keep = np.arange(width) < counts[:, None]
+        keep &= self.capability[order] >= complexity[:, None] * rng.uniform(0.5, 1.5, size=order.shape)
+        keep &= ~((complexity <= 3)[:, None] & (self.cost[order] >= 5))
+
+        fallback = ~keep.any(axis=1)
+        order[fallback, 0] = rng.integers(num_agents, size=int(fallback.sum()))
+        keep[fallback, 0] = True
+        return _compact(order, keep)
+
+    def learn(self, complexity, order, attempted, success):
+        """
+        Rewards the agents that ran, like `AgenticSupernet.reward` does for each of them.
+
+        Args:
+            complexity (np.ndarray): Complexity per task.
+            order (np.ndarray): Chosen agents per task.
+            attempted (np.ndarray): Which chosen agents actually ran.
+            success (np.ndarray): Outcome of each chosen agent.
+        """
+        if not self.learns:
+            return
+        agents = order[attempted]
+        outcomes = success[attempted]
+        complexities = np.broadcast_to(complexity[:, None], order.shape)[attempted]
+        self.supernet.record_outcomes(agents, complexities, outcomes)
+        self.supernet.update_batch(agents, np.where(outcomes, REWARD_SCALE, -REWARD_SCALE))
+
+
+class CascadePolicy:
+    """ Tries the cheapest capable agents first, escalating up to `max_attempts` times. """
+
+    learns = False
+
+    def __init__(self, agents, max_attempts=3):
+        self.capability = np.array([agent.capability for agent in agents], dtype=np.float64)
+        self.by_cost = np.argsort([agent.cost for agent in agents], kind="stable")
+        self.max_attempts = min(int(max_attempts), len(agents))
+
+    def choose(self, complexity, success, rng):
+        order = np.tile(self.by_cost, (len(complexity), 1))
+        capable = self.capability[order] >= complexity[:, None]
+        capable[~capable.any(axis=1), -1] = True  # Nobody capable: go straight to the most expensive agent
+        return _compact(order, capable)[:, :self.max_attempts]
+
+    def learn(self, complexity, order, attempted, success):
+        pass
+
+
+class FixedPolicy:
+    """ Always runs the same agent. """
+
+    learns = False
+
+    def __init__(self, agents, agent):
+        names = [a.name for a in agents]
+        if agent not in names:
+            raise ValueError(f"Unknown agent '{agent}'; traces contain: {', '.join(names)}")
+        self.index = names.index(agent)
+
+    def choose(self, complexity, success, rng):
+        return np.full((len(complexity), 1), self.index)
+
+    def learn(self, complexity, order, attempted, success):
+        pass
+
+
+class OraclePolicy:
+    """ Runs the cheapest agent that succeeds (by the completed outcomes): a bound no real policy reaches. """
+
+    learns = False
+
+    def __init__(self, agents):
+        self.cost = np.array([agent.cost for agent in agents], dtype=np.float64)
+
+    def choose(self, complexity, success, rng):
+        cost = np.where(success, self.cost, np.inf)
+        best = np.argmin(cost, axis=1)
+        best[~success.any(axis=1)] = np.argmin(self.cost)
+        return best[:, None]
+
+    def learn(self, complexity, order, attempted, success):
+        pass
+
+
+POLICIES = {
+    "supernet": SupernetPolicy,
+    "uniform": lambda agents, **kwargs: SupernetPolicy(agents, learn=False, **kwargs),
+    "cascade": CascadePolicy,
+    "fixed": FixedPolicy,
+    "oracle": OraclePolicy,
+}
+
+
+def _compact(order, keep):
+    """ Moves kept entries to the front of each row (stable) and pads the rest with -1. """
+    position = np.argsort(~keep, axis=1, kind="stable")
+    order = np.take_along_axis(order, position, axis=1)
+    keep = np.take_along_axis(keep, position, axis=1)
+    order[~keep] = -1
+    return order
+
+
+def simulate(traces, policy, success, latency, seed=0, chunk_size=CHUNK_SIZE):
+    """
+    Replays the traces through a routing policy. Agents run in the chosen order
+    until one succeeds, as in `Controller.execute_task`.
+
+    Args:
+        traces (TraceSet): The traces.
+        policy: A policy (see `POLICIES`).
+        success (np.ndarray): Completed outcomes from `OutcomeModel.realize`.
+        latency (np.ndarray): Completed latencies from `OutcomeModel.realize`.
+        seed (int): Seed for the policy's own randomness.
+        chunk_size (int): Tasks between two updates of a learning policy.
+
+    Returns:
+        dict: {"tasks", "success_rate", "attempts_per_task", "cost_per_task", "latency_ms"
+            {"mean", "p50", "p95", "p99"}, "counterfactual_share", "seconds"}.
+    """
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+    num_tasks = len(traces)
+    chunk_size = chunk_size if policy.learns else max(num_tasks, 1)
+    solved = np.zeros(num_tasks, dtype=bool)
+    attempts = np.zeros(num_tasks, dtype=np.int64)
+    cost = np.zeros(num_tasks)
+    task_latency = np.zeros(num_tasks)
+    counterfactual = 0
+
+    for begin in range(0, num_tasks, chunk_size):
+        rows = slice(begin, begin + chunk_size)
+        complexity = traces.complexity[rows]
+        order = policy.choose(complexity, success[rows], rng)
+        valid = order >= 0
+        agents = np.where(valid, order, 0)
+        row_index = np.arange(len(complexity))[:, None]
+
+        outcome = success[rows][row_index, agents] & valid
+        first = np.argmax(outcome, axis=1)
+        solved[rows] = outcome.any(axis=1)
+        attempts[rows] = np.where(solved[rows], first + 1, valid.sum(axis=1))
+        attempted = (np.arange(order.shape[1]) < attempts[rows][:, None]) & valid
+
+        cost[rows] = np.where(attempted, traces.cost[agents], 0.0).sum(axis=1)
+        task_latency[rows] = np.where(attempted, latency[rows][row_index, agents], 0.0).sum(axis=1)
+        counterfactual += int((attempted & ~traces.observed[rows][row_index, agents]).sum())
+        policy.learn(complexity, order, attempted, outcome)
+
+    p50, p95, p99 = np.percentile(task_latency, [50, 95, 99]) if num_tasks else (0.0, 0.0, 0.0)
+    total_attempts = int(attempts.sum())
+    return {
+        "tasks": num_tasks,
+        "success_rate": float(solved.mean()) if num_tasks else 0.0,
+        "attempts_per_task": total_attempts / num_tasks if num_tasks else 0.0,
+        "cost_per_task": float(cost.mean()) if num_tasks else 0.0,
+        "latency_ms": {"mean": float(task_latency.mean()) if num_tasks else 0.0,
+                       "p50": float(p50), "p95": float(p95), "p99": float(p99)},
+        "counterfactual_share": counterfactual / total_attempts if total_attempts else 0.0,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def parse_policy(spec, agents):
+    """
+    Builds a policy from a spec such as "supernet", "supernet:entropy_weight=0.3,num_samples=auto",
+    "cascade:max_attempts=2" or "fixed:agent=ExpertAgent".
+
+    Args:
+        spec (str): Policy name, optionally followed by ":key=value,...".
+        agents (list): Agents from the traces.
+
+    Returns:
+        tuple: (spec, policy).
+    """
+    name, _, options = spec.partition(":")
+    if name not in POLICIES:
+        raise ValueError(f"Unknown policy '{name}'; choose from: {', '.join(POLICIES)}")
+    kwargs = {}
+    for option in filter(None, options.split(",")):
+        key, _, value = option.partition("=")
+        for convert in (int, float):
+            try:
+                value = convert(value)
+                break
+            except ValueError:
+                continue
+        if value in ("true", "false"):
+            value = value == "true"
+        kwargs[key.strip()] = value
+    return spec, POLICIES[name](agents, **kwargs)
+
+
+def main():
+    """Loads traces (or generates synthetic ones), replays them through each policy and prints a comparison."""
+    parser = argparse.ArgumentParser(description="Compare routing policies offline by replaying recorded task traces")
+    parser.add_argument("traces", nargs="*", default=[], help=f"Trace files or directories (default: {TRACE_DIR}), or a saved .npz")
+    parser.add_argument("--policy", action="append", dest="policies",
+                        help=f"Policy spec, repeatable: one of {', '.join(POLICIES)}, optionally with ':key=value,...'")
+    parser.add_argument("--synthetic", type=int, metavar="TASKS", help="Replay generated traces of this many tasks instead")
+    parser.add_argument("--synthetic-agents", type=int, default=10, help="Agents in generated traces")
+    parser.add_argument("--save", metavar="FILE", help="Save the loaded traces as .npz for faster reloads")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for counterfactual draws and policies")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Tasks between updates of learning policies")
+    parser.add_argument("--output", default=REPLAY_RESULTS_FILE, help="Where the comparison is written as JSON")
+    args = parser.parse_args()
+
+    load_start = time.perf_counter()
+    if args.synthetic:
+        from benchmarks.synthetic import make_agents
+        traces = TraceSet.synthetic(args.synthetic, make_agents(args.synthetic_agents, args.seed), args.seed)
+    elif len(args.traces) == 1 and args.traces[0].endswith(".npz"):
+        traces = TraceSet.load(args.traces[0])
+    else:
+        traces = TraceSet.from_records(read_traces(*args.traces, source="controller"))
+    if not len(traces):
+        print("⚠ No traces found.")
+        return
+    if args.save:
+        traces.save(args.save)
+    print(f"📂 {len(traces):,} tasks, {len(traces.agent_names)} agents, "
+          f"{traces.observed.mean():.0%} of outcomes observed (loaded in {time.perf_counter() - load_start:.2f} s)")
+
+    success, latency = OutcomeModel(traces).realize(traces, np.random.default_rng(args.seed))
+    agents = traces.agents()
+    results = {}
+    print(f"\n   {'policy':<40} {'success':>8} {'attempts':>9} {'cost':>8} {'p50 ms':>9} {'p95 ms':>9} {'estimated':>10} {'time s':>7}")
+    for spec in args.policies or ["supernet", "uniform", "cascade", "oracle"]:
+        try:
+            spec, policy = parse_policy(spec, agents)
+        except (ValueError, TypeError) as e:
+            parser.error(str(e))
+        result = simulate(traces, policy, success, latency, seed=args.seed, chunk_size=args.chunk_size)
+        results[spec] = result
+        print(f"   {spec:<40} {result['success_rate']:8.3f} {result['attempts_per_task']:9.2f} "
+              f"{result['cost_per_task']:8.2f} {result['latency_ms']['p50']:9.1f} {result['latency_ms']['p95']:9.1f} "
+              f"{result['counterfactual_share']:10.0%} {result['seconds']:7.2f}")
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as file:
+        json.dump({"tasks": len(traces), "agents": traces.agent_names, "seed": args.seed, "policies": results}, file, indent=2)
+    print(f"\n💾 Comparison saved to `{args.output}` ('estimated' = share of attempts whose outcome came from the model)")
+
+
+if __name__ == "__main__":
+    main()
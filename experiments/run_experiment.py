@@ -14,6 +14,7 @@ from utils.visualization import plot_task_success_rates, plot_agent_selection_co
 from utils.logger import log_event
 
 EXPERIMENT_RESULTS_FILE = "experiments/results/experiment_results.json"
+EXPERIMENT_TASKS = {"Simple Arithmetic": 1, "Web Navigation": 5, "Advanced Code Generation": 10}
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
@@ -32,12 +33,12 @@ def run_experiment(num_runs=10):
     metrics_tracker = MetricsTracker()
     agents = [BasicAgent(), MidAgent(), ExpertAgent()]
     supernet = AgenticSupernet(agents)
-    controller = Controller(supernet)
+    controller = Controller(supernet, metrics_tracker)
 
     print("📌 Registering tasks...")
-    task_manager.register_task("Simple Arithmetic", complexity=1)
-    task_manager.register_task("Web Navigation", complexity=5)
-    task_manager.register_task("Advanced Code Generation", complexity=10)
+    for name, complexity in EXPERIMENT_TASKS.items():
+        if not task_manager.get_task(name):  # Tasks persist in tasks.json, so they already exist on later runs
+            task_manager.register_task(name, complexity=complexity)
 
     results = {"tasks": {}, "agents": {}}
 
@@ -47,12 +48,7 @@ def run_experiment(num_runs=10):
         print(f"▶ Iteration {i+1}/{num_runs}...")
         tasks = task_manager.list_tasks()
         for task in tasks:
-            task_name = task["name"]
-            success = controller.execute_task(task)
-            
-            metrics_tracker.update_task_metrics(task_name, success)
-            for agent in agents:
-                metrics_tracker.update_agent_metrics(agent.name)
+            controller.execute_task(task)
 
     for task in task_manager.list_tasks():
         results["tasks"][task["name"]] = {
@@ -62,6 +58,7 @@ def run_experiment(num_runs=10):
     for agent in agents:
         results["agents"][agent.name] = metrics_tracker.get_agent_selection_count(agent.name)
 
+    metrics_tracker.flush()
     with open(EXPERIMENT_RESULTS_FILE, "w") as file:
         json.dump(results, file, indent=4)
 
@@ -69,8 +66,21 @@ def run_experiment(num_runs=10):
     log_event(f"Experiment completed. Results saved to {EXPERIMENT_RESULTS_FILE}")
 
     print("📊 Generating visualizations...")
-    plot_task_success_rates()
-    plot_agent_selection_counts()
+    plot_task_success_rates(metrics_tracker, output_path="experiments/results/task_success_rates.png")
+    plot_agent_selection_counts(metrics_tracker, output_path="experiments/results/agent_selection_counts.png")
+    print("🖼 Plots saved to `experiments/results/`")
 
 if __name__ == "__main__":
-    run_experiment(num_runs=20)
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the supernet experiment")
+    parser.add_argument("--runs", type=int, default=20, help="Experiment iterations")
+    parser.add_argument("--profile", action="store_true", help="Run under cProfile and tracemalloc and print a per-subsystem report")
+    args = parser.parse_args()
+
+    if args.profile:
+        from utils.profiling import Profiler
+        with Profiler("experiment", output_dir="experiments/results/profile"):
+            run_experiment(num_runs=args.runs)
+    else:
+        run_experiment(num_runs=args.runs)
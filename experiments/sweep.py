@@ -0,0 +1,248 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import argparse
+import contextlib
+import itertools
+import json
+import math
+import multiprocessing
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+SWEEP_DIR = "experiments/results/sweep"
+# Sampling policies compared by a sweep, as overrides of the supernet settings
+POLICIES = {
+    "supernet": {},                                          # Learned distribution, as configured
+    # Never learns, so the distribution stays at 1/n: a random-agent baseline (entropy and temperature are moot)
+    "uniform": {"learn": False, "entropy_weight": 0.0, "temperature": 1.0},
+    "greedy": {"entropy_weight": 0.0, "temperature": 0.1},   # Almost always exploits the best agent so far
+}
+METRICS = ("success_rate", "agents_per_task", "cost_per_task", "seconds")
+# Two-sided 95% Student t critical values by degrees of freedom; the normal value is used beyond the table
+T_CRITICAL_95 = {1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365, 8: 2.306, 9: 2.262,
+                 10: 2.228, 12: 2.179, 15: 2.131, 20: 2.086, 25: 2.060, 30: 2.042, 40: 2.021, 60: 2.000, 120: 1.980}
+
+
+def confidence_interval(values):
+    """
+    Computes the mean and the half-width of its 95% confidence interval.
+
+    Args:
+        values (list): Observations, one per seed.
+
+    Returns:
+        tuple: (mean, half-width); the half-width is 0.0 for fewer than two values.
+    """
+    n = len(values)
+    mean = sum(values) / n if n else 0.0
+    if n < 2:
+        return mean, 0.0
+    std = math.sqrt(sum((value - mean) ** 2 for value in values) / (n - 1))
+    df = n - 1
+    # Rounding df down to the nearest tabulated value keeps the interval conservative
+    t = T_CRITICAL_95[max(d for d in T_CRITICAL_95 if d <= df)] if df <= 120 else 1.960
+    return mean, t * std / math.sqrt(n)
+
+
+def _init_worker(root):
+    """ Worker processes run from the repository root, without logging or console output. """
+    from utils.logger import configure_logging
+
+    os.chdir(root)
+    configure_logging(enabled=False, console=False)
+
+
+def run_trial(trial):
+    """
+    Runs one experiment (one configuration and seed) in its own state directory,
+    so `memory.json`, `tasks.json` and metrics never collide with other trials.
+
+    Args:
+        trial (dict): {"id", "seed", "policy", "entropy_weight", "num_samples", "temperature", "learn",
+            "max_samples", "runs", "synthetic_agents", "agent_latency", "state_dir"}.
+
+    Returns:
+        dict: The trial with its measured "success_rate", "agents_per_task", "cost_per_task",
+            "seconds" and final "distribution".
+    """
+    import random
+    import numpy as np
+    from core.agentic_supernet import AgenticSupernet
+    from core.controller import Controller
+    from utils.metrics import MetricsTracker, set_metrics_tracker
+
+    random.seed(trial["seed"])
+    np.random.seed(trial["seed"])
+    root = os.getcwd()
+    os.makedirs(trial["state_dir"], exist_ok=True)
+    os.chdir(trial["state_dir"])
+    try:
+        if trial["synthetic_agents"]:
+            from benchmarks.synthetic import make_agents
+            agents = make_agents(trial["synthetic_agents"], trial["seed"], trial["agent_latency"])
+        else:
+            from agents.basic_agent import BasicAgent
+            from agents.mid_agent import MidAgent
+            from agents.expert_agent import ExpertAgent
+            agents = [BasicAgent(), MidAgent(), ExpertAgent()]
+        from experiments.run_experiment import EXPERIMENT_TASKS
+        tasks = [{"name": name, "complexity": complexity} for name, complexity in EXPERIMENT_TASKS.items()]
+
+        settings = {key: trial[key] for key in ("entropy_weight", "temperature", "num_samples", "max_samples", "learn")}
+        metrics_tracker = MetricsTracker(path=None)
+        set_metrics_tracker(metrics_tracker)
+        supernet = AgenticSupernet(agents, **settings)
+        controller = Controller(supernet, metrics_tracker)
+
+        start = time.perf_counter()
+        successes = 0
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            for _ in range(trial["runs"]):
+                for task in tasks:
+                    successes += controller.execute_task(task)
+        seconds = time.perf_counter() - start
+    finally:
+        os.chdir(root)
+
+    executed = trial["runs"] * len(tasks)
+    sampled = sum(metrics_tracker.metrics["tasks"][task["name"]].get("agents_sampled", 0) for task in tasks)
+    return dict(
+        trial,
+        success_rate=successes / executed,
+        agents_per_task=sampled / executed,
+        cost_per_task=sum(metrics_tracker.latency.costs.values()) / executed,
+        seconds=seconds,
+        distribution={agent.name: float(p) for agent, p in zip(agents, supernet.get_distribution())},
+    )
+
+
+def make_trials(args, state_root):
+    """
+    Expands the sweep grid into one trial per configuration and seed. Policy
+    overrides are applied here, so grid points a policy makes identical (e.g.
+    entropy weights under "uniform") run only once.
+
+    Returns:
+        list: Trial dicts for `run_trial`.
+    """
+    grid = itertools.product(args.policies, args.entropy_weights, args.num_samples, range(args.seeds))
+    trials = []
+    seen = set()
+    for policy, entropy_weight, num_samples, seed_offset in grid:
+        settings = {"entropy_weight": entropy_weight, "temperature": args.temperature,
+                    "num_samples": num_samples, "max_samples": args.max_samples, "learn": True}
+        settings.update(POLICIES[policy])
+        key = (policy, seed_offset) + tuple(settings.values())
+        if key in seen:
+            continue
+        seen.add(key)
+        trials.append(dict(
+            settings,
+            id=len(trials),
+            seed=args.seed + seed_offset,
+            policy=policy,
+            runs=args.runs,
+            synthetic_agents=args.synthetic_agents,
+            agent_latency=args.agent_latency_ms / 1e3,
+            state_dir=os.path.join(state_root, f"trial-{len(trials):05d}"),
+        ))
+    return trials
+
+
+def aggregate(results):
+    """
+    Groups trial results by configuration and summarizes every metric across seeds.
+
+    Args:
+        results (list): Results of `run_trial`.
+
+    Returns:
+        list: {"policy", "entropy_weight", "temperature", "num_samples", "seeds", metric: {"mean", "ci95"}} per
+            configuration, best success rate first.
+    """
+    groups = {}
+    for result in results:
+        key = (result["policy"], result["entropy_weight"], result["temperature"], result["num_samples"])
+        groups.setdefault(key, []).append(result)
+    summary = []
+    for (policy, entropy_weight, temperature, num_samples), group in groups.items():
+        entry = {"policy": policy, "entropy_weight": entropy_weight, "temperature": temperature,
+                 "num_samples": num_samples, "seeds": len(group)}
+        for metric in METRICS:
+            mean, half_width = confidence_interval([result[metric] for result in group])
+            entry[metric] = {"mean": mean, "ci95": half_width}
+        summary.append(entry)
+    summary.sort(key=lambda entry: (-entry["success_rate"]["mean"], entry["cost_per_task"]["mean"]))
+    return summary
+
+
+def _num_samples(value):
+    return value if value == "auto" else int(value)
+
+
+def _csv(convert):
+    return lambda text: [convert(item) for item in text.split(",") if item]
+
+
+def main():
+    """Runs the sweep across a process pool and writes per-trial results and aggregated statistics."""
+    parser = argparse.ArgumentParser(description="Run seeds x configurations of the supernet experiment in parallel")
+    parser.add_argument("--policies", type=_csv(str), default=["supernet"], help=f"Comma-separated subset of: {', '.join(POLICIES)}")
+    parser.add_argument("--entropy-weights", type=_csv(float), default=[0.1], help="Comma-separated entropy weights")
+    parser.add_argument("--num-samples", type=_csv(_num_samples), default=["auto"], help="Comma-separated sample counts (integers or 'auto')")
+    parser.add_argument("--temperature", type=float, default=1.0, help="Softmax temperature")
+    parser.add_argument("--max-samples", type=int, default=3, help="Upper bound for 'auto' sample counts")
+    parser.add_argument("--seeds", type=int, default=10, help="Independent seeds per configuration")
+    parser.add_argument("--seed", type=int, default=0, help="First seed")
+    parser.add_argument("--runs", type=int, default=20, help="Experiment iterations per trial")
+    parser.add_argument("--synthetic-agents", type=int, default=0,
+                        help="Use this many seeded synthetic agents with varied success rates instead of the built-in agents")
+    parser.add_argument("--agent-latency-ms", type=float, default=0.0, help="Mean synthetic agent latency")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--output-dir", default=SWEEP_DIR, help="Where results are written")
+    parser.add_argument("--keep-state", action="store_true", help="Keep each trial's state directory for inspection")
+    args = parser.parse_args()
+
+    unknown = [policy for policy in args.policies if policy not in POLICIES]
+    if unknown:
+        parser.error(f"Unknown policies: {', '.join(unknown)}")
+
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    output_dir = os.path.abspath(args.output_dir)
+    state_root = os.path.join(output_dir, "state")
+    trials = make_trials(args, state_root)
+    workers = min(args.workers or os.cpu_count() or 1, len(trials))
+    print(f"🚀 Running {len(trials)} trials on {workers} worker(s)...")
+
+    start = time.perf_counter()
+    results = []
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=_init_worker, initargs=(root,)) as pool:
+        futures = [pool.submit(run_trial, trial) for trial in trials]
+        for done, future in enumerate(as_completed(futures), 1):
+            results.append(future.result())
+            if done % max(len(trials) // 10, 1) == 0 or done == len(trials):
+                print(f"▶ {done}/{len(trials)} trials done")
+    results.sort(key=lambda result: result["id"])
+    summary = aggregate(results)
+    if not args.keep_state:
+        shutil.rmtree(state_root, ignore_errors=True)
+
+    os.makedirs(output_dir, exist_ok=True)
+    results_path = os.path.join(output_dir, "sweep_results.json")
+    with open(results_path, "w") as file:
+        json.dump({"args": vars(args), "summary": summary, "trials": results}, file, indent=2)
+
+    print(f"\n📊 {len(summary)} configuration(s), mean ± 95% CI over seeds:")
+    print(f"   {'policy':<9} {'entropy':>7} {'samples':>7} {'success rate':>17} {'agents/task':>15} {'cost/task':>15}")
+    for entry in summary:
+        print(f"   {entry['policy']:<9} {entry['entropy_weight']:7.2f} {str(entry['num_samples']):>7} "
+              + " ".join(f"{entry[metric]['mean']:8.3f} ± {entry[metric]['ci95']:.3f}".rjust(width)
+                         for metric, width in (("success_rate", 17), ("agents_per_task", 15), ("cost_per_task", 15))))
+    print(f"\n✅ Sweep finished in {time.perf_counter() - start:.1f} s. Results saved to `{results_path}`")
+
+
+if __name__ == "__main__":
+    main()
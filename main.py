@@ -1,23 +1,17 @@
 import sys
 import os
 import argparse
-import yaml
+import time
+from functools import cached_property
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from core.agent_loader import load_agents  # Dynamically loads all agents
-from core.agentic_supernet import AgenticSupernet
-from core.controller import Controller
-from core.task_manager import TaskManager
-from core.memory import AgentMemory
-from core.knowledge_graph import KnowledgeGraph
-from core.debate import DebateManager
-from core.collaboration import AgentTeam
-from utils.metrics import MetricsTracker
-from utils.visualization import plot_task_success_rates, plot_agent_selection_counts
-from utils.logger import log_event
+# Only lightweight modules are imported at the top. Each command imports what it
+# needs when it runs, so e.g. `--list` never loads numpy, networkx or matplotlib.
 
 def load_config(config_path="configs/settings.yaml"):
     """Loads configuration from a YAML file."""
+    import yaml
+
     try:
         with open(config_path, "r") as file:
             return yaml.safe_load(file)
@@ -25,166 +19,243 @@ def load_config(config_path="configs/settings.yaml"):
         print(f"⚠ Warning: Config file {config_path} not found. Using default settings.")
         return {}
 
-def run_task(controller, task_name, metrics_tracker):
+class Runtime:
+    """
+    Builds the system's components on first use, so a command only pays for the
+    components it actually touches.
+    """
+
+    def __init__(self, log_overrides=None, tasks_path=None, jobs_path=None):
+        self.log_overrides = log_overrides or {}  # Command-line logging settings, applied over the config file
+        self.tasks_path = tasks_path
+        self.jobs_path = jobs_path
+        if self.log_overrides:
+            # Applied now as well, for commands that log without ever loading the config
+            from utils.logger import configure_logging
+            configure_logging(**self.log_overrides)
+
+    @cached_property
+    def config(self):
+        from utils.logger import configure_logging
+
+        config = load_config() or {}
+        configure_logging(**{**config.get("logging", {}), **self.log_overrides})
+        traces = config.get("traces") or {}
+        if traces.get("enabled"):
+            from utils.task_traces import start_trace_capture
+            start_trace_capture(**{key: value for key, value in traces.items() if key != "enabled"})
+        return config
+
+    @cached_property
+    def task_manager(self):
+        from core.task_manager import TaskManager, TASKS_FILE
+        return TaskManager(self.tasks_path or TASKS_FILE)
+
+    @cached_property
+    def job_queue(self):
+        from core.job_queue import JobQueue, JOBS_FILE
+        settings = dict(self.config.get("queue") or {})
+        settings.pop("batch_size", None)  # A worker setting
+        path = settings.pop("path", JOBS_FILE)
+        return JobQueue(self.jobs_path or path, self.task_manager, **settings)
+
+    @cached_property
+    def metrics_tracker(self):
+        from utils.metrics import get_metrics_tracker
+        return get_metrics_tracker()
+
+    @cached_property
+    def memory(self):
+        from core.memory import AgentMemory
+        return AgentMemory()
+
+    @cached_property
+    def knowledge_graph(self):
+        from core.knowledge_graph import KnowledgeGraph
+        return KnowledgeGraph()
+
+    @cached_property
+    def agents(self):
+        from core.agent_loader import load_agents
+        return load_agents()  # Lazy stand-ins; agent modules load when an agent runs
+
+    @cached_property
+    def supernet(self):
+        from core.agentic_supernet import AgenticSupernet
+        return AgenticSupernet.from_config(self.agents, self.config, self.metrics_tracker)
+
+    @cached_property
+    def controller(self):
+        from core.controller import Controller
+        return Controller(self.supernet, self.metrics_tracker)
+
+    @cached_property
+    def debate_manager(self):
+        from core.debate import DebateManager
+        return DebateManager(self.agents)
+
+    @cached_property
+    def team(self):
+        from core.collaboration import AgentTeam
+        return AgentTeam(self.agents)
+
+def run_task(runtime, task_name):
     """Executes a registered task and tracks performance metrics."""
-    task = task_manager.get_task(task_name)
+    from utils.logger import log_event
+
+    task = runtime.task_manager.get_task(task_name)
     if task:
         try:
-            success = controller.execute_task(task)
-            metrics_tracker.update_task_metrics(task_name, success)
-            log_event(f"✅ Task '{task_name}' {'succeeded' if success else 'failed'}.")
-            success_rate = metrics_tracker.get_task_success_rate(task_name)
+            start = time.perf_counter()
+            success = runtime.controller.execute_task(task)
+            log_event(f"✅ Task '{task_name}' {'succeeded' if success else 'failed'}.", task=task_name,
+                      complexity=task["complexity"], outcome="success" if success else "failure",
+                      latency_ms=round((time.perf_counter() - start) * 1e3, 3))
+            success_rate = runtime.metrics_tracker.get_task_success_rate(task_name)
             print(f"📊 Success rate for '{task_name}': {success_rate:.2%}")
+            print(f"🎯 Agents per run for '{task_name}': {runtime.metrics_tracker.get_average_sample_count(task_name):.2f}")
         except Exception as e:
             print(f"❌ Error executing task '{task_name}': {e}")
-            log_event(f"❌ Error executing task '{task_name}': {e}")
+            log_event(f"❌ Error executing task '{task_name}': {e}", echo=False, task=task_name, outcome="error")
     else:
         print(f"⚠ Task '{task_name}' not found. Please register it first.")
 
-if __name__ == "__main__":
-    config = load_config()
-
-    task_manager = TaskManager()
-    metrics_tracker = MetricsTracker()
-    memory = AgentMemory()
-    knowledge_graph = KnowledgeGraph()
-    agents = load_agents()  # Load all agents dynamically
-    supernet = AgenticSupernet(agents, entropy_weight=config.get("entropy_weight", 0.1))
-    controller = Controller(supernet)
-    debate_manager = DebateManager(agents)
-    team = AgentTeam(agents)
-
-    parser = argparse.ArgumentParser(description="Multi-Agent Supernet AI Kit")
-
-    # Task Management
-    parser.add_argument("--register", nargs=2, metavar=("TASK_NAME", "COMPLEXITY"), help="Register a new task")
-    parser.add_argument("--remove", metavar="TASK_NAME", help="Remove a registered task")
-    parser.add_argument("--clear", action="store_true", help="Remove all tasks")
-    parser.add_argument("--list", action="store_true", help="List all registered tasks")
-    parser.add_argument("--run", metavar="TASK_NAME", help="Run a registered task")
-    parser.add_argument("--metrics", action="store_true", help="Show task success rates and agent selection frequencies")
-    parser.add_argument("--delete-agent", metavar="AGENT_NAME", help="Move an agent to the Recycle Bin")
-    parser.add_argument("--restore-agent", metavar="AGENT_NAME", help="Restore a deleted agent from the Recycle Bin")
-
-    # Agent Management
-    parser.add_argument("--list-agents", action="store_true", help="List all available agents")
-    parser.add_argument("--test-agent", metavar="AGENT_NAME", help="Test an agent on a sample task")
-
-    # Memory Management
-    parser.add_argument("--forget", nargs=2, metavar=("AGENT", "TASK"), help="Forget a specific task from memory")
-    parser.add_argument("--clear-memory", metavar="AGENT", nargs="?", help="Clear memory for an agent (or all agents)")
-    parser.add_argument("--query-memory", metavar="AGENT", nargs="?", help="Query an agent's memory")
-
-    # Knowledge Graph
-    parser.add_argument("--add-fact", nargs=3, metavar=("SUBJECT", "RELATION", "OBJECT"), help="Add a fact to the knowledge graph")
-    parser.add_argument("--query-facts", metavar="SUBJECT", help="Retrieve knowledge about a subject")
-    parser.add_argument("--reason", nargs=2, metavar=("START", "END"), help="Find reasoning path between two concepts")
+# Task Management
 
-    # Agent Debate & Collaboration
-    parser.add_argument("--debate", metavar="TASK_NAME", help="Run a debate on a task result")
-    parser.add_argument("--collaborate", metavar="TASK_NAME", help="Execute a task with multiple agents")
-
-    args = parser.parse_args()
-
-    # Task Management
-    if args.register:
-        task_name, complexity = args.register
-        try:
-            task_manager.register_task(task_name, int(complexity))
-            print(f"✅ Task '{task_name}' registered with complexity {complexity}.")
-        except ValueError as e:
-            print(f"⚠ {e}")
-
-    if args.remove:
-        confirmation = input(f"⚠ Are you sure you want to delete task '{args.remove}'? (yes/no): ")
-        if confirmation.lower() == "yes":
-            task_manager.remove_task(args.remove)
-            print(f"🗑 Task '{args.remove}' removed.")
-        else:
-            print("❌ Task removal canceled.")
-
-    if args.clear:
-        confirmation = input("⚠ Are you sure you want to delete ALL tasks? (yes/no): ")
-        if confirmation.lower() == "yes":
-            task_manager.clear_tasks()
-            print("🗑 All tasks have been cleared.")
-        else:
-            print("❌ Task clearing canceled.")
+def cmd_register(args, runtime):
+    task_name, complexity = args.register
+    try:
+        runtime.task_manager.register_task(task_name, int(complexity))
+        print(f"✅ Task '{task_name}' registered with complexity {complexity}.")
+    except ValueError as e:
+        print(f"⚠ {e}")
+
+def cmd_remove(args, runtime):
+    confirmation = input(f"⚠ Are you sure you want to delete task '{args.remove}'? (yes/no): ")
+    if confirmation.lower() == "yes":
+        runtime.task_manager.remove_task(args.remove)
+        print(f"🗑 Task '{args.remove}' removed.")
+    else:
+        print("❌ Task removal canceled.")
 
-    if args.list:
-        tasks = task_manager.list_tasks()
-        print("📋 Registered Tasks:" if tasks else "⚠ No tasks registered.")
+def cmd_import_tasks(args, runtime):
+    try:
+        added = runtime.task_manager.import_tasks(args.import_tasks, skip_existing=args.skip_existing)
+    except (OSError, ValueError) as e:
+        print(f"⚠ Could not import tasks: {e}")
+        return
+    print(f"✅ Imported {added} tasks from '{args.import_tasks}'.")
+
+def cmd_clear(args, runtime):
+    # TaskManager.clear_tasks() asks for its own confirmation
+    runtime.task_manager.clear_tasks()
+
+def _task_filters(args):
+    return {"min_complexity": args.min_complexity, "max_complexity": args.max_complexity, "status": args.status}
+
+def cmd_list(args, runtime):
+    page = {"offset": (args.page - 1) * args.page_size, "limit": args.page_size} if args.page is not None else {}
+    listed = 0
+    for task in runtime.task_manager.iter_tasks(**_task_filters(args), **page):
+        if not listed:
+            print("📋 Registered Tasks:")
+        print(f" - {task['name']} (Complexity: {task['complexity']})")
+        listed += 1
+    if not listed:
+        print("⚠ No tasks registered.")
+    elif args.page:
+        total = runtime.task_manager.count_tasks(**_task_filters(args))
+        print(f"📄 Page {args.page} of {-(-total // args.page_size)} ({total} tasks)")
+
+def cmd_run(args, runtime):
+    run_task(runtime, args.run)
+
+def cmd_run_all(args, runtime):
+    tasks = runtime.task_manager.list_tasks(**_task_filters(args)) * args.repeat
+    if not tasks:
+        print("⚠ No tasks registered.")
+        return
+
+    if args.workers <= 1:
         for task in tasks:
-            print(f" - {task['name']} (Complexity: {task['complexity']})")
-
-    if args.run:
-        run_task(controller, args.run, metrics_tracker)
-
-    if args.metrics:
-        print("📊 Visualizing Task Success Rates & Agent Selection Frequency...")
-        plot_task_success_rates()
-        plot_agent_selection_counts()
-
-    # Agent Management
-    if args.list_agents:
-        print("📋 Available Agents:")
-        for agent in agents:
-            print(f" - {agent.name} (Capability: {agent.capability}, Cost: {agent.cost})")
-
-    if args.test_agent:
-        agent = next((a for a in agents if a.name.lower() == args.test_agent.lower()), None)
-        if agent:
-            sample_task = "Sample Task"
-            result = agent.execute(sample_task)
-            print(f"✅ {agent.name} executed task: {result}")
-        else:
-            print(f"⚠ Agent '{args.test_agent}' not found.")
-
-    # Memory Management
-    if args.forget:
-        agent, task = args.forget
-        memory.forget(agent, task)
-        print(f"🗑 Memory cleared for task '{task}' under agent '{agent}'.")
-
-    if args.clear_memory:
-        agent = args.clear_memory
-        memory.clear_memory(agent)
-        print(f"🔄 Memory cleared for {'all agents' if not agent else f'agent {agent}'}.")
-
-    if args.query_memory:
-        agent = args.query_memory
-        memories = memory.memory.get(agent, {})
-        print(f"📋 Memory for '{agent}': {memories}" if memories else f"⚠ No memory found for '{agent}'.")
-
-    # Knowledge Graph
-    if args.add_fact:
-        subject, relation, obj = args.add_fact
-        knowledge_graph.add_fact(subject, relation, obj)
-        print(f"✅ Fact added: {subject} → ({relation}) → {obj}")
-
-    if args.query_facts:
-        subject = args.query_facts
-        facts = knowledge_graph.get_relations(subject)
-        print(f"📚 Knowledge about '{subject}': {facts}" if facts else f"⚠ No knowledge found for '{subject}'.")
-
-    if args.reason:
-        start, end = args.reason
-        path = knowledge_graph.find_path(start, end)
-        print(f"🧠 Reasoning Path: {' → '.join(path)}" if path else f"⚠ No reasoning path found between '{start}' and '{end}'.")
-
-    # Agent Collaboration & Debate
-    if args.debate:
-        task = args.debate
-        initial_result = controller.execute_task(task)
-        final_result = debate_manager.debate(task, initial_result)
-        print(final_result)
-
-if args.collaborate:
-    task = args.collaborate
-    result = team.execute_task(task)  # ✅ FIXED: Call execute_task() instead
-    print(f"🤝 Collaboration Result: {result}")
+            run_task(runtime, task["name"])
+        return
+
+    from core.parallel import run_parallel
+
+    results, distribution = run_parallel(tasks, num_workers=args.workers, config=runtime.config)
+    succeeded = sum(result["success"] for result in results)
+    print(f"✅ {succeeded}/{len(results)} tasks succeeded across {args.workers} workers.")
+    print("📊 Shared agent distribution: " + ", ".join(f"{name}: {p:.2%}" for name, p in distribution.items()))
+
+# Job Queue
+
+def cmd_enqueue_all(args, runtime):
+    added = runtime.job_queue.enqueue_registered(repeat=args.repeat, key_prefix=args.queue_key, **_task_filters(args))
+    print(f"📥 {added} jobs enqueued in '{runtime.job_queue.path}'.")
+
+def cmd_retry_failed(args, runtime):
+    print(f"🔁 {runtime.job_queue.retry_failed()} failed jobs requeued.")
+
+def cmd_work_queue(args, runtime):
+    from core.job_queue import QueueWorker, BATCH_SIZE
+
+    batch_size = args.queue_batch_size or (runtime.config.get("queue") or {}).get("batch_size", BATCH_SIZE)
+    worker = QueueWorker(runtime.job_queue, runtime.controller, batch_size=batch_size)
+    start = time.perf_counter()
+    totals = worker.run(max_jobs=args.max_jobs, wait=args.queue_wait)
+    seconds = time.perf_counter() - start
+    print(f"✅ Worker {worker.worker_id}: {totals['done']} jobs done, "
+          f"{totals['errors']} failed attempts in {seconds:.1f} s ({totals['claimed'] / seconds if seconds else 0:.0f} jobs/s).")
+
+def cmd_queue_status(args, runtime):
+    stats = runtime.job_queue.stats()
+    print(f"📬 Jobs in '{runtime.job_queue.path}': " + ", ".join(f"{status}: {count}" for status, count in stats.items()))
+
+def cmd_metrics(args, runtime):
+    from utils.visualization import plot_task_success_rates, plot_agent_selection_counts
+
+    latency = runtime.metrics_tracker.get_latency_summary()
+    costs = latency.pop("cost")
+    if latency:
+        print("⏱ Latency (ms):")
+        for kind, by_name in latency.items():
+            for name, stats in by_name.items():
+                print(f" - {kind:<5} {name:<32} n={stats['count']:<6} p50={stats['p50'] * 1e3:8.2f} "
+                      f"p95={stats['p95'] * 1e3:8.2f} p99={stats['p99'] * 1e3:8.2f}")
+    for agent_name, cost in sorted(costs.items()):
+        print(f"💰 {agent_name}: total cost {cost}")
+
+    print("📊 Visualizing Task Success Rates & Agent Selection Frequency...")
+    plot_task_success_rates(runtime.metrics_tracker)
+    plot_agent_selection_counts(runtime.metrics_tracker)
+
+def cmd_export_metrics(args, runtime):
+    from utils.prometheus import render, write_textfile
+
+    if args.export_metrics == "-":
+        sys.stdout.write(render(runtime.metrics_tracker))
+    else:
+        write_textfile(runtime.metrics_tracker, args.export_metrics)
+        print(f"📡 Prometheus metrics written to {args.export_metrics}")
+
+# Agent Management
+
+def cmd_list_agents(args, runtime):
+    print("📋 Available Agents:")
+    for agent in runtime.agents:
+        print(f" - {agent.name} (Capability: {agent.capability}, Cost: {agent.cost})")
+
+def cmd_test_agent(args, runtime):
+    agent = next((a for a in runtime.agents if a.name.lower() == args.test_agent.lower()), None)
+    if agent:
+        sample_task = "Sample Task"
+        result = agent.execute(sample_task)
+        print(f"✅ {agent.name} executed task: {result}")
+    else:
+        print(f"⚠ Agent '{args.test_agent}' not found.")
 
-if args.delete_agent:
+def cmd_delete_agent(args, runtime):
     agent_name = args.delete_agent.strip().replace(" ", "")
 
     # Define paths
@@ -206,7 +277,7 @@ if args.delete_agent:
     else:
         print(f"⚠ Agent '{agent_name}' not found.")
 
-if args.restore_agent:
+def cmd_restore_agent(args, runtime):
     agent_name = args.restore_agent.strip().replace(" ", "")
 
     # Define paths
@@ -216,7 +287,252 @@ if args.restore_agent:
     agent_file = f"{agents_dir}/{agent_name.lower()}_agent.py"
 
     if os.path.exists(deleted_file):
-        os.rename(deleted_file, agent_file)  
+        os.rename(deleted_file, agent_file)
         print(f"♻️ Agent '{agent_name}' has been restored successfully.")
     else:
         print(f"⚠ No deleted agent found with the name '{agent_name}'.")
+
+# Memory Management
+
+def cmd_forget(args, runtime):
+    agent, task = args.forget
+    runtime.memory.forget(agent, task)
+    print(f"🗑 Memory cleared for task '{task}' under agent '{agent}'.")
+
+def cmd_clear_memory(args, runtime):
+    agent = args.clear_memory
+    runtime.memory.clear_memory(agent)
+    print(f"🔄 Memory cleared for {'all agents' if not agent else f'agent {agent}'}.")
+
+def cmd_query_memory(args, runtime):
+    agent = args.query_memory
+    memories = runtime.memory.get_agent_memory(agent)
+    print(f"📋 Memory for '{agent}': {memories}" if memories else f"⚠ No memory found for '{agent}'.")
+
+# Knowledge Graph
+
+def cmd_add_fact(args, runtime):
+    subject, relation, obj = args.add_fact
+    runtime.knowledge_graph.add_fact(subject, relation, obj)
+    print(f"✅ Fact added: {subject} → ({relation}) → {obj}")
+
+def cmd_query_facts(args, runtime):
+    subject = args.query_facts
+    facts = runtime.knowledge_graph.get_relations(subject)
+    print(f"📚 Knowledge about '{subject}': {facts}" if facts else f"⚠ No knowledge found for '{subject}'.")
+
+def cmd_reason(args, runtime):
+    start, end = args.reason
+    path = runtime.knowledge_graph.find_path(start, end)
+    print(f"🧠 Reasoning Path: {' → '.join(path)}" if path else f"⚠ No reasoning path found between '{start}' and '{end}'.")
+
+# Security
+
+def cmd_scan_logs(args, runtime):
+    from core.threat_scanner import ThreatScanner
+
+    if os.path.isfile(args.scan_logs):
+        report = ThreatScanner().scan_file(args.scan_logs)
+        print(f"🚨 Scanned {report['bytes_scanned']} bytes of '{args.scan_logs}':")
+        for rule, count in report["counts"].items():
+            print(f" - {rule}: {count}")
+    else:
+        print(f"⚠ Log file '{args.scan_logs}' not found.")
+
+# Agent Collaboration & Debate
+
+def cmd_debate(args, runtime):
+    task = runtime.task_manager.get_task(args.debate)
+    if not task:
+        print(f"⚠ Task '{args.debate}' not found. Please register it first.")
+        return
+    initial_result = runtime.controller.execute_task(task)
+    final_result = runtime.debate_manager.debate(task["name"], initial_result)
+    print(final_result)
+
+def cmd_collaborate(args, runtime):
+    result = runtime.team.execute_task(args.collaborate)
+    print(f"🤝 Collaboration Result: {result}")
+
+# Daemon Mode
+
+def cmd_serve(args, runtime):
+    import socketserver
+    from core.service import SupernetService, serve_stream, serve_unix_socket
+
+    service = SupernetService(runtime.config, tasks_path=runtime.tasks_path)
+    if args.batch:
+        with open(args.batch, "r", encoding="utf-8") as batch_file:
+            serve_stream(service, batch_file, sys.stdout)
+    elif args.socket:
+        if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+            print("⚠ Unix sockets are not supported on this platform; use stdin or --batch.")
+            return
+        serve_unix_socket(service, args.socket)
+    else:
+        serve_stream(service, sys.stdin, sys.stdout)
+
+def cmd_http(args, runtime):
+    from core.service import SupernetService
+    from core.http_api import serve_http
+
+    host, _, port = args.http.rpartition(":")
+    serve_http(SupernetService(runtime.config, tasks_path=runtime.tasks_path), host or "127.0.0.1", int(port),
+               workers=args.http_workers, max_queue=args.http_queue)
+
+# (argparse dest, handler) pairs, in the order commands run when several flags are given
+COMMANDS = [
+    ("register", cmd_register),
+    ("remove", cmd_remove),
+    ("import_tasks", cmd_import_tasks),
+    ("clear", cmd_clear),
+    ("list", cmd_list),
+    ("run", cmd_run),
+    ("run_all", cmd_run_all),
+    ("enqueue_all", cmd_enqueue_all),
+    ("retry_failed", cmd_retry_failed),
+    ("work_queue", cmd_work_queue),
+    ("queue_status", cmd_queue_status),
+    ("metrics", cmd_metrics),
+    ("export_metrics", cmd_export_metrics),
+    ("list_agents", cmd_list_agents),
+    ("test_agent", cmd_test_agent),
+    ("forget", cmd_forget),
+    ("clear_memory", cmd_clear_memory),
+    ("query_memory", cmd_query_memory),
+    ("add_fact", cmd_add_fact),
+    ("query_facts", cmd_query_facts),
+    ("reason", cmd_reason),
+    ("scan_logs", cmd_scan_logs),
+    ("debate", cmd_debate),
+    ("collaborate", cmd_collaborate),
+    ("delete_agent", cmd_delete_agent),
+    ("restore_agent", cmd_restore_agent),
+    ("serve", cmd_serve),
+    ("http", cmd_http),
+]
+
+def build_parser():
+    """Builds the command-line parser."""
+    parser = argparse.ArgumentParser(description="Multi-Agent Supernet AI Kit")
+
+    # Task Management
+    parser.add_argument("--register", nargs=2, metavar=("TASK_NAME", "COMPLEXITY"), help="Register a new task")
+    parser.add_argument("--remove", metavar="TASK_NAME", help="Remove a registered task")
+    parser.add_argument("--import-tasks", metavar="FILE", help="Register every task in a JSON-lines or CSV file (name, complexity[, status])")
+    parser.add_argument("--skip-existing", action="store_true", help="With --import-tasks: skip tasks that are already registered")
+    parser.add_argument("--clear", action="store_true", help="Remove all tasks")
+    parser.add_argument("--list", action="store_true", help="List all registered tasks")
+    parser.add_argument("--min-complexity", type=int, metavar="N", help="With --list/--run-all/--enqueue-all: only tasks at least this complex")
+    parser.add_argument("--max-complexity", type=int, metavar="N", help="With --list/--run-all/--enqueue-all: only tasks at most this complex")
+    parser.add_argument("--status", metavar="STATUS", help="With --list/--run-all/--enqueue-all: only tasks with this status")
+    parser.add_argument("--page", type=int, metavar="N", help="With --list: show page N (from 1) instead of every task")
+    parser.add_argument("--page-size", type=int, default=50, metavar="N", help="With --page: tasks per page")
+    parser.add_argument("--tasks-file", metavar="PATH", help="Task storage: a JSON file (default: tasks.json) or a SQLite database (.db, .sqlite)")
+    parser.add_argument("--run", metavar="TASK_NAME", help="Run a registered task")
+    parser.add_argument("--run-all", action="store_true", help="Run every registered task")
+    parser.add_argument("--workers", type=int, default=1, metavar="N", help="With --run-all: worker processes sharing one supernet")
+    parser.add_argument("--repeat", type=int, default=1, metavar="N", help="With --run-all/--enqueue-all: run each task N times")
+    parser.add_argument("--enqueue-all", action="store_true", help="Add a job per registered task (times --repeat) to the job queue")
+    parser.add_argument("--queue-key", metavar="KEY", help="With --enqueue-all: idempotency key prefix, so enqueueing the same batch twice adds nothing")
+    parser.add_argument("--work-queue", action="store_true", help="Execute queued jobs until none is pending or running (restartable: unfinished jobs are picked up again)")
+    parser.add_argument("--queue-batch-size", type=int, metavar="N", help="With --work-queue: jobs claimed per transaction")
+    parser.add_argument("--queue-wait", action="store_true", help="With --work-queue: keep polling for new jobs instead of exiting when the queue is empty")
+    parser.add_argument("--max-jobs", type=int, metavar="N", help="With --work-queue: stop after N jobs")
+    parser.add_argument("--retry-failed", action="store_true", help="Requeue jobs that ran out of attempts")
+    parser.add_argument("--queue-status", action="store_true", help="Show job counts per status")
+    parser.add_argument("--jobs-file", metavar="PATH", help="Job queue database (default: queue.path in configs/settings.yaml, jobs.db)")
+    parser.add_argument("--metrics", action="store_true", help="Show task success rates and agent selection frequencies")
+    parser.add_argument("--export-metrics", metavar="FILE", nargs="?", const="-", help="Write metrics in Prometheus text format to FILE (default: stdout)")
+    parser.add_argument("--metrics-port", metavar="[HOST:]PORT", help="Serve Prometheus metrics on this port while commands run")
+    parser.add_argument("--metrics-textfile", metavar="FILE", help="Keep a Prometheus textfile-collector file (.prom) updated while commands run")
+    parser.add_argument("--trace", metavar="FILE", help="Record tracing spans and write them as Chrome trace JSON to FILE at exit")
+    parser.add_argument("--trace-sample", type=float, default=1.0, metavar="RATE", help="With --trace: fraction of tasks traced")
+    parser.add_argument("--capture-traces", metavar="DIR", nargs="?", const="logs/traces", help="Record every task execution to compressed JSON-lines files in DIR for offline replay (default: logs/traces)")
+    parser.add_argument("--profile", action="store_true", help="Run the commands under cProfile and tracemalloc and print a per-subsystem report")
+    parser.add_argument("--profile-dir", default="logs/profile", metavar="DIR", help="With --profile: where the pstats dump is written")
+    parser.add_argument("--no-log-echo", action="store_true", help="Write log events to the log file only, without printing them")
+    parser.add_argument("--delete-agent", metavar="AGENT_NAME", help="Move an agent to the Recycle Bin")
+    parser.add_argument("--restore-agent", metavar="AGENT_NAME", help="Restore a deleted agent from the Recycle Bin")
+
+    # Agent Management
+    parser.add_argument("--list-agents", action="store_true", help="List all available agents")
+    parser.add_argument("--test-agent", metavar="AGENT_NAME", help="Test an agent on a sample task")
+
+    # Memory Management
+    parser.add_argument("--forget", nargs=2, metavar=("AGENT", "TASK"), help="Forget a specific task from memory")
+    parser.add_argument("--clear-memory", metavar="AGENT", nargs="?", const="", help="Clear memory for an agent (or all agents)")
+    parser.add_argument("--query-memory", metavar="AGENT", nargs="?", help="Query an agent's memory")
+
+    # Knowledge Graph
+    parser.add_argument("--add-fact", nargs=3, metavar=("SUBJECT", "RELATION", "OBJECT"), help="Add a fact to the knowledge graph")
+    parser.add_argument("--query-facts", metavar="SUBJECT", help="Retrieve knowledge about a subject")
+    parser.add_argument("--reason", nargs=2, metavar=("START", "END"), help="Find reasoning path between two concepts")
+
+    # Security
+    parser.add_argument("--scan-logs", metavar="LOG_FILE", nargs="?", const="logs/system.log", help="Scan a log file for threats (default: logs/system.log)")
+
+    # Agent Debate & Collaboration
+    parser.add_argument("--debate", metavar="TASK_NAME", help="Run a debate on a task result")
+    parser.add_argument("--collaborate", metavar="TASK_NAME", help="Execute a task with multiple agents")
+
+    # Daemon Mode
+    parser.add_argument("--serve", action="store_true", help="Run as a persistent worker answering JSON-lines requests (stdin by default)")
+    parser.add_argument("--socket", metavar="PATH", help="With --serve: listen on a Unix socket instead of stdin")
+    parser.add_argument("--batch", metavar="FILE", help="With --serve: process a JSON-lines request file and exit")
+
+    parser.add_argument("--http", metavar="[HOST:]PORT", nargs="?", const="127.0.0.1:8080", help="Serve the HTTP API (default: 127.0.0.1:8080)")
+    parser.add_argument("--http-workers", type=int, default=8, metavar="N", help="With --http: requests executed concurrently")
+    parser.add_argument("--http-queue", type=int, default=64, metavar="N", help="With --http: waiting requests before answering 429")
+
+    return parser
+
+def run_commands(handlers, args, runtime):
+    """Runs the selected command handlers in order."""
+    for handler in handlers:
+        handler(args, runtime)
+
+def start_metrics_exporters(args, runtime):
+    """Starts the Prometheus port server and/or textfile sink requested on the command line."""
+    from utils.prometheus import start_metrics_server, start_textfile_sink
+
+    if args.metrics_port:
+        host, _, port = args.metrics_port.rpartition(":")
+        start_metrics_server(runtime.metrics_tracker, host or "127.0.0.1", int(port))
+    if args.metrics_textfile:
+        start_textfile_sink(runtime.metrics_tracker, args.metrics_textfile)
+
+def main(argv=None):
+    """Parses the command line and runs the selected commands."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.page is not None and args.page < 1:
+        parser.error("--page must be at least 1")
+    if args.page_size < 1:
+        parser.error("--page-size must be at least 1")
+    runtime = Runtime(log_overrides={"console": False} if args.no_log_echo else None,
+                      tasks_path=args.tasks_file, jobs_path=args.jobs_file)
+
+    selected = [handler for dest, handler in COMMANDS if getattr(args, dest) not in (None, False)]
+    if not selected:
+        parser.print_help()
+        return
+    if args.metrics_port or args.metrics_textfile:
+        start_metrics_exporters(args, runtime)
+    if args.trace:
+        from utils.tracing import start_tracing
+        start_tracing(args.trace, sample_rate=args.trace_sample)
+    if args.capture_traces:
+        from utils.task_traces import start_trace_capture
+        settings = {key: value for key, value in (runtime.config.get("traces") or {}).items() if key != "enabled"}
+        start_trace_capture(**{**settings, "directory": args.capture_traces})
+
+    if args.profile:
+        from utils.profiling import Profiler
+        with Profiler("main", output_dir=args.profile_dir):
+            run_commands(selected, args, runtime)
+    else:
+        run_commands(selected, args, runtime)
+
+if __name__ == "__main__":
+    main()
@@ -22,7 +22,10 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from agents.base_agent import BaseAgent
 from core.memory import AgentMemory
 from core.knowledge_graph import KnowledgeGraph
-from core.tools import Tools  # ✅ Import tools
+from core.tools import Tools, ToolError  # ✅ Import tools
+from core.router import get_router
+
+ROUTER = get_router("agents", "{agent_type}")
 
 class {class_name}(BaseAgent):
     """
@@ -58,8 +61,9 @@ class {class_name}(BaseAgent):
         # Specialized Execution
         result = self.specialized_task(task)
 
-        self.memory.store(self.name, task, result)
-        self.knowledge_graph.add_fact(task, "processed_by", self.name)
+        if not isinstance(result, ToolError):  # Never cache a failed tool call
+            self.memory.store(self.name, task, result)
+            self.knowledge_graph.add_fact(task, "processed_by", self.name)
 
         return result
 
@@ -96,7 +100,8 @@ def assign_capability_and_tools(agent_name):
 
 def generate_specialized_logic(agent_type):
     """
-    Generates specialized execution logic based on agent type.
+    Generates specialized execution logic based on agent type. Keyword routing
+    comes from the agent type's table in `configs/routing.yaml`.
 
     Args:
         agent_type (str): The type of agent.
@@ -104,30 +109,28 @@ def generate_specialized_logic(agent_type):
     Returns:
         str: Specialized task execution logic as a string.
     """
+    # Types whose tools need arguments extracted from the task; every other type
+    # passes the task straight to the tool its routing table picks.
     logic_map = {
         "Financial": '''
-        if "stock" in task.lower() or "price" in task.lower():
-            ticker = task.split()[-1]  # Extracts ticker from task
-            return self.tools.fetch_stock_price(ticker)
-        ''',
-        "Research": '''
-        if "paper" in task.lower() or "study" in task.lower():
-            return self.tools.fetch_academic_papers(task)
-        ''',
-        "Marketing": '''
-        if "sentiment" in task.lower() or "feedback" in task.lower():
-            return self.tools.analyze_sentiment(task)
+        if ROUTER.match(task):
+            # Upper-case words are treated as tickers; fall back to the last word
+            tickers = [word for word in task.split() if word.isupper()] or [task.split()[-1]]
+            if len(tickers) == 1:
+                return self.tools.fetch_stock_price(tickers[0])
+            return self.tools.join_results(self.tools.fetch_stock_price_batch(tickers))
         ''',
         "Security": '''
-        if "threat" in task.lower() or "log" in task.lower():
-            return self.tools.detect_threats([task])
-        ''',
-        "Medical": '''
-        if "symptom" in task.lower() or "diagnose" in task.lower():
-            return self.tools.fetch_medical_info(task)
+        if ROUTER.match(task):
+            log_files = [word for word in task.split() if os.path.isfile(word)]
+            return self.tools.detect_threats(log_files or [task])
         ''',
     }
-    return logic_map.get(agent_type, "return f'{class_name} executing: {task}'")
+    return logic_map.get(agent_type, '''
+        action = ROUTER.match(task)
+        if action:
+            return getattr(self.tools, action)(task)
+        ''')
 
 def create_agent(agent_name):
     """
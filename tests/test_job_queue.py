@@ -0,0 +1,37 @@
+import time
+from core.job_queue import JobQueue, QueueWorker
+
+
+class SlowController:
+    """ Runs every task successfully after `seconds`, recording the order of executions. """
+
+    def __init__(self, seconds, on_task=None):
+        self.seconds = seconds
+        self.on_task = on_task
+        self.executed = []
+
+    def execute_task(self, task):
+        time.sleep(self.seconds)
+        self.executed.append(task["name"])
+        if self.on_task:
+            self.on_task(task)
+        return True
+
+
+def test_long_batch_keeps_finished_jobs_from_being_reclaimed(tmp_path):
+    job_queue = JobQueue(str(tmp_path / "jobs.db"), lease_seconds=1.0)
+    job_queue.enqueue_many([{"name": f"t{i}", "complexity": 1} for i in range(5)])
+    stolen = []
+
+    def claim_elsewhere(task):
+        if task["name"] == "t4":  # About 1.25 s in: the batch's original leases have expired
+            stolen.extend(job["task"]["name"] for job in job_queue.claim("other-worker"))
+
+    controller = SlowController(0.25, claim_elsewhere)
+    totals = QueueWorker(job_queue, controller, worker_id="w1", batch_size=5).run_batch()
+
+    assert stolen == []
+    assert controller.executed == ["t0", "t1", "t2", "t3", "t4"]
+    assert totals["done"] == 5
+    assert job_queue.stats()["done"] == 5
+    job_queue.close()
@@ -0,0 +1,21 @@
+import pytest
+import core.memory
+from core.memory import AgentMemory
+from core.service import SupernetService
+from utils.metrics import MetricsTracker, set_metrics_tracker
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr(core.memory, "MEMORY_FILE", str(tmp_path / "memory.json"))
+    set_metrics_tracker(MetricsTracker(path=None))
+    return SupernetService(tasks_path=str(tmp_path / "tasks.json"))
+
+
+def test_query_memory_sees_entries_stored_after_startup(service):
+    AgentMemory().store("MidAgent", "Diagnose fever", "rest")  # Agents write through their own instances
+
+    response = service.handle({"op": "query", "what": "memory", "agent": "MidAgent"})
+
+    assert response["ok"]
+    assert response["result"] == {"Diagnose fever": "rest"}
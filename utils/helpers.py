@@ -11,7 +11,7 @@ def load_yaml_config(file_path):
         dict: Parsed configuration.
     """
     try:
-        with open(file_path, "r") as file:
+        with open(file_path, "r", encoding="utf-8") as file:
             return yaml.safe_load(file)
     except FileNotFoundError:
         print(f"Warning: Config file {file_path} not found. Using default settings.")
@@ -0,0 +1,319 @@
+import math
+import threading
+import time
+from contextlib import contextmanager
+import numpy as np
+
+MIN_LATENCY = 1e-6        # Seconds; faster observations share the first bucket
+MAX_LATENCY = 1e4         # Seconds; slower observations share the last bucket
+BUCKETS_PER_DECADE = 100  # Log-spaced resolution, about 2.3% relative error
+PERCENTILES = (50, 95, 99)
+
+class LatencyHistogram:
+    """
+    HDR-style histogram: counts in log-spaced buckets held in one NumPy array.
+
+    Recording is O(1) and the memory footprint is fixed, so every agent, tool
+    and task type can keep one. Histograms with the same layout merge by adding
+    their counts, which is how results from worker processes are combined.
+    """
+
+    def __init__(self, min_value=MIN_LATENCY, max_value=MAX_LATENCY, buckets_per_decade=BUCKETS_PER_DECADE):
+        """
+        Args:
+            min_value (float): Upper edge of the first bucket.
+            max_value (float): Values above this share the last bucket.
+            buckets_per_decade (int): Buckets per factor of ten.
+        """
+        self.min_value = min_value
+        self.buckets_per_decade = buckets_per_decade
+        self._scale = buckets_per_decade / math.log(10)
+        num_buckets = int(math.ceil(math.log10(max_value / min_value) * buckets_per_decade)) + 2
+        self.counts = np.zeros(num_buckets, dtype=np.int64)
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def _index(self, value):
+        if value <= self.min_value:
+            return 0
+        return min(int(math.log(value / self.min_value) * self._scale) + 1, len(self.counts) - 1)
+
+    def _bucket_value(self, index):
+        """ Returns the geometric midpoint of a bucket. """
+        if index == 0:
+            return self.min_value
+        return self.min_value * 10 ** ((index - 0.5) / self.buckets_per_decade)
+
+    @property
+    def count(self):
+        return int(self.counts.sum())
+
+    def record(self, value):
+        """
+        Records one observation.
+
+        Args:
+            value (float): The observed value (e.g. seconds).
+        """
+        self.counts[self._index(value)] += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def record_many(self, values):
+        """
+        Records many observations in one vectorized step.
+
+        Args:
+            values (array-like): The observed values.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if not values.size:
+            return
+        indices = np.zeros(values.shape, dtype=np.intp)
+        above = values > self.min_value
+        indices[above] = np.minimum(np.log(values[above] / self.min_value) * self._scale + 1,
+                                    len(self.counts) - 1).astype(np.intp)
+        self.counts += np.bincount(indices, minlength=len(self.counts))
+        self.total += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    def percentile(self, q):
+        """
+        Returns the value below which `q` percent of observations fall.
+
+        Args:
+            q (float): Percentile between 0 and 100.
+
+        Returns:
+            float: The estimated value, or 0.0 for an empty histogram.
+        """
+        count = self.count
+        if not count:
+            return 0.0
+        rank = max(int(math.ceil(q / 100 * count)), 1)
+        index = int(np.searchsorted(np.cumsum(self.counts), rank))
+        return min(max(self._bucket_value(index), self.min), self.max)
+
+    def cumulative_counts(self, bounds):
+        """
+        Returns how many observations fall at or below each bound, counting whole
+        buckets whose upper edge does not exceed the bound.
+
+        Args:
+            bounds (list): Increasing upper bounds (e.g. seconds).
+
+        Returns:
+            list: One cumulative count per bound.
+        """
+        cumulative = np.cumsum(self.counts)
+        result = []
+        for bound in bounds:
+            if bound < self.min_value:
+                result.append(0)
+                continue
+            # Bucket i (i >= 1) ends at min_value * 10 ** (i / buckets_per_decade)
+            index = min(int(math.log10(bound / self.min_value) * self.buckets_per_decade + 1e-9), len(cumulative) - 1)
+            result.append(int(cumulative[index]))
+        return result
+
+    def merge(self, other, since=None):
+        """
+        Adds another histogram's observations to this one.
+
+        Args:
+            other (LatencyHistogram): Histogram with the same bucket layout.
+            since (LatencyHistogram): An earlier state of `other`; only the observations
+                recorded after it are added. Min and max are combined as a whole.
+        """
+        if len(other.counts) != len(self.counts) or other.min_value != self.min_value:
+            raise ValueError("Histograms with different bucket layouts cannot be merged.")
+        self.counts += other.counts if since is None else other.counts - since.counts
+        self.total += other.total if since is None else other.total - since.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def summary(self, percentiles=PERCENTILES):
+        """
+        Returns the count, mean and percentiles.
+
+        Args:
+            percentiles (tuple): Percentiles to report.
+
+        Returns:
+            dict: {"count", "mean", "max", "p50", ...}.
+        """
+        count = self.count
+        result = {"count": count, "mean": self.total / count if count else 0.0, "max": self.max}
+        for q in percentiles:
+            result[f"p{q}"] = self.percentile(q)
+        return result
+
+    def to_dict(self):
+        """
+        Serializes the histogram compactly (only non-empty buckets are stored).
+
+        Returns:
+            dict: JSON-compatible representation.
+        """
+        nonzero = np.nonzero(self.counts)[0]
+        return {
+            "min_value": self.min_value,
+            "buckets_per_decade": self.buckets_per_decade,
+            "buckets": {str(i): int(self.counts[i]) for i in nonzero},
+            "total": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuilds a histogram saved with `to_dict`.
+
+        Args:
+            data (dict): Serialized histogram.
+
+        Returns:
+            LatencyHistogram: The histogram.
+        """
+        histogram = cls(min_value=data["min_value"], buckets_per_decade=data["buckets_per_decade"])
+        for index, count in data["buckets"].items():
+            histogram.counts[int(index)] += count
+        histogram.total = data["total"]
+        histogram.min = data["min"] if data["min"] is not None else math.inf
+        histogram.max = data["max"]
+        return histogram
+
+
+class HistogramRegistry:
+    """
+    Latency histograms grouped by kind ("agent", "tool", "task") and name,
+    plus cumulative cost per agent. Safe to update from several threads.
+    """
+
+    def __init__(self):
+        self.histograms = {}
+        self.costs = {}
+        self._lock = threading.Lock()
+
+    def observe(self, kind, name, seconds):
+        """
+        Records one latency.
+
+        Args:
+            kind (str): Category, e.g. "agent", "tool" or "task".
+            name (str): Name within the category.
+            seconds (float): The latency.
+        """
+        with self._lock:
+            histogram = self.histograms.get((kind, name))
+            if histogram is None:
+                histogram = self.histograms[(kind, name)] = LatencyHistogram()
+            histogram.record(seconds)
+
+    @contextmanager
+    def time(self, kind, name):
+        """
+        Context manager that records how long its body takes.
+
+        Args:
+            kind (str): Category, e.g. "agent", "tool" or "task".
+            name (str): Name within the category.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(kind, name, time.perf_counter() - start)
+
+    def add_cost(self, agent_name, cost):
+        """
+        Adds to an agent's cumulative cost.
+
+        Args:
+            agent_name (str): The agent.
+            cost (float): Cost of one execution.
+        """
+        with self._lock:
+            self.costs[agent_name] = self.costs.get(agent_name, 0) + cost
+
+    def merge(self, other, since=None):
+        """
+        Adds another registry's histograms and costs to this one.
+
+        Args:
+            other (HistogramRegistry): The registry to merge.
+            since (HistogramRegistry): An earlier state of `other`; only what was
+                recorded after it is added.
+        """
+        with self._lock:
+            for key, histogram in other.histograms.items():
+                base = since.histograms.get(key) if since is not None else None
+                if key in self.histograms:
+                    self.histograms[key].merge(histogram, base)
+                elif base is None:
+                    self.histograms[key] = histogram
+                else:
+                    merged = LatencyHistogram(min_value=histogram.min_value, buckets_per_decade=histogram.buckets_per_decade)
+                    merged.merge(histogram, base)
+                    self.histograms[key] = merged
+            for agent_name, cost in other.costs.items():
+                base = since.costs.get(agent_name, 0) if since is not None else 0
+                self.costs[agent_name] = self.costs.get(agent_name, 0) + cost - base
+
+    def items(self):
+        """
+        Returns:
+            list: (kind, name, histogram) tuples, sorted by kind and name.
+        """
+        with self._lock:
+            return [(kind, name, histogram) for (kind, name), histogram in sorted(self.histograms.items())]
+
+    def summary(self, percentiles=PERCENTILES):
+        """
+        Returns percentiles for every histogram and the cumulative costs.
+
+        Args:
+            percentiles (tuple): Percentiles to report.
+
+        Returns:
+            dict: {kind: {name: {"count", "mean", "max", "p50", ...}}, "cost": {agent: total}}.
+        """
+        with self._lock:
+            result = {}
+            for (kind, name), histogram in sorted(self.histograms.items()):
+                result.setdefault(kind, {})[name] = histogram.summary(percentiles)
+            result["cost"] = dict(self.costs)
+            return result
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: JSON-compatible representation of all histograms and costs.
+        """
+        with self._lock:
+            histograms = {}
+            for (kind, name), histogram in self.histograms.items():
+                histograms.setdefault(kind, {})[name] = histogram.to_dict()
+            return {"histograms": histograms, "cost": dict(self.costs)}
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuilds a registry saved with `to_dict`.
+
+        Args:
+            data (dict): Serialized registry.
+
+        Returns:
+            HistogramRegistry: The registry.
+        """
+        registry = cls()
+        for kind, by_name in data.get("histograms", {}).items():
+            for name, histogram in by_name.items():
+                registry.histograms[(kind, name)] = LatencyHistogram.from_dict(histogram)
+        registry.costs = dict(data.get("cost", {}))
+        return registry
@@ -1,22 +1,180 @@
+import atexit
+import json
 import logging
+import logging.handlers
 import os
+import queue
+import threading
+import time
 
 LOG_FILE = "logs/system.log"
+MAX_LOG_BYTES = 10 * 1024 * 1024  # Rotate once the file reaches this size...
+ROTATE_INTERVAL = 24 * 60 * 60     # ...or this many seconds after it was started
+BACKUP_COUNT = 5                   # Rotated files kept (system.log.1 ... system.log.5)
+QUEUE_SIZE = 10_000                # Records waiting for the writer; newer records are dropped beyond this
 
-os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
+_settings = {
+    "enabled": True,
+    "log_level": "INFO",
+    "log_file": LOG_FILE,
+    "console": True,
+    "max_bytes": MAX_LOG_BYTES,
+    "rotate_interval": ROTATE_INTERVAL,
+    "backup_count": BACKUP_COUNT,
+}
+_logger = logging.getLogger("supernet")
+_logger.propagate = False
+_state = {"queue": None, "listener": None, "dropped": 0}
+_start_lock = threading.Lock()
 
-logging.basicConfig(
-    filename=LOG_FILE,
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-)
 
-def log_event(event: str):
+class JsonLinesFormatter(logging.Formatter):
+    """ Formats a record as one JSON object: timestamp, level, message and its structured fields. """
+
+    def format(self, record):
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created)) + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", {}))
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SizeAndTimeRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Rotating file handler that also rolls over once the current file is older than
+    `rotate_interval` seconds. Like `TimedRotatingFileHandler`, an existing file's
+    age counts from its modification time, so short runs rotate it too.
+    """
+
+    def __init__(self, filename, max_bytes, backup_count, rotate_interval):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True)
+        self.rotate_interval = rotate_interval
+        self.rollover_at = self._next_rollover()
+
+    def _next_rollover(self):
+        try:
+            started = os.stat(self.baseFilename).st_mtime
+        except FileNotFoundError:
+            started = time.time()  # The file is created with the next record
+        return started + self.rotate_interval
+
+    def shouldRollover(self, record):
+        if self.rotate_interval and time.time() >= self.rollover_at:
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        super().doRollover()
+        self.rollover_at = self._next_rollover()
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler for the logging hot path: records are enqueued without being
+    formatted, and dropped (and counted) instead of blocking when the queue is full.
+    """
+
+    def prepare(self, record):
+        # Formatting happens on the writer thread; only resolve the message so the record pickles
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _state["dropped"] += 1
+
+
+def configure_logging(**settings):
+    """
+    Changes logging settings. Takes the keys of the `logging` section in
+    `configs/settings.yaml`; call it before the first event is logged.
+
+    Args:
+        enabled (bool): Whether events are written to the log file.
+        log_level (str): Minimum level written.
+        log_file (str): Log file path.
+        console (bool): Whether events are also printed.
+        max_bytes (int): Size that triggers a rotation.
+        rotate_interval (float): Seconds after which the file is rotated regardless of size.
+        backup_count (int): Rotated files kept.
+        queue: Queue to send records to instead of starting a writer thread, e.g.
+            a `multiprocessing` queue drained by the parent's `forward_logs`.
+    """
+    _settings.update(settings)
+
+
+def _file_handler():
+    os.makedirs(os.path.dirname(_settings["log_file"]) or ".", exist_ok=True)
+    handler = SizeAndTimeRotatingFileHandler(_settings["log_file"], _settings["max_bytes"],
+                                             _settings["backup_count"], _settings["rotate_interval"])
+    handler.setFormatter(JsonLinesFormatter())
+    return handler
+
+
+def _start():
+    """ Attaches the queue handler and, unless records go to another process, starts the background writer. """
+    with _start_lock:
+        if _state["queue"] is not None:
+            return
+        _logger.setLevel(_settings["log_level"])
+        record_queue = _settings.get("queue")
+        if record_queue is None:
+            record_queue = queue.Queue(QUEUE_SIZE)
+            listener = logging.handlers.QueueListener(record_queue, _file_handler())
+            listener.start()
+            _state["listener"] = listener
+            atexit.register(listener.stop)  # Drains the queue before the interpreter exits
+        _logger.addHandler(DroppingQueueHandler(record_queue))
+        _state["queue"] = record_queue
+
+
+def forward_logs(record_queue):
+    """
+    Passes records that other processes put on `record_queue` to this process's
+    writer, so a single thread owns (and rotates) the log file.
+
+    Args:
+        record_queue (multiprocessing.Queue): Queue passed to the workers' `configure_logging(queue=...)`.
+
+    Returns:
+        logging.handlers.QueueListener: The running listener; call `stop()` when the workers are done.
+    """
+    _start()
+    listener = logging.handlers.QueueListener(record_queue, *_logger.handlers)
+    listener.start()
+    return listener
+
+
+def dropped_records():
+    """
+    Returns:
+        int: Records dropped because the queue was full.
+    """
+    return _state["dropped"]
+
+
+def log_event(event: str, level=logging.INFO, echo=None, **fields):
     """
-    Logs an event in the system.
+    Logs an event in the system. The record is handed to a background writer, so
+    the caller never waits for disk I/O.
 
     Args:
         event (str): The event description.
+        level (int): Logging level.
+        echo (bool): Whether to print the event. Defaults to the `console` setting.
+        **fields: Structured fields stored with the record (e.g. task, agent, latency_ms, outcome).
     """
-    logging.info(event)
-    print(event)  
+    if _settings["enabled"]:
+        if _state["queue"] is None:
+            _start()
+        if _logger.isEnabledFor(level):
+            # Built directly rather than via `_logger.log`, which walks the stack to find the caller
+            _logger.handle(_logger.makeRecord(_logger.name, level, "", 0, event, None, None, extra={"fields": fields}))
+    if _settings["console"] if echo is None else echo:
+        print(event)
@@ -1,40 +1,78 @@
+import atexit
 import json
-import os
+import threading
+import time
+from contextlib import contextmanager
+from utils.histogram import HistogramRegistry
+from utils.storage import atomic_write_json, file_lock, load_json
 
 METRICS_FILE = "logs/metrics.json"
+FLUSH_INTERVAL = 5.0   # Seconds between writes while updates keep coming
+FLUSH_THRESHOLD = 500  # Updates that force a write regardless of the interval
 
 class MetricsTracker:
     """
-    Tracks task success rates, agent selection frequencies, and overall performance.
+    Tracks task success rates, agent selection frequencies, latency histograms
+(per agent, tool and task type) and cumulative cost per agent.
+
+    Counters live in memory. They are written to `path` when `flush_threshold`
+    updates have accumulated, when an update arrives `flush_interval` seconds
+    after the last write, on `flush()`, and at interpreter exit. A background
+    timer also writes pending updates every `flush_interval` seconds, so an idle
+    daemon never holds them back.
     """
 
-    def __init__(self):
+    def __init__(self, path=METRICS_FILE, flush_interval=FLUSH_INTERVAL, flush_threshold=FLUSH_THRESHOLD):
         """
         Initializes the metrics tracker and loads existing data.
+
+        Args:
+            path (str): Metrics file, or None to keep the metrics in memory only.
+            flush_interval (float): Maximum seconds between writes while updates keep coming.
+            flush_threshold (int): Pending updates that trigger a write.
         """
         self.metrics = {
             "tasks": {},  
             "agents": {}  
         }
-        self.load_metrics()
+        self.latency = HistogramRegistry()
+        self.path = path
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self._lock = threading.RLock()
+        self._pending_updates = 0
+        self._last_flush = time.monotonic()
+        self._set_base({})
+        self._stopped = threading.Event()
+        if path:
+            self.load_metrics()
+            atexit.register(self.close)
+            threading.Thread(target=self._flush_periodically, name="metrics-flush", daemon=True).start()
 
-    def update_task_metrics(self, task_name, success):
+    def update_task_metrics(self, task_name, success, agents_sampled=None):
         """
         Updates success/failure counts for a task.
 
         Args:
             task_name (str): The name of the executed task.
             success (bool): Whether the task execution was successful.
+            agents_sampled (int): Number of agents allocated to this run, if known.
         """
-        if task_name not in self.metrics["tasks"]:
-            self.metrics["tasks"][task_name] = {"success": 0, "failure": 0}
+        with self._lock:
+            if task_name not in self.metrics["tasks"]:
+                self.metrics["tasks"][task_name] = {"success": 0, "failure": 0}
+
+            if success:
+                self.metrics["tasks"][task_name]["success"] += 1
+            else:
+                self.metrics["tasks"][task_name]["failure"] += 1
 
-        if success:
-            self.metrics["tasks"][task_name]["success"] += 1
-        else:
-            self.metrics["tasks"][task_name]["failure"] += 1
+            if agents_sampled is not None:
+                task_data = self.metrics["tasks"][task_name]
+                task_data["agents_sampled"] = task_data.get("agents_sampled", 0) + agents_sampled
+                task_data["sampled_runs"] = task_data.get("sampled_runs", 0) + 1
 
-        self.save_metrics()
+            self._updated()
 
     def update_agent_metrics(self, agent_name):
         """
@@ -43,11 +81,133 @@ class MetricsTracker:
         Args:
             agent_name (str): The name of the selected agent.
         """
-        if agent_name not in self.metrics["agents"]:
-            self.metrics["agents"][agent_name] = 0
+        with self._lock:
+            if agent_name not in self.metrics["agents"]:
+                self.metrics["agents"][agent_name] = 0
+
+            self.metrics["agents"][agent_name] += 1
+            self._updated()
+
+    def record_latency(self, kind, name, seconds):
+        """
+        Records how long an agent, tool or task took.
+
+        Args:
+            kind (str): "agent", "tool" or "task".
+            name (str): Agent name, tool name or task type.
+            seconds (float): The latency.
+        """
+        with self._lock:  # `save_metrics` replaces the registry, so observing outside the lock could be lost
+            self.latency.observe(kind, name, seconds)
+            self._updated()
+
+    @contextmanager
+    def time(self, kind, name):
+        """
+        Context manager that records the latency of its body with `record_latency`.
+
+        Args:
+            kind (str): "agent", "tool" or "task".
+            name (str): Agent name, tool name or task type.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_latency(kind, name, time.perf_counter() - start)
+
+    def record_cost(self, agent_name, cost):
+        """
+        Adds the cost of one execution to an agent's total.
 
-        self.metrics["agents"][agent_name] += 1
-        self.save_metrics()
+        Args:
+            agent_name (str): The agent.
+            cost (float): The agent's cost per execution.
+        """
+        with self._lock:
+            self.latency.add_cost(agent_name, cost)
+
+    def counters(self):
+        """
+        Returns shallow copies of the task and agent counters without serializing
+        them, for exporters that run on every scrape.
+
+        Returns:
+            tuple: ({task name: {"success", "failure", ...}}, {agent name: selections}, {agent name: cost}).
+        """
+        with self._lock:
+            tasks = {name: dict(counts) for name, counts in self.metrics["tasks"].items()}
+            agents = dict(self.metrics["agents"])
+        return tasks, agents, dict(self.latency.costs)
+
+    def get_latency_summary(self):
+        """
+        Returns p50/p95/p99 latencies per agent, tool and task type, and cost per agent.
+
+        Returns:
+            dict: {"agent": {name: {"count", "mean", "max", "p50", "p95", "p99"}}, "tool": ..., "task": ..., "cost": {...}}.
+        """
+        return self.latency.summary()
+
+    def merge(self, metrics):
+        """
+        Adds counters collected elsewhere (e.g. by a worker process's `drain()`).
+
+        Args:
+            metrics (dict): Metrics in the same layout as `self.metrics`.
+        """
+        with self._lock:
+            for task_name, counts in metrics.get("tasks", {}).items():
+                task_data = self.metrics["tasks"].setdefault(task_name, {"success": 0, "failure": 0})
+                for key, value in counts.items():
+                    task_data[key] = task_data.get(key, 0) + value
+            for agent_name, count in metrics.get("agents", {}).items():
+                self.metrics["agents"][agent_name] = self.metrics["agents"].get(agent_name, 0) + count
+            if "latency" in metrics:
+                self.latency.merge(HistogramRegistry.from_dict(metrics["latency"]))
+            self._updated()
+
+    def drain(self):
+        """
+        Returns the counters and histograms and resets them.
+
+        Returns:
+            dict: The metrics collected since the last drain, in the layout `merge` accepts.
+        """
+        with self._lock:
+            metrics, self.metrics = self.metrics, {"tasks": {}, "agents": {}}
+            latency, self.latency = self.latency, HistogramRegistry()
+            self._set_base({})
+            self._pending_updates = 0
+            metrics["latency"] = latency.to_dict()
+            return metrics
+
+    def _updated(self):
+        """ Counts an in-memory update and writes the file once enough time or updates have accumulated. """
+        self._pending_updates += 1
+        if (self._pending_updates >= self.flush_threshold
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+
+    def _flush_periodically(self):
+        while not self._stopped.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:  # Keep the timer alive; the next tick or update retries
+                print(f"⚠ Could not write metrics to '{self.path}': {e}")
+
+    def close(self):
+        """ Stops the flush timer and writes pending updates. """
+        self._stopped.set()
+        self.flush()
+
+    def flush(self):
+        """
+        Writes pending updates to disk, if there are any.
+        """
+        with self._lock:
+            if self._pending_updates and self.path:
+                self.save_metrics()
 
     def get_task_success_rate(self, task_name):
         """
@@ -66,6 +226,20 @@ class MetricsTracker:
         total_attempts = task_data["success"] + task_data["failure"]
         return task_data["success"] / total_attempts if total_attempts > 0 else 0.0
 
+    def get_average_sample_count(self, task_name):
+        """
+        Returns the average number of agents allocated per run of a task.
+
+        Args:
+            task_name (str): The name of the task.
+
+        Returns:
+            float: Agents per run (0.0 if never recorded).
+        """
+        task_data = self.metrics["tasks"].get(task_name, {})
+        runs = task_data.get("sampled_runs", 0)
+        return task_data.get("agents_sampled", 0) / runs if runs else 0.0
+
     def get_agent_selection_count(self, agent_name):
         """
         Returns how many times an agent has been selected.
@@ -78,18 +252,83 @@ class MetricsTracker:
         """
         return self.metrics["agents"].get(agent_name, 0)
 
+    def snapshot(self):
+        """
+        Returns a consistent deep copy of the metrics, safe to serialize while other threads keep updating.
+
+        Returns:
+            dict: Copy of the metrics.
+        """
+        with self._lock:
+            snapshot = json.loads(json.dumps(self.metrics))
+        snapshot["latency"] = self.get_latency_summary()
+        return snapshot
+
     def save_metrics(self):
         """
-        Saves the metrics to a JSON file.
+        Saves the metrics to a JSON file, merging with what other processes saved
+        meanwhile: under a file lock, the counts recorded here since the last load
+        or save are added to the file's current contents, which are written back
+        atomically and become the in-memory state.
         """
-        os.makedirs(os.path.dirname(METRICS_FILE), exist_ok=True)
-        with open(METRICS_FILE, "w") as file:
-            json.dump(self.metrics, file, indent=4)
+        with self._lock, file_lock(self.path):
+            on_disk = load_json(self.path, dict)
+            merged_latency = HistogramRegistry.from_dict(on_disk.pop("latency", {}))
+            merged_latency.merge(self.latency, since=self._base_latency)
+            merged = {"tasks": on_disk.get("tasks", {}), "agents": on_disk.get("agents", {})}
+            for task_name, counts in self.metrics["tasks"].items():
+                base = self._base["tasks"].get(task_name, {})
+                task_data = merged["tasks"].setdefault(task_name, {"success": 0, "failure": 0})
+                for key, value in counts.items():
+                    task_data[key] = task_data.get(key, 0) + value - base.get(key, 0)
+            for agent_name, count in self.metrics["agents"].items():
+                merged["agents"][agent_name] = (merged["agents"].get(agent_name, 0) + count
+                                                - self._base["agents"].get(agent_name, 0))
+
+            data = {**merged, "latency": merged_latency.to_dict()}
+            atomic_write_json(self.path, data)
+            self.metrics, self.latency = merged, merged_latency
+            self._set_base(data)
+            self._pending_updates = 0
+            self._last_flush = time.monotonic()
 
     def load_metrics(self):
         """
-        Loads metrics from a JSON file if it exists.
+        Loads metrics from a JSON file if it exists. A corrupted file is moved aside
+        (see `utils.storage.load_json`) rather than overwritten.
         """
-        if os.path.exists(METRICS_FILE):
-            with open(METRICS_FILE, "r") as file:
-                self.metrics = json.load(file)
+        data = load_json(self.path, dict)
+        with self._lock:
+            self.metrics = {"tasks": data.get("tasks", {}), "agents": data.get("agents", {})}
+            self.latency = HistogramRegistry.from_dict(data.get("latency", {}))
+            self._set_base(data)
+
+    def _set_base(self, data):
+        """ Remembers the file contents the in-memory counters started from, so a save only adds what changed since. """
+        self._base = json.loads(json.dumps({"tasks": data.get("tasks", {}), "agents": data.get("agents", {})}))
+        self._base_latency = HistogramRegistry.from_dict(data.get("latency", {}))
+
+
+_shared_tracker = None
+
+def get_metrics_tracker():
+    """
+    Returns the process-wide MetricsTracker, creating it on first use.
+
+    Returns:
+        MetricsTracker: The shared tracker.
+    """
+    global _shared_tracker
+    if _shared_tracker is None:
+        _shared_tracker = MetricsTracker()
+    return _shared_tracker
+
+def set_metrics_tracker(tracker):
+    """
+    Replaces the process-wide MetricsTracker (e.g. with an in-memory one in worker processes).
+
+    Args:
+        tracker (MetricsTracker): The tracker `get_metrics_tracker` should return.
+    """
+    global _shared_tracker
+    _shared_tracker = tracker
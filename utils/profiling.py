@@ -0,0 +1,175 @@
+import cProfile
+import os
+import pstats
+import sys
+import time
+import tracemalloc
+
+PROFILE_DIR = "logs/profile"
+TOP_N = 15  # Functions and allocation sites listed in the report
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# (path prefix relative to the repository, subsystem); the first match wins
+SUBSYSTEMS = (
+    ("core/tools.py", "tools"),
+    ("core/", "core"),
+    ("agents/", "agents"),
+    ("utils/", "utils"),
+)
+
+
+def classify(filename, root=REPO_ROOT):
+    """
+    Maps a source file to its subsystem.
+
+    Args:
+        filename (str): File name as reported by cProfile or tracemalloc.
+        root (str): Repository root.
+
+    Returns:
+        str: "tools", "core", "agents", "utils", "app" (other repository code such as
+            main.py or experiments), "imports" (module loading) or "external"
+            (standard library, dependencies, builtins).
+    """
+    if filename.startswith("<frozen importlib"):
+        return "imports"
+    if filename.startswith("<") or filename == "~":
+        return "external"
+    path = os.path.abspath(filename)
+    if not path.startswith(root + os.sep):
+        return "external"
+    relative = os.path.relpath(path, root).replace(os.sep, "/")
+    for prefix, subsystem in SUBSYSTEMS:
+        if relative.startswith(prefix):
+            return subsystem
+    return "app"
+
+
+def _location(filename, line, root=REPO_ROOT):
+    path = os.path.abspath(filename)
+    if path.startswith(root + os.sep):
+        filename = os.path.relpath(path, root)
+    return f"{filename}:{line}"
+
+
+class Profiler:
+    """
+    Context manager that runs its body under cProfile and tracemalloc, then prints
+    a per-subsystem report and writes a pstats dump.
+
+    For each subsystem the report shows its own CPU time, the time including the
+    library code it calls (e.g. `json.dump` inside `AgentMemory._save_memory`), and
+    call counts, followed by the hottest functions and the biggest allocation sites.
+    Only the thread that enters the profiler is profiled.
+    """
+
+    def __init__(self, name, output_dir=PROFILE_DIR, top=TOP_N, stream=sys.stderr):
+        """
+        Args:
+            name (str): Label used in the report and the dump's file name.
+            output_dir (str): Directory for the pstats dump.
+            top (int): Functions and allocation sites to list.
+            stream (file): Where the report is printed.
+        """
+        self.name = name
+        self.output_dir = output_dir
+        self.top = top
+        self.stream = stream
+        self.dump_path = None
+
+    def __enter__(self):
+        tracemalloc.start()
+        self.profile = cProfile.Profile()
+        self.start = time.perf_counter()
+        self.profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profile.disable()
+        self.wall_time = time.perf_counter() - self.start
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ])
+        tracemalloc.stop()
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.dump_path = os.path.join(self.output_dir, f"{self.name}-{time.strftime('%Y%m%d-%H%M%S')}.pstats")
+        self.profile.dump_stats(self.dump_path)
+        print(self.report(pstats.Stats(self.profile), snapshot), file=self.stream)
+        return False
+
+    def subsystem_times(self, stats):
+        """
+        Aggregates profiler stats per subsystem.
+
+        "Inclusive" time is each function's cumulative time minus the time spent in
+        other repository functions it calls, so library code is charged to the
+        repository code that called it and nothing is counted twice. Module-level
+        code runs while importing, so it is charged to "imports".
+
+        Args:
+            stats (pstats.Stats): The collected stats.
+
+        Returns:
+            dict: {subsystem: {"self": seconds, "inclusive": seconds, "calls": count}}.
+        """
+        totals = {}
+        for (filename, _, function), (_, calls, self_time, cumulative, callers) in stats.stats.items():
+            subsystem = "imports" if function == "<module>" else classify(filename)
+            entry = totals.setdefault(subsystem, {"self": 0.0, "inclusive": 0.0, "calls": 0})
+            entry["self"] += self_time
+            entry["calls"] += calls
+            if subsystem in ("external", "imports"):
+                continue
+            entry["inclusive"] += cumulative
+            # Time this function spent under repository callers is already in their cumulative time
+            for (caller_file, _, caller_function), (_, _, _, edge_cumulative) in callers.items():
+                caller = "imports" if caller_function == "<module>" else classify(caller_file)
+                if caller not in ("external", "imports"):
+                    totals.setdefault(caller, {"self": 0.0, "inclusive": 0.0, "calls": 0})["inclusive"] -= edge_cumulative
+        for entry in totals.values():
+            entry["inclusive"] = max(entry["inclusive"], 0.0)
+        return totals
+
+    def report(self, stats, snapshot):
+        """
+        Builds the text report.
+
+        Args:
+            stats (pstats.Stats): The collected CPU stats.
+            snapshot (tracemalloc.Snapshot): Allocations still live at the end of the run.
+
+        Returns:
+            str: The report.
+        """
+        lines = [f"🔬 Profile '{self.name}': {self.wall_time:.3f} s wall, {stats.total_tt:.3f} s profiled CPU"]
+
+        lines.append(f"   {'subsystem':<10} {'self s':>9} {'incl. libs s':>13} {'calls':>10}")
+        totals = self.subsystem_times(stats)
+        for subsystem, entry in sorted(totals.items(), key=lambda item: -item[1]["self"]):
+            inclusive = f"{entry['inclusive']:13.4f}" if subsystem not in ("external", "imports") else f"{'-':>13}"
+            lines.append(f"   {subsystem:<10} {entry['self']:9.4f} {inclusive} {entry['calls']:10d}")
+
+        lines.append(f"\n   Top {self.top} repository functions by cumulative time:")
+        functions = [(key, value) for key, value in stats.stats.items()
+                     if key[2] != "<module>" and classify(key[0]) not in ("external", "imports")]
+        functions.sort(key=lambda item: -item[1][3])
+        for (filename, line, function), (_, calls, self_time, cumulative, _) in functions[:self.top]:
+            lines.append(f"   [{classify(filename):<6}] {function:<32} {cumulative:8.4f} s cum {self_time:8.4f} s self "
+                         f"{calls:8d} calls  {_location(filename, line)}")
+
+        lines.append(f"\n   Top {self.top} allocation sites (live at exit):")
+        statistics = snapshot.statistics("lineno")
+        allocated = {}
+        for statistic in statistics:
+            subsystem = classify(statistic.traceback[0].filename)
+            allocated[subsystem] = allocated.get(subsystem, 0) + statistic.size
+        for statistic in statistics[:self.top]:
+            frame = statistic.traceback[0]
+            lines.append(f"   [{classify(frame.filename):<8}] {statistic.size / 1024:10.1f} KiB {statistic.count:8d} blocks  "
+                         f"{_location(frame.filename, frame.lineno)}")
+        lines.append("   Allocated by subsystem: " + ", ".join(
+            f"{subsystem} {size / 1024:.1f} KiB" for subsystem, size in sorted(allocated.items(), key=lambda item: -item[1])))
+
+        lines.append(f"\n💾 pstats written to {self.dump_path} (inspect with `python -m pstats {self.dump_path}`)")
+        return "\n".join(lines)
@@ -0,0 +1,155 @@
+import atexit
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+METRIC_PREFIX = "supernet"
+# Histogram bucket bounds (seconds) exported to Prometheus; the in-process histograms are much finer
+LATENCY_BOUNDS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+TEXTFILE_INTERVAL = 15.0  # Seconds between textfile-collector writes
+
+
+def _escape(value):
+    """ Escapes a label value for the exposition format. """
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render(metrics_tracker):
+    """
+    Renders a tracker's counters and latency histograms in the Prometheus text
+    exposition format. Works from the in-memory counters, so the cost is
+    proportional to the number of series.
+
+    Args:
+        metrics_tracker (MetricsTracker): The tracker to export.
+
+    Returns:
+        str: The exposition text.
+    """
+    tasks, agents, costs = metrics_tracker.counters()
+    lines = []
+
+    name = f"{METRIC_PREFIX}_task_runs_total"
+    lines += [f"# HELP {name} Task executions by outcome.", f"# TYPE {name} counter"]
+    for task_name, counts in sorted(tasks.items()):
+        for outcome in ("success", "failure"):
+            lines.append(f'{name}{{task="{_escape(task_name)}",outcome="{outcome}"}} {counts.get(outcome, 0)}')
+
+    name = f"{METRIC_PREFIX}_task_agents_sampled_total"
+    lines += [f"# HELP {name} Agents allocated to task executions.", f"# TYPE {name} counter"]
+    for task_name, counts in sorted(tasks.items()):
+        lines.append(f'{name}{{task="{_escape(task_name)}"}} {counts.get("agents_sampled", 0)}')
+
+    name = f"{METRIC_PREFIX}_agent_selections_total"
+    lines += [f"# HELP {name} Times each agent was selected.", f"# TYPE {name} counter"]
+    for agent_name, count in sorted(agents.items()):
+        lines.append(f'{name}{{agent="{_escape(agent_name)}"}} {count}')
+
+    name = f"{METRIC_PREFIX}_agent_cost_total"
+    lines += [f"# HELP {name} Cumulative cost of each agent's executions.", f"# TYPE {name} counter"]
+    for agent_name, cost in sorted(costs.items()):
+        lines.append(f'{name}{{agent="{_escape(agent_name)}"}} {cost}')
+
+    declared = set()
+    for kind, label, histogram in metrics_tracker.latency.items():
+        name = f"{METRIC_PREFIX}_{kind}_latency_seconds"
+        if name not in declared:
+            declared.add(name)
+            lines += [f"# HELP {name} Latency of each {kind}.", f"# TYPE {name} histogram"]
+        series = f'{kind}="{_escape(label)}"'
+        for bound, count in zip(LATENCY_BOUNDS, histogram.cumulative_counts(LATENCY_BOUNDS)):
+            lines.append(f'{name}_bucket{{{series},le="{bound}"}} {count}')
+        count = histogram.count
+        lines.append(f'{name}_bucket{{{series},le="+Inf"}} {count}')
+        lines.append(f"{name}_sum{{{series}}} {histogram.total}")
+        lines.append(f"{name}_count{{{series}}} {count}")
+
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(metrics_tracker, path):
+    """
+    Atomically writes the exposition text for node_exporter's textfile collector
+    (which only reads files ending in `.prom`).
+
+    Args:
+        metrics_tracker (MetricsTracker): The tracker to export.
+        path (str): Destination file.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    # A unique name per call: the sink thread and the exit hook may write at the same time.
+    # It must not end in `.prom`, or the collector could read it half-written.
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            file.write(render(metrics_tracker))
+        os.chmod(temp_path, 0o644)  # mkstemp creates 0600; the collector usually runs as another user
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def start_textfile_sink(metrics_tracker, path, interval=TEXTFILE_INTERVAL):
+    """
+    Rewrites the textfile every `interval` seconds from a daemon thread, and once more at exit.
+
+    Args:
+        metrics_tracker (MetricsTracker): The tracker to export.
+        path (str): Destination file.
+        interval (float): Seconds between writes.
+
+    Returns:
+        threading.Event: Set it to stop the sink.
+    """
+    stopped = threading.Event()
+
+    def loop():
+        while not stopped.wait(interval):
+            write_textfile(metrics_tracker, path)
+
+    threading.Thread(target=loop, name="prometheus-textfile", daemon=True).start()
+    atexit.register(write_textfile, metrics_tracker, path)
+    return stopped
+
+
+def start_metrics_server(metrics_tracker, host="127.0.0.1", port=9464):
+    """
+    Serves `GET /metrics` in the exposition format from a daemon thread.
+
+    Args:
+        metrics_tracker (MetricsTracker): The tracker to export.
+        host (str): Interface to bind.
+        port (int): TCP port (0 picks a free one).
+
+    Returns:
+        ThreadingHTTPServer: The running server; call `shutdown()` to stop it.
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            data = render(metrics_tracker).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="prometheus-server", daemon=True).start()
+    print(f"📡 Serving Prometheus metrics on http://{host}:{server.server_port}/metrics", file=sys.stderr)
+    return server
@@ -0,0 +1,261 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:  # POSIX
+    msvcrt = None
+
+LOCK_TIMEOUT = 30.0  # Seconds to wait for another process's lock before giving up
+LOCK_POLL = 0.005    # Seconds between attempts while waiting
+
+_path_locks = {}
+_path_locks_guard = threading.Lock()
+
+
+class _PathLock:
+    """ In-process side of a file lock: a reentrant lock plus the OS lock held by the outermost owner. """
+
+    def __init__(self):
+        self.rlock = threading.RLock()
+        self.depth = 0
+        self.file = None
+
+
+def _acquire_os_lock(lock_path, deadline):
+    os.makedirs(os.path.dirname(lock_path) or ".", exist_ok=True)
+    file = open(lock_path, "a+")
+    try:
+        while True:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                elif msvcrt is not None:
+                    file.seek(0)
+                    msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+                return file
+            except OSError:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Timed out waiting for the lock on '{lock_path}'.")
+                time.sleep(LOCK_POLL)
+    except BaseException:
+        file.close()
+        raise
+
+
+def _release_os_lock(file):
+    try:
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+        elif msvcrt is not None:
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+    finally:
+        file.close()
+
+
+@contextmanager
+def file_lock(path, timeout=LOCK_TIMEOUT):
+    """
+    Holds an exclusive advisory lock on `path` (through a `<path>.lock` file) for
+    the duration of the block. It excludes other processes (`fcntl.flock`, or
+    `msvcrt.locking` on Windows) and other threads, and is reentrant within a thread.
+
+    Args:
+        path (str): The file to lock.
+        timeout (float): Seconds to wait for the lock.
+
+    Raises:
+        TimeoutError: If the lock could not be acquired in time.
+    """
+    key = os.path.abspath(path)
+    with _path_locks_guard:
+        state = _path_locks.setdefault(key, _PathLock())
+    deadline = time.monotonic() + timeout
+    if not state.rlock.acquire(timeout=timeout):
+        raise TimeoutError(f"Timed out waiting for the lock on '{path}'.")
+    try:
+        if state.depth == 0:
+            state.file = _acquire_os_lock(key + ".lock", deadline)
+        state.depth += 1
+        try:
+            yield
+        finally:
+            state.depth -= 1
+            if state.depth == 0:
+                _release_os_lock(state.file)
+                state.file = None
+    finally:
+        state.rlock.release()
+
+
+def atomic_write_json(path, data, indent=4, durable=True):
+    """
+    Writes JSON so that readers and crashes only ever see the old or the new
+    file: it is written to a temporary file in the same directory, flushed to
+    disk and renamed over `path`.
+
+    Args:
+        path (str): Destination file.
+        data: JSON-serializable data.
+        indent (int): Indentation, or None for compact output.
+        durable (bool): Whether to fsync before renaming, so the new content also survives a power loss.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            file.write(json.dumps(data, indent=indent))  # One C-encoded string; `json.dump` encodes piecewise in Python
+            if durable:
+                file.flush()
+                os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def load_json(path, default=None):
+    """
+    Reads a JSON file. A corrupted file is moved aside to `<path>.corrupt-<time>`
+    (so nothing is silently lost) and `default` is returned instead.
+
+    Args:
+        path (str): The file.
+        default (callable): Builds the value returned for a missing or corrupted file.
+
+    Returns:
+        The parsed data, or `default()`.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return default() if default else None
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        quarantine = f"{path}.corrupt-{time.strftime('%Y%m%d-%H%M%S')}"
+        try:
+            os.replace(path, quarantine)
+            print(f"⚠ '{path}' is corrupted; moved it to '{quarantine}' and started empty.")
+        except OSError:
+            print(f"⚠ '{path}' is corrupted; starting empty.")
+        return default() if default else None
+
+
+def _signature(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+class JsonStore:
+    """
+    A JSON document shared by threads and processes.
+
+    `update` is merge-on-write: under the file lock it re-reads the latest file,
+    applies the caller's change to it and atomically writes the result, so
+    concurrent writers never drop each other's changes. The parsed document is
+    cached and only re-read when the file changed on disk.
+    """
+
+    def __init__(self, path, default=dict, indent=4, durable=True):
+        """
+        Args:
+            path (str): The JSON file.
+            default (callable): Builds the document used when the file is missing or corrupted.
+            indent (int): Indentation of the written file.
+            durable (bool): Whether writes are fsynced (see `atomic_write_json`). Without it a
+                crash still never leaves a partial file, but a power loss may lose recent writes.
+        """
+        self.path = path
+        self.default = default
+        self.indent = indent
+        self.durable = durable
+        self._cache = (None, None)  # (file signature, document); replaced as one tuple so threads never mix pairs
+
+    def load(self):
+        """
+        Returns:
+            The current document (re-read only if the file changed since the last read or write).
+        """
+        cached_signature, cached = self._cache
+        signature = _signature(self.path)
+        if signature is None or signature != cached_signature:
+            # Keyed by the signature taken before reading: if the file changes meanwhile,
+            # the next load sees a new signature and re-reads, instead of trusting stale data
+            cached = load_json(self.path, self.default)
+            self._cache = (signature, cached)
+        return cached
+
+    def write(self, data):
+        """
+        Replaces the whole document.
+
+        Args:
+            data: The new document.
+        """
+        with file_lock(self.path):
+            try:
+                atomic_write_json(self.path, data, self.indent, self.durable)
+            except BaseException:
+                self._cache = (None, None)  # `data` may be the cached document; re-read it next time
+                raise
+            self._cache = (_signature(self.path), data)
+
+    def update(self, mutate):
+        """
+        Applies a change to the latest document and writes it back, atomically.
+        The document is always re-read under the lock, never taken from the cache.
+
+        Args:
+            mutate (callable): Called with the document to change in place; may
+                return False to skip the write (nothing changed). Exceptions abort
+                the update without writing.
+
+        Returns:
+            The document after the change.
+        """
+        with file_lock(self.path):
+            signature = _signature(self.path)
+            data = load_json(self.path, self.default)
+            if mutate(data) is not False:
+                atomic_write_json(self.path, data, self.indent, self.durable)
+                signature = _signature(self.path)
+            self._cache = (signature, data)
+            return data
+
+
+def connect_sqlite(path, timeout=LOCK_TIMEOUT):
+    """
+    Opens a SQLite database shared by threads and processes: autocommit mode
+    (transactions are explicit), WAL journaling so readers never block the
+    writer, and `synchronous=NORMAL`, which is crash-safe in WAL mode.
+
+    Args:
+        path (str): Database file; its directory is created if needed.
+        timeout (float): Seconds to wait for another process's write lock.
+
+    Returns:
+        sqlite3.Connection: The connection (usable from any thread; callers serialize access).
+    """
+    import sqlite3
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    connection = sqlite3.connect(path, timeout=timeout, check_same_thread=False, isolation_level=None)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
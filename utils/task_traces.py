@@ -0,0 +1,238 @@
+import atexit
+import glob
+import gzip
+import json
+import os
+import queue
+import threading
+import time
+
+TRACE_DIR = "logs/traces"
+TRACE_VERSION = 1
+MAX_TRACE_BYTES = 64 * 1024 * 1024  # Start a new file once the current one reaches this size...
+ROTATE_INTERVAL = 60 * 60           # ...or this many seconds after it was started
+FLUSH_THRESHOLD = 1_000             # Buffered records handed to the writer thread at once
+FLUSH_INTERVAL = 5.0                # Seconds before a partial buffer is handed over anyway
+MAX_PENDING_BATCHES = 64            # Batches waiting for the writer; newer batches are dropped beyond this
+
+# One JSON object per line, one line per execution. Every record has "v", "ts" and "source".
+#
+# source "controller", one per task run by `Controller.execute_task`:
+#   {"v": 1, "ts": 1767225600.0, "source": "controller", "task": "Web Navigation", "complexity": 5,
+#    "sampled": ["MidAgent", "ExpertAgent"], "success": true, "latency_ms": 52.9,
+#    "attempts": [{"agent": "MidAgent", "capability": 5, "cost": 3, "success": false, "latency_ms": 12.5, "cache_hit": false},
+#                 {"agent": "ExpertAgent", "capability": 10, "cost": 8, "success": true, "latency_ms": 40.1, "cache_hit": false}]}
+#
+#   `attempts` lists the agents that actually ran, in order; sampled agents after
+#   the first success did not run and have no outcome, which is what the replay
+#   simulator estimates.
+#
+# source "team", one per `AgentTeam.execute_task`: "task", "latency_ms" and an
+#   "attempts" entry per subtask (with its "subtask"); "complexity" is null.
+# source "debate", one per `DebateManager.debate`: "task", "agents", "knowledge_hits"
+#   (agents that found prior knowledge in the graph) and "latency_ms".
+
+_ENCODER = json.JSONEncoder(ensure_ascii=False, check_circular=False, separators=(",", ":"), default=str)
+
+
+class TraceWriter:
+    """
+    Buffered, rotating writer of trace records.
+
+    `record` only appends to an in-memory buffer; full buffers are serialized,
+    compressed and written by a background thread, so capturing costs the caller
+    about a microsecond per record. Each batch is appended to the current file as
+    a complete gzip member, so a crash loses at most the batches not yet written.
+    Files are named per process, so worker processes never share one.
+    """
+
+    def __init__(self, directory=TRACE_DIR, compress=True, max_bytes=MAX_TRACE_BYTES,
+                 rotate_interval=ROTATE_INTERVAL, flush_threshold=FLUSH_THRESHOLD, flush_interval=FLUSH_INTERVAL):
+        """
+        Args:
+            directory (str): Directory the trace files are written to.
+            compress (bool): Whether files are gzip-compressed (`.jsonl.gz`) or plain `.jsonl`.
+            max_bytes (int): Size that starts a new file.
+            rotate_interval (float): Seconds after which a new file is started regardless of size.
+            flush_threshold (int): Buffered records that trigger a hand-off to the writer thread.
+            flush_interval (float): Seconds after which a partial buffer is handed off on the next record.
+        """
+        self.directory = directory
+        self.compress = compress
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.flush_threshold = flush_threshold
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.path = None
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._file_started = 0.0
+        self._file_bytes = 0
+        self._batches = queue.Queue(MAX_PENDING_BATCHES)
+        self._thread = threading.Thread(target=self._write_batches, name="trace-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def settings(self):
+        """
+        Returns:
+            dict: The constructor arguments, e.g. to start an identical writer in a worker process.
+        """
+        return {"directory": self.directory, "compress": self.compress, "max_bytes": self.max_bytes,
+                "rotate_interval": self.rotate_interval, "flush_threshold": self.flush_threshold,
+                "flush_interval": self.flush_interval}
+
+    def record(self, source, **fields):
+        """
+        Buffers one record.
+
+        Args:
+            source (str): What produced the record ("controller", "team", "debate").
+            **fields: The record's fields (see the format above).
+        """
+        record = {"v": TRACE_VERSION, "ts": time.time(), "source": source}
+        record.update(fields)
+        with self._lock:
+            self._buffer.append(record)
+            if len(self._buffer) < self.flush_threshold and time.monotonic() - self._last_flush < self.flush_interval:
+                return
+            batch, self._buffer = self._buffer, []
+            self._last_flush = time.monotonic()
+        self._hand_off(batch)
+
+    def _hand_off(self, batch):
+        try:
+            self._batches.put_nowait(batch)
+        except queue.Full:  # The disk cannot keep up: drop rather than stall task execution
+            self.dropped += len(batch)
+
+    def flush(self):
+        """ Writes every buffered record and waits until it is on disk. """
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+            self._last_flush = time.monotonic()
+        if batch:
+            self._batches.put(batch)
+        self._batches.join()
+
+    def close(self):
+        """ Flushes and stops the writer thread. """
+        if not self._thread.is_alive():
+            return
+        self.flush()
+        self._batches.put(None)
+        self._thread.join()
+
+    def _write_batches(self):
+        while True:
+            batch = self._batches.get()
+            try:
+                if batch is None:
+                    return
+                self._write(batch)
+            except OSError as e:
+                self.dropped += len(batch)
+                print(f"⚠ Could not write task traces to '{self.directory}': {e}")
+            finally:
+                self._batches.task_done()
+
+    def _write(self, batch):
+        encode = _ENCODER.encode
+        data = "".join([encode(record) + "\n" for record in batch]).encode("utf-8")
+        if self.compress:
+            data = gzip.compress(data, compresslevel=6)
+        if (self.path is None or time.monotonic() - self._file_started >= self.rotate_interval
+                or self._file_bytes >= self.max_bytes):
+            os.makedirs(self.directory, exist_ok=True)
+            suffix = ".jsonl.gz" if self.compress else ".jsonl"
+            self.path = os.path.join(self.directory, f"traces-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}{suffix}")
+            self._file_started = time.monotonic()
+            self._file_bytes = 0
+        with open(self.path, "ab") as file:
+            file.write(data)
+        self._file_bytes += len(data)
+
+
+_writer = None
+
+
+def start_trace_capture(directory=TRACE_DIR, **settings):
+    """
+    Starts recording executions. Takes the keys of the `traces` section in `configs/settings.yaml`.
+
+    Args:
+        directory (str): Directory the trace files are written to.
+        **settings: Other `TraceWriter` arguments (compress, max_bytes, rotate_interval, ...).
+
+    Returns:
+        TraceWriter: The process-wide writer.
+    """
+    global _writer
+    if _writer is None:
+        _writer = TraceWriter(directory, **settings)
+    return _writer
+
+
+def get_trace_writer():
+    """
+    Returns:
+        TraceWriter or None: The process-wide writer, or None when capture is off.
+    """
+    return _writer
+
+
+def memory_hits(agent):
+    """
+    Returns:
+        int: Lookups answered from the agent's memory so far (0 for agents without one).
+            Compare before and after an execution to tell whether it was a cache hit.
+    """
+    return getattr(getattr(agent, "memory", None), "hits", 0)
+
+
+def trace_files(path=TRACE_DIR):
+    """
+    Lists trace files: `path` itself, or every `.jsonl` / `.jsonl.gz` file in a directory, oldest first.
+
+    Args:
+        path (str): A trace file or a directory of them.
+
+    Returns:
+        list: File paths.
+    """
+    if os.path.isdir(path):
+        files = glob.glob(os.path.join(path, "*.jsonl")) + glob.glob(os.path.join(path, "*.jsonl.gz"))
+        return sorted(files, key=os.path.getmtime)
+    return [path]
+
+
+def read_traces(*paths, source=None):
+    """
+    Reads trace records. Gzip-compressed files are recognized by their `.gz`
+    suffix; blank and truncated lines (e.g. from a crash mid-write) are skipped.
+
+    Args:
+        *paths (str): Trace files or directories. Defaults to `TRACE_DIR`.
+        source (str): Only yield records from this source (e.g. "controller").
+
+    Yields:
+        dict: One record per execution.
+    """
+    for path in paths or (TRACE_DIR,):
+        for file_path in trace_files(path):
+            opener = gzip.open if file_path.endswith(".gz") else open
+            with opener(file_path, "rt", encoding="utf-8") as file:
+                try:
+                    for line in file:
+                        if not line.strip():
+                            continue
+                        try:
+                            record = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue
+                        if source is None or record.get("source", "controller") == source:
+                            yield record
+                except EOFError:  # Gzip file cut off before its end marker
+                    continue
@@ -0,0 +1,170 @@
+import atexit
+import collections
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import random
+import threading
+import time
+
+MAX_SPANS = 100_000  # Finished spans kept in memory; the oldest are dropped first
+
+_current_span = contextvars.ContextVar("supernet_current_span", default=None)
+_UNSAMPLED = object()  # Marks a trace that sampling dropped, so its child spans are skipped too
+_NOOP = contextlib.nullcontext()
+
+
+class Span:
+    """
+    One timed operation. Use through `span()`; entering it makes it the parent of
+    spans opened inside it, including in nested function calls.
+    """
+
+    __slots__ = ("tracer", "name", "attrs", "start", "token", "sampled")
+
+    def __init__(self, tracer, name, attrs):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        parent = _current_span.get()
+        self.sampled = parent is not _UNSAMPLED and (parent is not None or random.random() < self.tracer.sample_rate)
+        self.token = _current_span.set(self if self.sampled else _UNSAMPLED)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.sampled:
+            duration = time.perf_counter_ns() - self.start
+            if exc_type is not None:
+                self.attrs["error"] = exc_type.__name__
+            self.tracer.record(self.name, self.start, duration, self.attrs)
+        _current_span.reset(self.token)
+        return False
+
+    def set_attribute(self, key, value):
+        self.attrs[key] = value
+
+
+class Tracer:
+    """
+    Collects finished spans in memory and exports them as Chrome trace events.
+
+    Disabled by default: `span()` then returns a shared no-op context manager, so
+    instrumented code pays one attribute check. Sampling is decided per trace at
+    the root span; a dropped trace skips all of its children.
+    """
+
+    def __init__(self, enabled=False, sample_rate=1.0, max_spans=MAX_SPANS):
+        """
+        Args:
+            enabled (bool): Whether spans are recorded.
+            sample_rate (float): Fraction of root spans (traces) recorded.
+            max_spans (int): Finished spans kept in memory.
+        """
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.spans = collections.deque(maxlen=max_spans)
+        self.pid = os.getpid()
+
+    def configure(self, enabled=True, sample_rate=None, max_spans=None):
+        """
+        Changes the tracer's settings.
+
+        Args:
+            enabled (bool): Whether spans are recorded.
+            sample_rate (float): Fraction of traces recorded, if given.
+            max_spans (int): Finished spans kept in memory, if given.
+        """
+        self.enabled = enabled
+        if sample_rate is not None:
+            self.sample_rate = sample_rate
+        if max_spans is not None:
+            self.spans = collections.deque(self.spans, maxlen=max_spans)
+
+    def record(self, name, start_ns, duration_ns, attrs):
+        """ Stores a finished span. """
+        self.spans.append((name, start_ns, duration_ns, threading.get_ident(), attrs))
+
+    def chrome_trace(self):
+        """
+        Returns the recorded spans as Chrome trace events (viewable in chrome://tracing or Perfetto).
+
+        Returns:
+            dict: {"traceEvents": [...], "displayTimeUnit": "ms"}.
+        """
+        events = [
+            {"name": name, "ph": "X", "ts": start / 1000, "dur": duration / 1000,
+             "pid": self.pid, "tid": tid, "args": attrs}
+            for name, start, duration, tid, attrs in list(self.spans)
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path):
+        """
+        Atomically writes the Chrome trace JSON.
+
+        Args:
+            path (str): Destination file.
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(self.chrome_trace(), file, default=str)
+        os.replace(temp_path, path)
+
+
+TRACER = Tracer()
+
+
+def span(name, **attrs):
+    """
+    Opens a span on the process-wide tracer.
+
+    Usage:
+        with span("memory.store", agent=agent_name):
+            ...
+
+    Args:
+        name (str): Span name, e.g. "controller.execute_task".
+        **attrs: Attributes shown with the span.
+
+    Returns:
+        Span or a no-op context manager when tracing is disabled.
+    """
+    if not TRACER.enabled:
+        return _NOOP
+    return Span(TRACER, name, attrs)
+
+
+def traced(name):
+    """
+    Decorator that wraps every call of a function in a span.
+
+    Args:
+        name (str): Span name.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not TRACER.enabled:
+                return func(*args, **kwargs)
+            with Span(TRACER, name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def start_tracing(path, sample_rate=1.0):
+    """
+    Enables tracing and writes the Chrome trace to `path` at exit.
+
+    Args:
+        path (str): Destination file.
+        sample_rate (float): Fraction of traces recorded.
+    """
+    TRACER.configure(enabled=True, sample_rate=sample_rate)
+    atexit.register(TRACER.export_chrome_trace, path)
@@ -1,15 +1,32 @@
 import os
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-import matplotlib.pyplot as plt
-from utils.metrics import MetricsTracker
+from utils.metrics import get_metrics_tracker
 
-metrics_tracker = MetricsTracker()
+# matplotlib is imported inside the plotting functions: it is by far the most
+# expensive import in the project and only these functions need it.
 
-def plot_task_success_rates():
+def _finish(plt, output_path):
+    """ Shows the current figure, or saves it to `output_path` without blocking. """
+    if output_path is None:
+        plt.show()
+        return
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    plt.savefig(output_path, bbox_inches="tight")
+    plt.close()
+
+
+def plot_task_success_rates(metrics_tracker=None, output_path=None):
     """
     Plots the success rates of all registered tasks.
+
+    Args:
+        metrics_tracker (MetricsTracker): Tracker to read from. Defaults to the shared tracker.
+        output_path (str): Image file to save the plot to instead of showing it.
     """
+    import matplotlib.pyplot as plt
+
+    metrics_tracker = metrics_tracker or get_metrics_tracker()
     task_names = list(metrics_tracker.metrics["tasks"].keys())
     success_rates = [metrics_tracker.get_task_success_rate(task) for task in task_names]
 
@@ -23,13 +40,20 @@ def plot_task_success_rates():
     for i, rate in enumerate(success_rates):
         plt.text(i, rate + 0.02, f"{rate:.2f}", ha="center", fontsize=10)
 
-    plt.show()
+    _finish(plt, output_path)
 
 
-def plot_agent_selection_counts():
+def plot_agent_selection_counts(metrics_tracker=None, output_path=None):
     """
     Plots the number of times each agent has been selected.
+
+    Args:
+        metrics_tracker (MetricsTracker): Tracker to read from. Defaults to the shared tracker.
+        output_path (str): Image file to save the plot to instead of showing it.
     """
+    import matplotlib.pyplot as plt
+
+    metrics_tracker = metrics_tracker or get_metrics_tracker()
     agent_names = list(metrics_tracker.metrics["agents"].keys())
     selection_counts = [metrics_tracker.get_agent_selection_count(agent) for agent in agent_names]
 
@@ -42,4 +66,4 @@ def plot_agent_selection_counts():
     for i, count in enumerate(selection_counts):
         plt.text(i, count + 0.5, str(count), ha="center", fontsize=10)
 
-    plt.show()
+    _finish(plt, output_path)